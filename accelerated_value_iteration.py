@@ -0,0 +1,105 @@
+import numpy as np
+
+"""
+CLASE PARA EJECUTAR LA ITERACIÓN DE VALORES ACELERADA
+
+Misma interfaz que VectorizedValueIteration, sobre el operador de Bellman del modelo
+compilado T(V) = max_a Q(s,a), con dos esquemas para reducir el número de barridos
+cuando γ está cerca de 1:
+
+    - "sor": sobre-relajación, V <- V + ω (T(V) - V). Con ω = 1 es la iteración de
+      valores normal. El barrido es síncrono (todos los estados a la vez, como el resto
+      de solvers vectorizados), no Gauss-Seidel, y solo es contractivo con seguridad
+      para ω < 2 / (1 + γ); valores mayores pueden acelerar o divergir según el modelo.
+    - "anderson": aceleración de Anderson con una ventana de los últimos `history`
+      barridos. Cada nuevo valor es la combinación de los T(V) guardados cuyos residuos
+      T(V) - V combinados tienen la menor norma (mínimos cuadrados).
+
+En los dos casos hay una salvaguarda: si el residuo ||T(V) - V|| crece respecto al
+del último punto aceptado, se descarta el punto nuevo y se da desde aquel el paso de
+Bellman normal (y se vacía la historia de Anderson), que siempre reduce el residuo.
+El criterio de parada es el de ValueIteration: ||T(V) - V|| < theta.
+"""
+
+class AcceleratedValueIteration:
+    def __init__(self, mdp, values, method="anderson", omega=1.0, history=5, compiled=None):
+        """
+        Args:
+            mdp (MDP): el modelo.
+            values (ValueFunction): valores iniciales, donde se escribe el resultado.
+            method (str): "anderson" (por defecto), "sor" o None (iteración de valores normal).
+            omega (float): factor de relajación de "sor". Por defecto 1.0.
+            history (int): barridos que recuerda "anderson". Por defecto 5.
+            compiled (CompiledMDP o SparseMDP, optional): el modelo ya compilado.
+        """
+        if method not in (None, "sor", "anderson"):
+            raise ValueError(f"Método de aceleración desconocido: {method}")
+        self.mdp = mdp
+        self.values = values
+        self.method = method
+        self.omega = omega
+        self.history = history
+        self.compiled = compiled if compiled is not None else mdp.compile()
+        # Barridos en los que la salvaguarda descartó el paso acelerado
+        self.fallbacks = 0
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        compiled = self.compiled
+        values = compiled.values_to_array(self.values)
+        self.fallbacks = 0
+        # Historia de Anderson: valores T(V) y residuos T(V) - V de los últimos barridos
+        images = []
+        residuals = []
+        # Imagen T(V) y residuo del último punto aceptado por la salvaguarda
+        (accepted_image, accepted_norm) = (None, float("inf"))
+
+        result = None
+        for i in range(max_iterations):
+            (image, _) = compiled.bellman_backup(values)
+            residual = image - values
+            norm = np.abs(residual).max()
+
+            # Termina si la función de valor converge
+            if norm < theta:
+                values = image
+                result = i
+                break
+
+            if norm > accepted_norm:
+                # Salvaguarda: se descarta este punto y se da el paso de Bellman normal desde
+                # el último aceptado, cuyo residuo es como mucho γ veces el de ese punto
+                self.fallbacks += 1
+                (images, residuals) = ([], [])
+                values = accepted_image
+                accepted_norm = float("inf")
+                continue
+
+            (accepted_image, accepted_norm) = (image, norm)
+            if self.method == "sor":
+                values = values + self.omega * residual
+            elif self.method == "anderson":
+                images.append(image)
+                residuals.append(residual)
+                if len(images) > self.history + 1:
+                    (images, residuals) = (images[1:], residuals[1:])
+                values = self.anderson_step(images, residuals)
+            else:
+                values = image
+
+        compiled.array_to_values(values, self.values)
+        return result
+
+    @staticmethod
+    def anderson_step(images, residuals) -> np.ndarray:
+        """
+        Combinación de Anderson (tipo II) de los últimos barridos.
+
+        Con las diferencias ΔF y ΔG de residuos e imágenes consecutivos, resuelve
+        min ||f_k - ΔF α|| y devuelve T(V_k) - ΔG α.
+        """
+        if len(images) < 2:
+            return images[-1]
+        delta_residuals = np.diff(np.array(residuals), axis=0).T
+        delta_images = np.diff(np.array(images), axis=0).T
+        (alpha, _, _, _) = np.linalg.lstsq(delta_residuals, residuals[-1], rcond=None)
+        return images[-1] - delta_images @ alpha
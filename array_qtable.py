@@ -0,0 +1,111 @@
+import numpy as np
+from qfunction import QFunction
+
+"""
+Clase que crea la Q-tabla sobre un array de NumPy.
+
+Cada estado se asigna a una fila y cada acción a una columna de un array 2-D que
+crece duplicando su capacidad. get_max_q se resuelve con un único argmax sobre la
+fila del estado, y get_row da acceso directo a la fila para las estrategias de
+selección (bandits). Es intercambiable con QTable en QLearning, SARSA y extract_policy.
+"""
+
+class ArrayQTable(QFunction):
+    def __init__(self, actions=None, default=0.0, dtype=np.float64) -> None:
+        """
+        Args:
+            actions (List, optional): acciones conocidas de antemano, que reciben las primeras columnas.
+            default (float): valor Q de los pares que no se han actualizado. Por defecto 0.0.
+            dtype: tipo del array. Por defecto np.float64.
+        """
+        self.default = default
+        self.state_index = {}
+        self.action_index = {}
+        self.actions = []
+        self.qtable = np.full((16, max(1, len(actions or []))), default, dtype=dtype)
+        # Columnas de cada lista de acciones usada en get_max_q
+        self._columns = {}
+        for action in actions or []:
+            self._column(action)
+
+    def update(self, state, action, delta) -> None:
+        row = self._row(state)
+        column = self._column(action)
+        self.qtable[row, column] += delta
+
+    def get_q_value(self, state, action):
+        row = self.state_index.get(state)
+        column = self.action_index.get(action)
+        if row is None or column is None:
+            return self.default
+        return self.qtable.item(row, column)
+
+    def get_max_q(self, state, actions):
+        if len(actions) == 0:
+            return (None, float("-inf"))
+        row = self.state_index.get(state)
+        if row is None:
+            # Todas las acciones valen lo mismo: la primera, como en QFunction.get_max_q
+            return (actions[0], self.default)
+
+        columns = self.get_columns(actions)
+        if columns is None:
+            best = self.qtable[row, :len(self.actions)].argmax()
+            return (actions[best], self.qtable.item(row, best))
+        best = self.qtable[row, columns].argmax()
+        return (actions[best], self.qtable.item(row, columns[best]))
+
+    def get_row(self, state) -> np.ndarray:
+        """
+        Devuelve la fila de valores Q de un estado, con una columna por acción en el
+        orden de self.actions. Si el estado no se ha visto, devuelve una fila nueva
+        con el valor por defecto (sin añadir el estado a la tabla).
+        """
+        row = self.state_index.get(state)
+        if row is None:
+            return np.full(len(self.actions), self.default, dtype=self.qtable.dtype)
+        return self.qtable[row, :len(self.actions)]
+
+    def get_q_values(self, state, actions) -> np.ndarray:
+        """Devuelve los valores Q de un estado para una lista de acciones, en ese orden"""
+        columns = self.get_columns(actions)
+        row = self.get_row(state)
+        return row if columns is None else row[columns]
+
+    def get_columns(self, actions):
+        """
+        Columnas de una lista de acciones. Devuelve None si la lista coincide con todas
+        las columnas en orden, en cuyo caso se puede usar la fila completa.
+        """
+        key = tuple(actions)
+        columns = self._columns.get(key)
+        if columns is None:
+            columns = np.array([self._column(action) for action in actions], dtype=np.int64)
+            if len(columns) == len(self.actions) and (columns == np.arange(len(columns))).all():
+                columns = False
+            self._columns[key] = columns
+        return None if columns is False else columns
+
+    def _row(self, state) -> int:
+        row = self.state_index.get(state)
+        if row is None:
+            row = self.state_index[state] = len(self.state_index)
+            if row >= self.qtable.shape[0]:
+                self._grow(2 * self.qtable.shape[0], self.qtable.shape[1])
+        return row
+
+    def _column(self, action) -> int:
+        column = self.action_index.get(action)
+        if column is None:
+            column = self.action_index[action] = len(self.actions)
+            self.actions.append(action)
+            # Una nueva acción invalida las columnas guardadas que cubrían toda la fila
+            self._columns = {key: columns for (key, columns) in self._columns.items() if columns is not False}
+            if column >= self.qtable.shape[1]:
+                self._grow(self.qtable.shape[0], 2 * self.qtable.shape[1])
+        return column
+
+    def _grow(self, rows, columns) -> None:
+        qtable = np.full((rows, columns), self.default, dtype=self.qtable.dtype)
+        qtable[:self.qtable.shape[0], :self.qtable.shape[1]] = self.qtable
+        self.qtable = qtable
@@ -0,0 +1,87 @@
+import numpy as np
+from value_function import ValueFunction
+
+"""
+ArrayValueFunction: Función de valor respaldada por un vector de NumPy.
+
+Mantiene un mapa de estado a índice y un vector float64 (u opcionalmente float32)
+con los valores. Los estados nuevos reciben el siguiente índice libre y el vector
+crece duplicando su capacidad.
+
+Para los barridos síncronos tiene un segundo buffer: new_buffer() devuelve una
+función de valor que comparte el mapa de índices y escribe en el buffer trasero,
+y merge() de ese buffer intercambia los dos vectores en O(1) en lugar de copiar
+los valores clave a clave.
+"""
+
+class ArrayValueFunction(ValueFunction):
+
+    def __init__(self, states=None, default=0.0, dtype=np.float64, capacity=16) -> None:
+        """
+        Args:
+            states (List, optional): estados conocidos de antemano, que reciben los primeros índices.
+            default (float): valor de los estados que no se han actualizado. Por defecto 0.0.
+            dtype: np.float64 (por defecto) o np.float32.
+            capacity (int): capacidad inicial del vector si no se indican estados.
+        """
+        self.default = default
+        self.dtype = np.dtype(dtype)
+        self.state_index = {}
+        if states is not None:
+            for state in states:
+                self.state_index.setdefault(state, len(self.state_index))
+        self.values = np.full(max(capacity, len(self.state_index)), default, dtype=self.dtype)
+        self._back = None
+
+    def update(self, state, value):
+        i = self.state_index.get(state)
+        if i is None:
+            i = self.state_index[state] = len(self.state_index)
+        if i >= len(self.values):
+            self._grow(i + 1)
+        self.values[i] = value
+
+    def merge(self, value_table):
+        # Buffer creado con new_buffer(): basta con intercambiar los vectores
+        if isinstance(value_table, ArrayValueFunction) and value_table.state_index is self.state_index:
+            (self.values, value_table.values) = (value_table.values, self.values)
+            return
+
+        if isinstance(value_table, ArrayValueFunction):
+            states = value_table.state_index.keys()
+        else:
+            states = value_table.value_table.keys()
+        for state in states:
+            self.update(state, value_table.get_value(state))
+
+    def get_value(self, state):
+        i = self.state_index.get(state)
+        if i is None or i >= len(self.values):
+            return self.default
+        return self.values[i].item()
+
+    def new_buffer(self):
+        """
+        Devuelve el buffer trasero, con una copia de los valores actuales y el mismo
+        mapa de índices. Se reutiliza entre llamadas, así que no reserva memoria en
+        cada barrido. Al hacer merge() de él, los buffers se intercambian.
+        """
+        if self._back is None:
+            self._back = ArrayValueFunction(default=self.default, dtype=self.dtype, capacity=0)
+            self._back.state_index = self.state_index
+            self._back._back = self
+        back = self._back
+        if len(back.values) != len(self.values):
+            back.values = np.empty_like(self.values)
+        np.copyto(back.values, self.values)
+        return back
+
+    def as_array(self) -> np.ndarray:
+        """Vista de los valores de los estados conocidos, en el orden de su índice"""
+        return self.values[:len(self.state_index)]
+
+    def _grow(self, size):
+        capacity = max(size, 2 * len(self.values))
+        values = np.full(capacity, self.default, dtype=self.dtype)
+        values[:len(self.values)] = self.values
+        self.values = values
@@ -0,0 +1,184 @@
+import copy
+import time
+import numpy as np
+from qfunction import QFunction
+from vectorized_bandits import ArrayBandit
+
+"""
+Banco de pruebas para comparar las estrategias del MultiArmedBandit.
+
+Simula a la vez miles de problemas independientes de k brazos, guardados como
+arrays (una fila por problema). Los brazos pueden dar recompensas gaussianas o de
+Bernoulli y sus medias pueden ser fijas o moverse como un paseo aleatorio en cada
+paso. Para cada estrategia se registra, paso a paso y en media sobre los problemas,
+la recompensa, el arrepentimiento acumulado y la tasa de acción óptima, además de
+los problemas completos simulados por segundo.
+
+Cada problema se trata como un estado distinto (su número de fila). Las estrategias
+de vectorized_bandits se ejecutan con select_batch (un lote por paso) y llevan sus
+contadores por estado, es decir, por problema. El resto se ejecutan con su select de
+siempre, problema a problema y con una copia de la estrategia para cada uno (así
+UpperConfidenceBounds, que cuenta las selecciones de forma global, no mezcla los
+problemas), de modo que también se mide el coste de la selección.
+"""
+
+class BanditTestbed:
+
+    def __init__(self, num_runs=2000, num_arms=10, arms="gaussian", drift=0.0, seed=None) -> None:
+        """
+        Args:
+            num_runs (int): número de problemas independientes. Por defecto 2000.
+            num_arms (int): número de brazos de cada problema. Por defecto 10.
+            arms (str): "gaussian" (recompensa N(media, 1), medias N(0, 1)) o
+                "bernoulli" (recompensa 0 o 1, medias U(0, 1)). Por defecto "gaussian".
+            drift (float): desviación del paseo aleatorio de las medias en cada paso.
+                Con 0.0 (por defecto) las medias son fijas.
+            seed (int, optional): semilla del generador de números aleatorios.
+        """
+        if arms not in ("gaussian", "bernoulli"):
+            raise ValueError(f"Tipo de brazos desconocido: {arms}")
+        self.num_runs = num_runs
+        self.num_arms = num_arms
+        self.arms = arms
+        self.drift = drift
+        self.seed = seed
+        self.reset()
+
+    def reset(self) -> None:
+        """Genera unas medias nuevas (siempre las mismas para la misma semilla)"""
+        self.rng = np.random.default_rng(self.seed)
+        shape = (self.num_runs, self.num_arms)
+        if self.arms == "gaussian":
+            self.means = self.rng.normal(0.0, 1.0, size=shape)
+        else:
+            self.means = self.rng.uniform(0.0, 1.0, size=shape)
+
+    def pull(self, actions: np.ndarray):
+        """
+        Tira de un brazo en cada problema.
+
+        Args:
+            actions (np.ndarray): vector con el brazo elegido en cada problema.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: las recompensas, el arrepentimiento
+            de cada elección (media óptima menos media elegida) y si la elección era óptima.
+        """
+        rows = np.arange(self.num_runs)
+        chosen = self.means[rows, actions]
+        best = self.means.max(axis=1)
+        if self.arms == "gaussian":
+            rewards = self.rng.normal(chosen, 1.0)
+        else:
+            rewards = (self.rng.random(self.num_runs) < chosen).astype(float)
+        regrets = best - chosen
+        optimal = chosen >= best
+
+        if self.drift > 0:
+            self.means += self.rng.normal(0.0, self.drift, size=self.means.shape)
+            if self.arms == "bernoulli":
+                np.clip(self.means, 0.0, 1.0, out=self.means)
+        return (rewards, regrets, optimal)
+
+
+class EstimatesQFunction(QFunction):
+
+    """
+    Función Q de solo lectura sobre el array (problemas, brazos) de estimaciones,
+    para usar las estrategias a través de select(state, actions, qfunction).
+    """
+
+    def __init__(self, estimates: np.ndarray) -> None:
+        self.estimates = estimates
+
+    def get_q_value(self, state, action):
+        return self.estimates.item(state, action)
+
+    def get_q_values(self, state, actions) -> np.ndarray:
+        return self.estimates[state, actions]
+
+
+class BanditResults:
+
+    """Medias sobre los problemas de cada paso de la simulación"""
+
+    def __init__(self, steps:int, num_runs:int) -> None:
+        self.num_runs = num_runs
+        self.rewards = np.zeros(steps)
+        self.regrets = np.zeros(steps)
+        self.optimal_rate = np.zeros(steps)
+        self.wall_time = 0.0
+
+    def record(self, step:int, rewards, regrets, optimal) -> None:
+        self.rewards[step] = rewards.mean()
+        self.regrets[step] = regrets.mean()
+        self.optimal_rate[step] = optimal.mean()
+
+    @property
+    def steps(self) -> int:
+        return len(self.rewards)
+
+    @property
+    def cumulative_regret(self) -> np.ndarray:
+        """Arrepentimiento acumulado medio hasta cada paso"""
+        return np.cumsum(self.regrets)
+
+    @property
+    def runs_per_second(self) -> float:
+        return self.num_runs / self.wall_time if self.wall_time > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return (f"BanditResults(steps={self.steps}, num_runs={self.num_runs}, "
+                f"cumulative_regret={self.cumulative_regret[-1]:.2f}, "
+                f"optimal_rate={self.optimal_rate[-1]:.3f}, wall_time={self.wall_time:.2f}s, "
+                f"runs_per_second={self.runs_per_second:.0f})")
+
+
+def run_bandit(testbed:BanditTestbed, bandit, steps=1000, alpha=None, batch=None) -> BanditResults:
+    """
+    Simula una estrategia en todos los problemas del banco de pruebas.
+
+    Las estimaciones de cada brazo empiezan en 0 y se actualizan con la media de las
+    recompensas o, si se indica alpha, con un paso constante (mejor con medias que se mueven).
+
+    Args:
+        testbed (BanditTestbed): banco de pruebas (se reinicia al empezar).
+        bandit (MultiArmedBandit): estrategia (se reinicia al empezar).
+        steps (int): pasos de cada problema. Por defecto 1000.
+        alpha (float, optional): paso constante de actualización de las estimaciones.
+        batch (bool, optional): si es True se usa select_batch y si es False select. Por
+            defecto select_batch para las estrategias de vectorized_bandits.
+
+    Returns:
+        BanditResults: recompensa, arrepentimiento y tasa de acción óptima medios de cada paso.
+    """
+    if batch is None:
+        batch = isinstance(bandit, ArrayBandit)
+    testbed.reset()
+    bandit.reset()
+    # Una copia de la estrategia por problema si se usa select
+    bandits = None if batch else [copy.deepcopy(bandit) for _ in range(testbed.num_runs)]
+
+    (num_runs, num_arms) = (testbed.num_runs, testbed.num_arms)
+    rows = np.arange(num_runs)
+    actions_list = list(range(num_arms))
+    estimates = np.zeros((num_runs, num_arms))
+    counts = np.zeros((num_runs, num_arms), dtype=np.int64)
+    qfunction = EstimatesQFunction(estimates)
+    results = BanditResults(steps, num_runs)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        if batch:
+            actions = bandit.select_batch(estimates, rows)
+        else:
+            actions = np.array([bandits[run].select(run, actions_list, qfunction) for run in range(num_runs)])
+
+        (rewards, regrets, optimal) = testbed.pull(actions)
+        counts[rows, actions] += 1
+        step_size = alpha if alpha is not None else 1.0 / counts[rows, actions]
+        estimates[rows, actions] += step_size * (rewards - estimates[rows, actions])
+        results.record(step, rewards, regrets, optimal)
+
+    results.wall_time = time.perf_counter() - start
+    return results
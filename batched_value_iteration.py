@@ -0,0 +1,149 @@
+import numpy as np
+from tabular_policy import TabularPolicy
+from tabular_value_function import TabularValueFunction
+
+"""
+CLASE PARA RESOLVER A LA VEZ UNA FAMILIA DE MDP CON LA MISMA ESTRUCTURA
+
+Pensada para barridos de parámetros: variantes de un mismo modelo (por ejemplo GridWorld
+con distinto noise, discount_factor, action_cost o recompensas de las metas) que tienen
+los mismos estados y las mismas acciones válidas en cada estado. Cada variante se
+compila en formato CSR y todas se apilan sobre una única estructura: las filas (estado,
+acción) son comunes y las transiciones son la unión de las de todas las variantes (con
+probabilidad 0 en las que no la tienen). Las probabilidades y recompensas son matrices
+con una fila por variante, y cada barrido aplica la ecuación de Bellman a todas las
+variantes que no han convergido con las mismas operaciones de arrays.
+
+Cada variante termina con el mismo criterio que ValueIteration (el cambio máximo de su
+barrido es menor que theta) y deja de calcularse a partir de ese momento.
+"""
+
+class BatchedValueIteration:
+    def __init__(self, mdps, compiled=None):
+        """
+        Args:
+            mdps (List[MDP]): las variantes, con los mismos estados y acciones válidas.
+            compiled (List[SparseMDP], optional): las variantes ya compiladas (mdp.compile(sparse=True)).
+        """
+        if len(mdps) == 0:
+            raise ValueError("Hace falta al menos un modelo")
+        self.mdps = mdps
+        compiled = compiled if compiled is not None else [mdp.compile(sparse=True) for mdp in mdps]
+        self.stack(compiled)
+        self.values = None
+        self.policies = None
+        self.iterations = None
+
+    def stack(self, compiled) -> None:
+        """Comprueba que las variantes tienen la misma estructura y apila sus arrays"""
+        first = compiled[0]
+        for model in compiled[1:]:
+            if (model.states != first.states or model.actions != first.actions
+                    or not np.array_equal(model.state_offsets, first.state_offsets)
+                    or not np.array_equal(model.row_actions, first.row_actions)):
+                raise ValueError("Los modelos no tienen los mismos estados y acciones válidas")
+        self.model = first
+        num_states = first.num_states
+
+        # Unión de las transiciones (fila, sucesor) de todas las variantes
+        keys = [np.repeat(np.arange(model.num_rows, dtype=np.int64), np.diff(model.row_offsets)) * num_states
+                + model.successors for model in compiled]
+        union = np.unique(np.concatenate(keys))
+        (rows, self.successors) = np.divmod(union, num_states)
+        self.row_offsets = np.searchsorted(rows, np.arange(first.num_rows))
+        self.probabilities = np.zeros((len(union), len(compiled)))
+        for (v, (model, model_keys)) in enumerate(zip(compiled, keys)):
+            self.probabilities[np.searchsorted(union, model_keys), v] = model.probabilities
+        self.rewards = np.array([model.row_rewards for model in compiled], dtype=np.float64).T.copy()
+        self.discount_factors = np.array([model.discount_factor for model in compiled])
+
+        has_actions = first.has_actions()
+        self.state_starts = first.state_offsets[:-1][has_actions]
+        self.has_actions = has_actions
+
+    @property
+    def num_variants(self) -> int:
+        return len(self.mdps)
+
+    def bellman_backup(self, values: np.ndarray, variants: np.ndarray):
+        """
+        Aplica la ecuación de Bellman a varias variantes a la vez.
+
+        Args:
+            values (np.ndarray): (S, N) valores de las variantes indicadas, una por columna.
+            variants (np.ndarray): índices de las N variantes.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: los nuevos valores (S, N) y los valores Q (F, N) de cada fila.
+        """
+        return self._backup(values, self.probabilities[:, variants], self.rewards[:, variants],
+                            self.discount_factors[variants])
+
+    def _backup(self, values, probabilities, rewards, discount_factors):
+        new_values = np.zeros_like(values)
+        if len(self.successors) == 0:
+            return (new_values, np.zeros((0, values.shape[1])))
+        expected_next = np.add.reduceat(probabilities * values[self.successors], self.row_offsets, axis=0)
+        q_values = rewards + discount_factors * expected_next
+        new_values[self.has_actions] = np.maximum.reduceat(q_values, self.state_starts, axis=0)
+        return (new_values, q_values)
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        """
+        Iteración de valores de todas las variantes, empezando en 0.
+
+        Returns:
+            List: para cada variante, la iteración en la que converge (como ValueIteration) o None.
+            Los valores y políticas quedan en values y policies (una por variante).
+        """
+        model = self.model
+        values = np.zeros((model.num_states, self.num_variants))
+        self.iterations = [None] * self.num_variants
+        # Arrays de las variantes que no han convergido (se recortan solo cuando alguna converge)
+        active = np.arange(self.num_variants)
+        (active_values, probabilities, rewards, discount_factors) = (
+            values, self.probabilities, self.rewards, self.discount_factors)
+
+        for i in range(max_iterations):
+            if len(active) == 0:
+                break
+            (new_values, _) = self._backup(active_values, probabilities, rewards, discount_factors)
+            delta = np.abs(new_values - active_values).max(axis=0) if model.num_states else np.zeros(len(active))
+            active_values = new_values
+
+            # Las variantes que convergen dejan de actualizarse
+            converged = delta < theta
+            if converged.any():
+                values[:, active] = active_values
+                for v in active[converged].tolist():
+                    self.iterations[v] = i
+                keep = ~converged
+                active = active[keep]
+                (active_values, probabilities, rewards, discount_factors) = (
+                    active_values[:, keep], probabilities[:, keep], rewards[:, keep], discount_factors[keep])
+        values[:, active] = active_values
+
+        self.values = []
+        self.policies = []
+        best_actions = self.greedy_actions(values)
+        for v in range(self.num_variants):
+            value_function = TabularValueFunction()
+            model.array_to_values(values[:, v], value_function)
+            self.values.append(value_function)
+            policy = TabularPolicy()
+            model.array_to_policy(best_actions[:, v], policy)
+            self.policies.append(policy)
+        return self.iterations
+
+    def greedy_actions(self, values: np.ndarray) -> np.ndarray:
+        """Índice (S, N) de la acción voraz de cada estado en cada variante (la primera que alcanza el máximo)"""
+        model = self.model
+        (best_values, q_values) = self.bellman_backup(values, np.arange(self.num_variants))
+        best_actions = np.full(values.shape, -1, dtype=np.int64)
+        if len(q_values) == 0:
+            return best_actions
+        row_numbers = np.arange(model.num_rows)[:, None]
+        candidates = np.where(q_values >= best_values[model.row_states], row_numbers, model.num_rows)
+        best_rows = np.minimum.reduceat(candidates, self.state_starts, axis=0)
+        best_actions[self.has_actions] = model.row_actions[best_rows]
+        return best_actions
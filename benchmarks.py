@@ -0,0 +1,792 @@
+import time
+import random
+import numpy as np
+from gridworld import GridWorld
+from vehiclesplope import VehicleSlopeV2
+from tabular_policy import TabularPolicy
+from policy_iteration import PolicyIteration
+from qtable import QTable
+from array_qtable import ArrayQTable
+from sparse_mdp import sparse_policy_evaluation
+from tabular_value_function import TabularValueFunction
+from value_iteration import ValueIteration
+from vectorized_value_iteration import VectorizedValueIteration
+from prioritized_value_iteration import PrioritizedValueIteration
+from parallel_value_iteration import ParallelValueIteration
+from multi_armed_bandit import EpsilonGreedy, Softmax, UpperConfidenceBounds
+from vectorized_bandits import VectorEpsilonGreedy, VectorSoftmax, VectorUpperConfidenceBounds
+from bandit_testbed import BanditTestbed, run_bandit
+from vehiclesplope import VehicleSlopeV1
+from reachable_mdp import ReachableMDP
+from rtdp import RTDP
+from topological_value_iteration import TopologicalValueIteration
+from bisimulation import QuotientMDP
+from accelerated_value_iteration import AcceleratedValueIteration
+from random_mdp import RandomMDP
+from batched_value_iteration import BatchedValueIteration
+from multigrid_value_iteration import MultigridValueIteration
+
+"""
+Pruebas de rendimiento de los algoritmos.
+
+Cada función ejecuta un experimento y muestra una tabla por pantalla.
+Se pueden lanzar desde el notebook o con: python -c "import benchmarks; benchmarks.<función>()"
+"""
+
+
+def print_table(header, rows) -> None:
+    """
+    Imprime una tabla con el mismo formato que print_policy_table.
+
+    Args:
+        header (List[str]): nombres de las columnas.
+        rows (List[List]): filas de la tabla.
+    """
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    line = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    print(line)
+    print("| " + " | ".join(f"{str(h):<{w}}" for (h, w) in zip(header, widths)) + " |")
+    print(line)
+    for row in rows:
+        print("| " + " | ".join(f"{str(c):<{w}}" for (c, w) in zip(row, widths)) + " |")
+    print(line)
+
+
+def benchmark_vectorized_value_iteration(size=100, max_iterations=1000, theta=0.001) -> None:
+    """
+    Compara ValueIteration con VectorizedValueIteration en un GridWorld de size x size.
+    Muestra los tiempos, el factor de aceleración y la diferencia máxima entre los valores.
+    Con size=100 se midió 15.8 s frente a 0.17 s con la compilación (92.8x) y 0.12 s
+    sin ella (128.7x). La compilación es rápida porque GridWorld.compile construye los
+    arrays a partir de successor_table; con el MDP.compile genérico, que recorre
+    get_transitions() estado a estado, tardaba 0.43 s y la aceleración total era de 17.6x.
+    """
+    gridworld = GridWorld(width=size, height=size)
+
+    values = TabularValueFunction()
+    start = time.perf_counter()
+    iterations = ValueIteration(gridworld, values).value_iteration(max_iterations, theta)
+    python_time = time.perf_counter() - start
+
+    fast_values = TabularValueFunction()
+    start = time.perf_counter()
+    solver = VectorizedValueIteration(gridworld, fast_values)
+    compile_time = time.perf_counter() - start
+    fast_iterations = solver.value_iteration(max_iterations, theta)
+    fast_time = time.perf_counter() - start
+
+    error = max(abs(values.get_value(s) - fast_values.get_value(s)) for s in gridworld.get_states())
+    print_table(
+        ["Motor", "Iteraciones", "Tiempo (s)", "Aceleración"],
+        [["Python", iterations, f"{python_time:.3f}", "1.0x"],
+         ["NumPy (con compilación)", fast_iterations, f"{fast_time:.3f}", f"{python_time / fast_time:.1f}x"],
+         ["NumPy (solo iteración)", fast_iterations, f"{fast_time - compile_time:.3f}",
+          f"{python_time / (fast_time - compile_time):.1f}x"]],
+    )
+    print(f"Diferencia máxima entre valores: {error:.2e} (theta = {theta})")
+
+
+def benchmark_sparse_mdp(sizes=(100, 317, 1000), sweeps=10) -> None:
+    """
+    Memoria y tiempo por barrido del formato CSR (SparseMDP) en GridWorlds de
+    aproximadamente 10^4, 10^5 y 10^6 estados. Se compara con la memoria que ocuparía
+    el tensor de sucesores (S, A, K) de CompiledMDP y el tensor denso S×A×S.
+    """
+    rows = []
+    for size in sizes:
+        gridworld = GridWorld(width=size, height=size)
+        start = time.perf_counter()
+        model = gridworld.compile(sparse=True)
+        compile_time = time.perf_counter() - start
+
+        values = np.zeros(model.num_states)
+        start = time.perf_counter()
+        for _ in range(sweeps):
+            (values, _) = model.bellman_backup(values)
+        vi_time = (time.perf_counter() - start) / sweeps
+
+        policy_rows = model.state_offsets[:-1].astype(np.int64)
+        policy_rows[~model.has_actions()] = -1
+        start = time.perf_counter()
+        sparse_policy_evaluation(model, policy_rows, values, max_iterations=sweeps, theta=0.0)
+        pe_time = (time.perf_counter() - start) / sweeps
+
+        # (S, A, K) con índices, probabilidades y recompensas, más la máscara y R(s,a)
+        max_successors = np.diff(model.row_offsets).max()
+        padded_bytes = model.num_states * model.num_actions * (max_successors * 3 * 8 + 1 + 8)
+        dense_bytes = model.num_states ** 2 * model.num_actions * 8
+        rows.append([model.num_states, model.num_transitions,
+                     f"{model.nbytes / 2**20:.1f}", f"{padded_bytes / 2**20:.1f}",
+                     f"{dense_bytes / 2**30:.1f}", f"{compile_time:.2f}",
+                     f"{vi_time * 1000:.2f}", f"{pe_time * 1000:.2f}"])
+
+    print_table(["Estados", "Transiciones", "CSR (MiB)", "(S,A,K) (MiB)", "Denso (GiB)",
+                 "Compilación (s)", "Barrido VI (ms)", "Barrido EP (ms)"], rows)
+
+
+def benchmark_prioritized_value_iteration(sizes=(20, 50, 100), theta=0.001) -> None:
+    """
+    Compara el número de actualizaciones de Bellman de la iteración de valores síncrona
+    (iteraciones × estados) con la versión asíncrona priorizada en GridWorlds de varios tamaños.
+    """
+    rows = []
+    for size in sizes:
+        gridworld = GridWorld(width=size, height=size, goals=[((size - 1, size - 1), 10), ((size // 2, size // 2), -5)])
+        compiled = gridworld.compile()
+
+        values = TabularValueFunction()
+        start = time.perf_counter()
+        iterations = VectorizedValueIteration(gridworld, values, compiled).value_iteration(10000, theta)
+        sync_time = time.perf_counter() - start
+        sync_backups = (iterations + 1) * compiled.num_states
+
+        async_values = TabularValueFunction()
+        start = time.perf_counter()
+        backups = PrioritizedValueIteration(gridworld, async_values, compiled).value_iteration(theta=theta)
+        async_time = time.perf_counter() - start
+
+        error = max(abs(values.get_value(s) - async_values.get_value(s)) for s in compiled.states)
+        rows.append([compiled.num_states, iterations + 1, sync_backups, backups,
+                     f"{sync_backups / backups:.1f}x", f"{sync_time:.3f}", f"{async_time:.3f}", f"{error:.1e}"])
+
+    print_table(["Estados", "Barridos", "Actualizaciones síncronas", "Actualizaciones priorizadas",
+                 "Ahorro", "Tiempo síncrono (s)", "Tiempo priorizado (s)", "Diferencia máx."], rows)
+
+
+def benchmark_parallel_value_iteration(size=300, workers=(1, 2, 4, 8, 16, 32), max_iterations=50) -> None:
+    """
+    Escalado de ParallelValueIteration de 1 a N procesos en un GridWorld de size x size.
+    Se ejecuta un número fijo de iteraciones (theta = 0) para que todas las
+    configuraciones hagan el mismo trabajo, y se comprueba que el resultado coincide
+    con la versión en serie.
+    """
+    gridworld = GridWorld(width=size, height=size)
+    compiled = gridworld.compile()
+
+    serial_values = TabularValueFunction()
+    start = time.perf_counter()
+    VectorizedValueIteration(gridworld, serial_values, compiled).value_iteration(max_iterations, theta=0.0)
+    serial_time = time.perf_counter() - start
+
+    rows = [["serie", f"{serial_time:.3f}", "1.0x", "-"]]
+    for n in workers:
+        values = TabularValueFunction()
+        start = time.perf_counter()
+        ParallelValueIteration(gridworld, values, n, compiled).value_iteration(max_iterations, theta=0.0)
+        parallel_time = time.perf_counter() - start
+        error = max(abs(values.get_value(s) - serial_values.get_value(s)) for s in compiled.states)
+        rows.append([n, f"{parallel_time:.3f}", f"{serial_time / parallel_time:.1f}x", f"{error:.1e}"])
+
+    print(f"GridWorld {size}x{size}, {compiled.num_states} estados, {max_iterations} iteraciones")
+    print_table(["Procesos", "Tiempo (s)", "Aceleración", "Diferencia máx."], rows)
+
+
+def benchmark_policy_evaluation_modes(size=20, sweeps=(1, 5, 20), max_iterations=300) -> None:
+    """
+    Compara los modos de evaluación de PolicyIteration (iterativo, exacto y modificado con
+    distintos barridos) en un GridWorld de size x size y en VehicleSlopeV2 (γ = 1):
+    iteraciones externas y tiempo total.
+    """
+    models = [
+        (f"GridWorld {size}x{size}", lambda: GridWorld(width=size, height=size)),
+        ("VehicleSlopeV2", lambda: VehicleSlopeV2()),
+    ]
+    configurations = [("iterative", None), ("exact", None)] + [("modified", k) for k in sweeps]
+
+    rows = []
+    for (name, build) in models:
+        for (mode, k) in configurations:
+            model = build()
+            policy = TabularPolicy(default_action=model.get_actions()[0])
+            solver = PolicyIteration(model, policy, evaluation=mode, evaluation_sweeps=k or 5)
+            start = time.perf_counter()
+            iterations = solver.policy_iteration(max_iterations)
+            elapsed = time.perf_counter() - start
+            label = mode if k is None else f"{mode} ({k} barridos)"
+            rows.append([name, label, iterations, f"{elapsed:.3f}"])
+
+    print_table(["Modelo", "Evaluación", "Iteraciones", "Tiempo (s)"], rows)
+
+
+def benchmark_array_qtable(action_counts=(2, 5, 20, 50), states=1000, calls=100000) -> None:
+    """
+    Tiempo medio de get_max_q y get_q_value en QTable y ArrayQTable según el número de acciones.
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in action_counts:
+        actions = list(range(n))
+        queries = rng.integers(states, size=calls).tolist()
+        times = []
+        for qfunction in (QTable(), ArrayQTable()):
+            for state in range(states):
+                for action in actions:
+                    qfunction.update(state, action, float(rng.random()))
+
+            start = time.perf_counter()
+            for state in queries:
+                qfunction.get_max_q(state, actions)
+            times.append((time.perf_counter() - start) / calls)
+
+            start = time.perf_counter()
+            for state in queries:
+                qfunction.get_q_value(state, 0)
+            times.append((time.perf_counter() - start) / calls)
+
+        rows.append([n, f"{times[0] * 1e6:.2f}", f"{times[2] * 1e6:.2f}", f"{times[0] / times[2]:.1f}x",
+                     f"{times[1] * 1e6:.2f}", f"{times[3] * 1e6:.2f}"])
+
+    print_table(["Acciones", "get_max_q QTable (µs)", "get_max_q ArrayQTable (µs)", "Aceleración",
+                 "get_q_value QTable (µs)", "get_q_value ArrayQTable (µs)"], rows)
+
+
+def check_vector_envs(num_envs=8, steps=2000, seed=0) -> None:
+    """
+    Comprueba paso a paso que VectorCartPole y VectorMountainCar siguen la misma física
+    que CartPole y MountainCar: cada entorno vectorizado se simula en paralelo con una
+    instancia escalar que parte del mismo estado y recibe las mismas acciones.
+
+    Con acciones aleatorias MountainCar casi nunca llega a la meta, así que la mitad de
+    sus entornos empieza cerca de ella (x=0.4, v=0.05) para comprobar también los finales
+    de episodio y los reinicios. Falla si algún entorno no termina ningún episodio.
+    """
+    # Importación local: los entornos solo hacen falta en estas pruebas
+    from cartpole import CartPole
+    from mountaincar import MountainCar
+    from vector_env import VectorCartPole, VectorMountainCar
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    # Estado de partida de la mitad de los entornos (None: el estado inicial del entorno)
+    near_goal = {VectorCartPole: None, VectorMountainCar: (0.4, 0.05)}
+    for (vector_class, scalar_class) in ((VectorCartPole, CartPole), (VectorMountainCar, MountainCar)):
+        env = vector_class(num_envs, seed=seed)
+        if near_goal[vector_class] is not None:
+            env.states[:max(1, num_envs // 2)] = near_goal[vector_class]
+        actions_list = np.array(env.get_actions())
+        scalars = [scalar_class() for _ in range(num_envs)]
+        for (scalar, state) in zip(scalars, env.states):
+            scalar.state = tuple(state.tolist())
+
+        max_error = 0.0
+        mismatches = 0
+        episodes = 0
+        for _ in range(steps):
+            actions = rng.choice(actions_list, size=num_envs)
+            (states, rewards, dones) = env.step(actions)
+            for (i, scalar) in enumerate(scalars):
+                (state, reward, done) = scalar.execute(int(actions[i]))
+                max_error = max(max_error, float(np.abs(np.array(state, dtype=float) - env.final_states[i]).max()))
+                mismatches += int(reward != rewards[i]) + int(bool(done) != bool(dones[i]))
+                if dones[i]:
+                    # Se continúa desde el estado reiniciado del entorno vectorizado
+                    scalar.state = tuple(states[i].tolist())
+                    scalar.steps_beyond_terminated = None
+                    episodes += 1
+
+        assert episodes > 0, f"{vector_class.__name__} no ha terminado ningún episodio en {steps} pasos"
+        rows.append([vector_class.__name__, num_envs * steps, episodes, f"{max_error:.1e}", mismatches])
+
+    print_table(["Entorno", "Pasos comparados", "Episodios terminados", "Error máx. del estado",
+                 "Recompensas/fin distintos"], rows)
+
+
+def benchmark_vector_envs(num_envs=(1, 100, 10000, 100000), steps=200, seed=0) -> None:
+    """
+    Pasos de entorno por segundo de los simuladores vectorizados frente a los escalares.
+    """
+    from cartpole import CartPole
+    from mountaincar import MountainCar
+    from vector_env import VectorCartPole, VectorMountainCar
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for (vector_class, scalar_class) in ((VectorCartPole, CartPole), (VectorMountainCar, MountainCar)):
+        scalar = scalar_class()
+        scalar.get_initial_state()
+        actions_list = scalar.get_actions(None)
+        start = time.perf_counter()
+        for i in range(10000):
+            (_, _, done) = scalar.execute(actions_list[i % len(actions_list)])
+            if done:
+                scalar.get_initial_state()
+        rows.append([scalar_class.__name__, 1, f"{10000 / (time.perf_counter() - start):,.0f}"])
+
+        for n in num_envs:
+            env = vector_class(n, seed=seed)
+            actions = rng.choice(np.array(env.get_actions()), size=(steps, n))
+            start = time.perf_counter()
+            for t in range(steps):
+                env.step(actions[t])
+            rows.append([vector_class.__name__, n, f"{n * steps / (time.perf_counter() - start):,.0f}"])
+
+    print_table(["Entorno", "Entornos", "Pasos por segundo"], rows)
+
+
+def benchmark_tile_coding_mountaincar(episodes=300, discount_factor=0.99, max_steps=2000, solved_steps=200,
+                                      window=50, seeds=(0, 1, 2)) -> None:
+    """
+    Episodios hasta resolver MountainCar con Q-learning usando la Q-tabla por defecto
+    (28x18 casillas), una Q-tabla fina (100x100) y TileCodingQFunction (8 rejillas de 8x8
+    teselas, indexado directo). Se considera resuelto en el primer episodio en que la media
+    de pasos de los últimos window episodios es como mucho solved_steps. Los episodios se
+    cortan en max_steps pasos. Con el factor de descuento por defecto del ejecutor (0.9)
+    las diferencias entre los valores Q son tan pequeñas que ninguna variante aprende de
+    forma fiable, por eso se usa 0.99.
+    """
+    from mountaincar import MountainCar, QLearningMountainCar
+    from discretizer import BinDiscretizer
+    from tile_coding import TileCodingQFunction
+
+    def fine_qtable(runner):
+        runner.discretizer = BinDiscretizer([np.linspace(-1.2, 0.6, 100), np.linspace(-0.07, 0.07, 100)])
+
+    agents = [
+        ("QTable 28x18", lambda: QTable(), True, None),
+        ("QTable 100x100", lambda: QTable(), True, fine_qtable),
+        ("Tile coding 8x8x8", lambda: TileCodingQFunction([-1.2, -0.07], [0.6, 0.07], 8, 8), False, None),
+    ]
+    rows = []
+    for (name, make_qfunction, discretize, configure) in agents:
+        (solved, final_steps, total_steps, elapsed) = ([], [], 0, 0.0)
+        for seed in seeds:
+            random.seed(seed)
+            qfunction = make_qfunction()
+            runner = QLearningMountainCar(MountainCar(discount_factor), EpsilonGreedy(), qfunction,
+                                          discretize=discretize)
+            if configure is not None:
+                configure(runner)
+            results = runner.train(episodes, max_steps=max_steps)
+            means = np.convolve(results.steps, np.ones(window) / window, "valid")
+            reached = np.flatnonzero(means <= solved_steps)
+            solved.append(str(reached[0] + window) if len(reached) else "-")
+            final_steps.append(results.steps[-window:].mean())
+            total_steps += results.total_steps
+            elapsed += results.wall_time
+        memory = len(qfunction.qtable) if isinstance(qfunction, QTable) else qfunction.weights.size
+        rows.append([name, memory, " ".join(solved), f"{np.mean(final_steps):.0f}", total_steps, f"{elapsed:.1f}"])
+
+    print_table(["Función Q", "Entradas", "Episodio resuelto (por semilla)",
+                 f"Pasos (últimos {window})", "Pasos totales", "Tiempo (s)"], rows)
+
+
+def benchmark_bandit_strategies(num_runs=2000, select_runs=200, num_arms=10, steps=1000,
+                                arms="gaussian", drift=0.0, seed=0) -> None:
+    """
+    Arrepentimiento acumulado, tasa de acción óptima y problemas por segundo de cada
+    estrategia en el banco de pruebas de k brazos. Las estrategias de siempre se
+    ejecutan con select sobre select_runs problemas y las vectorizadas con
+    select_batch sobre num_runs problemas. Con drift > 0 las estimaciones usan un
+    paso constante de 0.1.
+    """
+    alpha = 0.1 if drift > 0 else None
+    strategies = [
+        ("EpsilonGreedy(0.1)", EpsilonGreedy(0.1), select_runs),
+        ("Softmax(0.2)", Softmax(0.2), select_runs),
+        ("UpperConfidenceBounds", UpperConfidenceBounds(), select_runs),
+        ("VectorEpsilonGreedy(0.1)", VectorEpsilonGreedy(0.1, seed=seed), num_runs),
+        ("VectorSoftmax(0.2)", VectorSoftmax(0.2, seed=seed), num_runs),
+        ("VectorUpperConfidenceBounds", VectorUpperConfidenceBounds(num_arms, seed=seed), num_runs),
+    ]
+    rows = []
+    for (name, bandit, runs) in strategies:
+        testbed = BanditTestbed(runs, num_arms, arms=arms, drift=drift, seed=seed)
+        results = run_bandit(testbed, bandit, steps, alpha=alpha)
+        rows.append([name, runs, f"{results.cumulative_regret[-1]:.1f}",
+                     f"{results.optimal_rate[-100:].mean():.3f}", f"{results.runs_per_second:,.1f}"])
+
+    print_table(["Estrategia", "Problemas", "Arrepentimiento acumulado",
+                 "Acción óptima (últimos 100 pasos)", "Problemas por segundo"], rows)
+
+
+def check_transition_sampler(samples=20000, seed=0) -> None:
+    """
+    Comprueba que execute y execute_batch muestrean los sucesores con las probabilidades
+    de get_transitions. Para cada par (estado, acción) se comparan las frecuencias con
+    las probabilidades (error máximo) y se calcula el estadístico chi-cuadrado. La suma
+    de los estadísticos dividida entre la suma de los grados de libertad debe estar
+    cerca de 1 si el muestreo no tiene sesgo.
+    """
+    random.seed(seed)
+    rows = []
+    for mdp in (GridWorld(width=5, height=5), VehicleSlopeV1(), VehicleSlopeV2()):
+        for method in ("execute", "execute_batch"):
+            max_error = 0.0
+            (chi2, degrees_of_freedom) = (0.0, 0)
+            pairs = 0
+            for state in mdp.get_states():
+                for action in mdp.get_actions(state):
+                    probabilities = {}
+                    for (next_state, probability) in mdp.get_transitions(state, action):
+                        probabilities[next_state] = probabilities.get(next_state, 0.0) + probability
+                    if len(probabilities) == 0:
+                        continue
+                    if method == "execute":
+                        sampled = [mdp.execute(state, action)[0] for _ in range(samples)]
+                    else:
+                        (sampled, _) = mdp.execute_batch([state] * samples, [action] * samples)
+                    counts = {}
+                    for next_state in sampled:
+                        counts[next_state] = counts.get(next_state, 0) + 1
+                    if not set(counts) <= set(probabilities):
+                        raise ValueError(f"Sucesor imposible para la acción {action} del estado {state}")
+
+                    support = [next_state for (next_state, p) in probabilities.items() if p > 0]
+                    for next_state in support:
+                        max_error = max(max_error, abs(counts.get(next_state, 0) / samples - probabilities[next_state]))
+                    chi2 += sum((counts.get(ns, 0) - samples * probabilities[ns]) ** 2 / (samples * probabilities[ns])
+                                for ns in support)
+                    degrees_of_freedom += len(support) - 1
+                    pairs += 1
+            ratio = f"{chi2 / degrees_of_freedom:.2f}" if degrees_of_freedom > 0 else "-"
+            rows.append([type(mdp).__name__, method, pairs, samples, f"{max_error:.4f}", degrees_of_freedom, ratio])
+
+    print_table(["Modelo", "Método", "Pares (s, a)", "Muestras por par", "Error máx. de frecuencia",
+                 "Grados de libertad", "chi2 / g.l."], rows)
+
+
+def benchmark_transition_sampler(size=10, steps=100000, seed=0) -> None:
+    """
+    Tiempo por paso de GridWorld.execute: recorrido lineal de get_transitions en cada
+    paso (la implementación anterior) frente a las tablas alias, paso a paso y en lote.
+    """
+    def linear_execute(mdp, state, action):
+        rand = random.random()
+        cumulative_probability = 0.0
+        for (new_state, probability) in mdp.get_transitions(state, action):
+            if cumulative_probability <= rand <= probability + cumulative_probability:
+                return (new_state, mdp.get_reward(state, action, new_state))
+            cumulative_probability += probability
+
+    random.seed(seed)
+    mdp = GridWorld(width=size, height=size)
+    states = [state for state in mdp.get_states() if state != mdp.TERMINAL and state not in mdp.goal_states]
+    moves = [mdp.UP, mdp.DOWN, mdp.LEFT, mdp.RIGHT]
+    (batch_states, batch_actions) = ([random.choice(states) for _ in range(steps)],
+                                     [random.choice(moves) for _ in range(steps)])
+    pairs = list(zip(batch_states, batch_actions))
+    # Construye las tablas antes de medir
+    mdp.execute_batch(batch_states, batch_actions)
+
+    rows = []
+    start = time.perf_counter()
+    for (state, action) in pairs:
+        linear_execute(mdp, state, action)
+    rows.append(["Recorrido lineal", f"{(time.perf_counter() - start) / steps * 1e6:.2f}"])
+    start = time.perf_counter()
+    for (state, action) in pairs:
+        mdp.execute(state, action)
+    rows.append(["Tabla alias (execute)", f"{(time.perf_counter() - start) / steps * 1e6:.2f}"])
+    start = time.perf_counter()
+    mdp.execute_batch(batch_states, batch_actions)
+    rows.append(["Tabla alias (execute_batch)", f"{(time.perf_counter() - start) / steps * 1e6:.2f}"])
+
+    print_table(["Muestreo", "Tiempo por paso (µs)"], rows)
+
+
+def benchmark_reachable_pruning(size=40, barrier=10, max_iterations=1000, theta=0.001) -> None:
+    """
+    Estados podados por ReachableMDP y tiempo de ValueIteration y PolicyIteration ("exact")
+    sobre el modelo completo y sobre la vista. En el GridWorld, una columna de metas en
+    x = barrier corta el paso (las metas solo admiten TERMINATE), así que las celdas de
+    detrás son inalcanzables desde (0, 0). En VehicleSlopeV2 se parte de la cima.
+    """
+    goals = [((barrier, y), -1) for y in range(size)] + [((barrier - 1, size - 1), 10)]
+    models = [(f"GridWorld {size}x{size}", GridWorld(width=size, height=size, goals=goals), None),
+              ("VehicleSlopeV2 (desde TOP)", VehicleSlopeV2(discount_factor=0.9), [VehicleSlopeV2.TOP])]
+    rows = []
+    for (name, mdp, start_states) in models:
+        start = time.perf_counter()
+        view = ReachableMDP(mdp, start_states)
+        prune_time = time.perf_counter() - start
+
+        times = []
+        results = []
+        for model in (mdp, view):
+            values = TabularValueFunction()
+            start = time.perf_counter()
+            ValueIteration(model, values).value_iteration(max_iterations, theta)
+            times.append(time.perf_counter() - start)
+            results.append(values)
+
+            policy = TabularPolicy(default_action=model.get_actions()[0])
+            start = time.perf_counter()
+            PolicyIteration(model, policy, evaluation="exact").policy_iteration(max_iterations, theta)
+            times.append(time.perf_counter() - start)
+
+        error = max(abs(results[0].get_value(state) - results[1].get_value(state)) for state in view.get_states())
+        rows.append([name, view.num_states, len(view.get_states()), view.num_pruned, f"{prune_time:.3f}",
+                     f"{times[0]:.2f}", f"{times[2]:.2f}", f"{times[1]:.2f}", f"{times[3]:.2f}", f"{error:.1e}"])
+
+    print_table(["Modelo", "Estados", "Alcanzables", "Podados", "Poda (s)", "VI completo (s)", "VI podado (s)",
+                 "PI completo (s)", "PI podado (s)", "Dif. máx. de V"], rows)
+
+
+def benchmark_rtdp(size=40, noises=(0.0, 0.1), goal=(4, 4), theta=0.001, seed=0) -> None:
+    """
+    Actualizaciones de Bellman, estados tocados y tiempo de RTDP y Labeled RTDP desde (0, 0)
+    frente a ValueIteration sobre todos los estados, en un GridWorld con una meta cerca del
+    inicio. Los métodos "+ heurística" usan como cota la recompensa de la meta descontada
+    por la distancia Manhattan; el resto, la cota por defecto R_max / (1 - γ), con R_max de
+    GridWorld.get_max_reward (sin recorrer los estados). El tiempo de RTDP incluye el
+    cálculo de la cota y la lectura perezosa del modelo; el de ValueIteration, solo los barridos.
+    Las comprobaciones son los residuos calculados para decidir si se ha convergido (sin
+    contar las actualizaciones). V(inicio) solo es comparable con el de ValueIteration en las
+    filas con "Convergido" = sí; con la cota por defecto LRTDP suele hacer más
+    actualizaciones que ValueIteration en mallas pequeñas.
+    """
+    rows = []
+    for noise in noises:
+        mdp = GridWorld(noise=noise, width=size, height=size, goals=[(goal, 10)], action_cost=-0.1)
+        start_state = mdp.get_initial_state()
+
+        def manhattan(state):
+            if state == mdp.TERMINAL:
+                return 0.0
+            distance = abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+            return 10 * mdp.discount_factor ** distance
+
+        values = TabularValueFunction()
+        start = time.perf_counter()
+        iterations = ValueIteration(mdp, values).value_iteration(1000, theta)
+        elapsed = time.perf_counter() - start
+        num_states = len(mdp.get_states())
+        rows.append([noise, "ValueIteration", (iterations + 1) * num_states, "-", num_states, f"{elapsed:.2f}",
+                     "sí" if iterations is not None else "no", f"{values.get_value(start_state):.4f}"])
+
+        for (name, labeled, heuristic) in (("RTDP", False, None), ("LRTDP", True, None),
+                                           ("RTDP + heurística", False, manhattan),
+                                           ("LRTDP + heurística", True, manhattan)):
+            random.seed(seed)
+            solver = RTDP(mdp, heuristic=heuristic, labeled=labeled)
+            start = time.perf_counter()
+            (values, _) = solver.solve(theta=theta)
+            elapsed = time.perf_counter() - start
+            rows.append([noise, name, solver.backups, solver.residual_checks, len(values.value_table),
+                         f"{elapsed:.2f}", "sí" if solver.converged else "no", f"{values.get_value(start_state):.4f}"])
+
+    print_table(["Ruido", "Método", "Actualizaciones", "Comprobaciones", "Estados tocados", "Tiempo (s)",
+                 "Convergido", "V(inicio)"], rows)
+
+
+def benchmark_topological_value_iteration(sizes=(10, 40), max_iterations=1000, theta=0.001) -> None:
+    """
+    Actualizaciones de Bellman, tiempo y diferencia máxima de valores de
+    TopologicalValueIteration (incluida la compilación del modelo) frente a ValueIteration,
+    con los barridos de cada componente fuertemente conexa (tamaño x barridos, en el orden
+    en que se resuelven).
+    """
+    models = [(f"GridWorld {size}x{size}", GridWorld(width=size, height=size)) for size in sizes]
+    models += [("VehicleSlopeV1", VehicleSlopeV1()), ("VehicleSlopeV2", VehicleSlopeV2())]
+
+    rows = []
+    for (name, mdp) in models:
+        states = mdp.get_states()
+        values = TabularValueFunction()
+        start = time.perf_counter()
+        iterations = ValueIteration(mdp, values).value_iteration(max_iterations, theta)
+        elapsed = time.perf_counter() - start
+        rows.append([name, "ValueIteration", len(states), (iterations + 1) * len(states), f"{elapsed:.3f}", "-", "-"])
+
+        topological_values = TabularValueFunction()
+        start = time.perf_counter()
+        solver = TopologicalValueIteration(mdp, topological_values)
+        solver.value_iteration(max_iterations, theta)
+        elapsed = time.perf_counter() - start
+        backups = sum(len(states) * sweeps for (states, sweeps) in zip(solver.components, solver.component_sweeps))
+        difference = max(abs(values.get_value(state) - topological_values.get_value(state)) for state in states)
+        sweeps = [f"{len(states)}x{sweeps}" for (states, sweeps) in zip(solver.components, solver.component_sweeps)]
+        sweeps = ", ".join(sweeps[:6]) + (", ..." if len(sweeps) > 6 else "")
+        rows.append([name, "Topological", len(states), backups, f"{elapsed:.3f}", f"{difference:.2e}", sweeps])
+
+    print_table(["Modelo", "Método", "Estados", "Actualizaciones", "Tiempo (s)", "Dif. máx.", "Barridos por componente"], rows)
+
+
+def benchmark_bisimulation(shapes=((40, 40), (150, 30)), epsilons=(0.0, 0.01), max_iterations=1000, theta=0.001) -> None:
+    """
+    Clases, memoria del modelo compilado y tiempo de ValueIteration sobre el MDP cociente
+    (incluida la partición) frente al GridWorld original, con una única meta en una
+    esquina, y error máximo de los valores trasladados a los estados originales.
+    """
+    rows = []
+    for (width, height) in shapes:
+        mdp = GridWorld(width=width, height=height, goals=[((0, 0), 10)])
+        states = mdp.get_states()
+        compiled = mdp.compile(sparse=True)
+        values = TabularValueFunction()
+        start = time.perf_counter()
+        ValueIteration(mdp, values).value_iteration(max_iterations, theta)
+        elapsed = time.perf_counter() - start
+        rows.append([f"{width}x{height}", "original", len(states), f"{compiled.nbytes / 1024:.0f}", "-",
+                     f"{elapsed:.2f}", "-", "-"])
+
+        for epsilon in epsilons:
+            start = time.perf_counter()
+            quotient = QuotientMDP(mdp, epsilon=epsilon, compiled=compiled)
+            partition_time = time.perf_counter() - start
+            quotient_values = TabularValueFunction()
+            ValueIteration(quotient, quotient_values).value_iteration(max_iterations, theta)
+            elapsed = time.perf_counter() - start
+            quotient_compiled = quotient.compile(sparse=True)
+            lifted = quotient.lift_values(quotient_values)
+            error = max(abs(values.get_value(state) - lifted.get_value(state)) for state in states)
+            rows.append([f"{width}x{height}", f"cociente ε={epsilon}", quotient.num_blocks,
+                         f"{quotient_compiled.nbytes / 1024:.0f}", quotient.rounds, f"{elapsed:.2f}",
+                         f"{partition_time:.2f}", f"{error:.2e}"])
+
+    print_table(["Malla", "Modelo", "Estados", "Memoria (KB)", "Rondas", "Tiempo (s)", "Partición (s)", "Error máx."], rows)
+
+
+def benchmark_anytime_value_iteration(size=20, time_budgets=(0.05, 0.2, 1.0), epsilons=(1.0, 0.1, 0.01)) -> None:
+    """
+    Modo anytime de ValueIteration con distintos presupuestos de tiempo y tolerancias: barridos,
+    tiempo, cota certificada de la pérdida de la política y pérdida real max_s V*(s) - V^π(s),
+    además del error de los valores devueltos, sobre un GridWorld de size x size.
+    """
+    gridworld = GridWorld(width=size, height=size)
+    compiled = gridworld.compile(sparse=True)
+    optimal = TabularValueFunction()
+    VectorizedValueIteration(gridworld, optimal, compiled).value_iteration(100000, 1e-12)
+    optimal = compiled.values_to_array(optimal)
+
+    rows = []
+    budgets = [("tiempo", f"{budget} s", {"time_budget": budget}) for budget in time_budgets]
+    budgets += [("epsilon", f"{epsilon}", {"epsilon": epsilon}) for epsilon in epsilons]
+    for (kind, label, arguments) in budgets:
+        solver = ValueIteration(gridworld, TabularValueFunction())
+        start = time.perf_counter()
+        (values, policy, bound) = solver.anytime(**arguments)
+        elapsed = time.perf_counter() - start
+        (policy_values, _) = sparse_policy_evaluation(compiled, compiled.policy_rows(policy),
+                                                      np.zeros(compiled.num_states), 100000, 1e-12)
+        loss = (optimal - policy_values).max()
+        error = np.abs(compiled.values_to_array(values) - optimal).max()
+        rows.append([kind, label, solver.iterations, f"{elapsed:.3f}", solver.stop_reason,
+                     f"{bound:.4f}", f"{loss:.4f}", f"{error:.4f}"])
+
+    print_table(["Límite", "Valor", "Barridos", "Tiempo (s)", "Parada", "Cota", "Pérdida real", "Error V"], rows)
+
+
+def benchmark_accelerated_value_iteration(size=20, random_states=2000, discounts=(0.9, 0.99),
+                                          omegas=(1.05, 1.2), theta=1e-6, seed=0) -> None:
+    """
+    Barridos, barridos descartados por la salvaguarda y tiempo de AcceleratedValueIteration
+    (sobre-relajación y Anderson) frente a la iteración de valores normal, en un GridWorld
+    y en un RandomMDP para cada factor de descuento, con el error máximo frente a V*.
+    """
+    rows = []
+    for discount_factor in discounts:
+        models = [(f"GridWorld {size}x{size}", GridWorld(width=size, height=size, discount_factor=discount_factor)),
+                  (f"RandomMDP {random_states}", RandomMDP(random_states, discount_factor=discount_factor, seed=seed))]
+        for (name, mdp) in models:
+            compiled = mdp.compile(sparse=True)
+            optimal = TabularValueFunction()
+            VectorizedValueIteration(mdp, optimal, compiled).value_iteration(100000, theta * 1e-4)
+            optimal = compiled.values_to_array(optimal)
+
+            methods = [("normal", None, 1.0)] + [(f"sor ω={omega}", "sor", omega) for omega in omegas]
+            methods.append(("anderson", "anderson", 1.0))
+            for (label, method, omega) in methods:
+                values = TabularValueFunction()
+                solver = AcceleratedValueIteration(mdp, values, method, omega, compiled=compiled)
+                start = time.perf_counter()
+                iterations = solver.value_iteration(100000, theta)
+                elapsed = time.perf_counter() - start
+                error = np.abs(compiled.values_to_array(values) - optimal).max()
+                rows.append([name, discount_factor, label, iterations + 1, solver.fallbacks,
+                             f"{elapsed:.3f}", f"{error:.1e}"])
+
+    print_table(["Modelo", "γ", "Método", "Barridos", "Descartados", "Tiempo (s)", "Error máx."], rows)
+
+
+def benchmark_action_elimination(size=20, evaluations=("exact", "modified"), theta=0.0001) -> None:
+    """
+    Iteración de políticas con y sin eliminación de acciones en un GridWorld de size x size:
+    iteraciones, valores Q calculados, tiempo y fracción de acciones eliminadas tras cada iteración.
+    """
+    gridworld = GridWorld(width=size, height=size)
+    rows = []
+    for evaluation in evaluations:
+        for action_elimination in (False, True):
+            solver = PolicyIteration(gridworld, TabularPolicy(), evaluation=evaluation,
+                                     action_elimination=action_elimination)
+            start = time.perf_counter()
+            iterations = solver.policy_iteration(theta=theta)
+            elapsed = time.perf_counter() - start
+            history = " ".join(f"{fraction:.2f}" for fraction in solver.elimination_history) \
+                if action_elimination else "-"
+            rows.append([evaluation, "sí" if action_elimination else "no", iterations, solver.q_evaluations,
+                         f"{elapsed:.3f}", history])
+
+    print_table(["Evaluación", "Eliminación", "Iteraciones", "Valores Q", "Tiempo (s)",
+                 "Fracción eliminada por iteración"], rows)
+
+
+def benchmark_batched_value_iteration(size=10, noises=(0.0, 0.1, 0.3), discounts=(0.9, 0.99),
+                                      action_costs=(0.0, -0.1), goal_rewards=(1, 5),
+                                      max_iterations=1000, theta=0.001) -> None:
+    """
+    Variantes de GridWorld resueltas por segundo con BatchedValueIteration frente a un bucle
+    de ValueIteration y otro de VectorizedValueIteration (todos incluyen la compilación),
+    con la diferencia máxima de valores y los estados con distinta política voraz.
+    """
+    goal = (size - 1, size - 1)
+    variants = [GridWorld(noise=noise, width=size, height=size, discount_factor=discount, action_cost=cost,
+                          goals=[(goal, reward), ((size - 1, size - 2), -1)])
+                for noise in noises for discount in discounts for cost in action_costs for reward in goal_rewards]
+    states = variants[0].get_states()
+
+    start = time.perf_counter()
+    solver = BatchedValueIteration(variants)
+    solver.value_iteration(max_iterations, theta)
+    batched_time = time.perf_counter() - start
+
+    rows = []
+    for (name, engine) in (("ValueIteration", ValueIteration), ("VectorizedValueIteration", VectorizedValueIteration)):
+        (difference, policy_differences) = (0.0, 0)
+        start = time.perf_counter()
+        solutions = []
+        for mdp in variants:
+            values = TabularValueFunction()
+            engine(mdp, values).value_iteration(max_iterations, theta)
+            solutions.append(values)
+        elapsed = time.perf_counter() - start
+        for (mdp, values, batched_values, batched_policy) in zip(variants, solutions, solver.values, solver.policies):
+            difference = max(difference, max(abs(values.get_value(s) - batched_values.get_value(s)) for s in states))
+            policy = values.extract_policy(mdp)
+            policy_differences += sum(policy.select_action(s) != batched_policy.select_action(s) for s in states)
+        rows.append([f"bucle de {name}", f"{elapsed:.3f}", f"{len(variants) / elapsed:.1f}",
+                     f"{difference:.1e}", policy_differences])
+    rows.append(["BatchedValueIteration", f"{batched_time:.3f}", f"{len(variants) / batched_time:.1f}", "-", "-"])
+
+    print(f"{len(variants)} variantes de GridWorld {size}x{size}")
+    print_table(["Motor", "Tiempo (s)", "Variantes/s", "Dif. máx.", "Políticas distintas"], rows)
+
+
+def benchmark_multigrid_value_iteration(sizes=(100, 500, 1000, 2000), discount_factor=0.99, action_cost=-0.01,
+                                        noise=0.1, theta=0.001) -> None:
+    """
+    Barridos de cada nivel, actualizaciones totales y tiempo de MultigridValueIteration frente
+    al arranque en frío (el mismo operador vectorizado sobre la malla original desde 0), en
+    GridWorld de size x size con una meta +1 y otra -1 en la esquina opuesta al inicio. Los dos
+    terminan con el mismo theta, así que ambos están a menos de γ theta / (1 - γ) de V*. El
+    tiempo incluye la construcción del solver (la jerarquía de mallas gruesas).
+    """
+    rows = []
+    for size in sizes:
+        gridworld = GridWorld(noise=noise, width=size, height=size, discount_factor=discount_factor,
+                              action_cost=action_cost, goals=[((size - 1, size - 1), 1), ((size - 1, size - 2), -1)])
+        results = []
+        for (name, coarsest) in (("frío", max(size, 1) + 1), ("multimalla", 16)):
+            start = time.perf_counter()
+            solver = MultigridValueIteration(gridworld, coarsest=coarsest)
+            solver.value_iteration(100000, theta)
+            elapsed = time.perf_counter() - start
+            results.append(solver.grid_values)
+            rows.append([f"{size}x{size}", name, " ".join(str(sweeps) for sweeps in solver.sweeps),
+                         solver.backups, f"{elapsed:.2f}"])
+        rows[-1].append(f"{np.abs(results[0] - results[1]).max():.1e}")
+        rows[-2].append("-")
+        del gridworld, results
+
+    print_table(["Malla", "Arranque", "Barridos por nivel", "Actualizaciones", "Tiempo (s)", "Dif. máx."], rows)
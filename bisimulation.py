@@ -0,0 +1,218 @@
+import math
+import numpy as np
+from mdp import MDP
+from tabular_policy import TabularPolicy
+from tabular_value_function import TabularValueFunction
+
+"""
+Minimización de un MDP por bisimulación.
+
+Dos estados son bisimilares si tienen las mismas acciones y, para cada acción, la
+misma recompensa esperada y la misma probabilidad de llegar a cada clase de estados
+bisimilares. Tienen por tanto el mismo valor óptimo y la misma acción óptima, así que
+basta con resolver el MDP cociente, con un estado por clase, y trasladar el resultado.
+
+La partición se calcula por refinamiento: se parte de una única clase y en cada ronda
+se separan los estados cuya firma (acciones, recompensas y probabilidad de llegar a
+cada clase de la ronda anterior) es distinta, hasta que no cambia. Tras k rondas los
+estados de una misma clase son indistinguibles durante k pasos, así que con una
+tolerancia epsilon > 0 basta con k rondas tales que 2 γ^k R_max / (1 - γ) <= epsilon:
+la diferencia de valor óptimo dentro de una clase queda acotada por epsilon y las
+regiones uniformes lejos de las recompensas se agrupan aunque no sean bisimilares.
+
+El modelo original se recorre una única vez (con compile) y el refinamiento trabaja
+sobre los arrays del modelo CSR. QuotientMDP es un MDP normal, con enteros como
+estados, que aceptan ValueIteration, PolicyIteration, compile(), etc.
+"""
+
+# Resolución con la que se comparan probabilidades y recompensas (errores de redondeo). Las
+# recompensas se comparan en relación a la mayor en valor absoluto, así que los enteros de
+# la firma no desbordan sea cual sea su escala
+RESOLUTION = 1e-9
+
+
+def bisimulation_partition(compiled, epsilon=0.0, max_rounds=None):
+    """
+    Partición de los estados de un modelo compilado en clases bisimilares.
+
+    Args:
+        compiled (SparseMDP): el modelo en formato CSR (mdp.compile(sparse=True)).
+        epsilon (float): tolerancia en el valor óptimo. Con 0.0 (por defecto) la
+            partición es la bisimulación exacta.
+        max_rounds (int, optional): número máximo de rondas de refinamiento.
+
+    Returns:
+        Tuple[np.ndarray, int]: la clase de cada estado (numeradas desde 0) y las rondas realizadas.
+    """
+    gamma = compiled.discount_factor
+    if epsilon > 0 and gamma < 1 and compiled.num_rows > 0:
+        max_reward = float(np.abs(compiled.row_rewards).max())
+        if max_reward > 0:
+            horizon = math.ceil(math.log(epsilon * (1 - gamma) / (2 * max_reward)) / math.log(gamma))
+            max_rounds = max(1, horizon) if max_rounds is None else min(max_rounds, max(1, horizon))
+
+    row_states = compiled.row_states.astype(np.int64)
+    row_actions = compiled.row_actions.astype(np.int64)
+    reward_scale = float(np.abs(compiled.row_rewards).max()) if compiled.num_rows > 0 else 0.0
+    reward_scale = reward_scale if reward_scale > 0 else 1.0
+    row_rewards = np.rint(compiled.row_rewards / (reward_scale * RESOLUTION)).astype(np.int64)
+    transition_rows = np.repeat(np.arange(compiled.num_rows), np.diff(compiled.row_offsets))
+    successors = compiled.successors.astype(np.int64)
+    probabilities = compiled.probabilities.astype(np.float64)
+
+    blocks = np.zeros(compiled.num_states, dtype=np.int64)
+    num_blocks = 1
+    rounds = 0
+    while max_rounds is None or rounds < max_rounds:
+        row_classes = _row_classes(row_actions, row_rewards, transition_rows, blocks[successors], probabilities)
+        # Firma del estado: su clase actual y la clase de la fila de cada acción (-1 si no la tiene)
+        signatures = np.full((compiled.num_states, compiled.num_actions + 1), -1, dtype=np.int64)
+        signatures[:, 0] = blocks
+        signatures[row_states, row_actions + 1] = row_classes
+        (blocks, new_num_blocks) = _number_rows(signatures)
+        rounds += 1
+        if new_num_blocks == num_blocks:
+            break
+        num_blocks = new_num_blocks
+    return (blocks, rounds)
+
+
+def _row_classes(row_actions, row_rewards, transition_rows, successor_blocks, probabilities):
+    """Numera las filas (estado, acción) con la misma acción, recompensa y probabilidad de llegar a cada clase"""
+    num_rows = len(row_actions)
+    # Probabilidad acumulada de cada par (fila, clase del sucesor), ordenados por fila y clase
+    order = np.lexsort((successor_blocks, transition_rows))
+    (rows, targets, mass) = (transition_rows[order], successor_blocks[order], probabilities[order])
+    starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (targets[1:] != targets[:-1])]) if len(rows) else rows
+    (rows, targets) = (rows[starts], targets[starts])
+    mass = np.rint(np.add.reduceat(mass, starts) / RESOLUTION).astype(np.int64) if len(starts) else mass.astype(np.int64)
+
+    # Posición de cada par dentro de su fila, para escribirlos en una matriz de ancho fijo
+    counts = np.bincount(rows, minlength=num_rows)
+    first = np.zeros(num_rows, dtype=np.int64)
+    np.cumsum(counts[:-1], out=first[1:])
+    position = np.arange(len(rows)) - first[rows]
+    width = int(counts.max()) if num_rows else 0
+
+    matrix = np.full((num_rows, 2 + 2 * width), -1, dtype=np.int64)
+    matrix[:, 0] = row_actions
+    matrix[:, 1] = row_rewards
+    matrix[rows, 2 + 2 * position] = targets
+    matrix[rows, 3 + 2 * position] = mass
+    return _number_rows(matrix)[0]
+
+
+def _number_rows(matrix):
+    """Numera las filas de una matriz de enteros (filas iguales, mismo número) y cuenta las distintas"""
+    numbers = np.zeros(len(matrix), dtype=np.int64)
+    if len(matrix) == 0:
+        return (numbers, 0)
+    # lexsort ordena por la última clave: se pasan las columnas al revés
+    order = np.lexsort(matrix.T[::-1])
+    ordered = matrix[order]
+    new = np.r_[True, (ordered[1:] != ordered[:-1]).any(axis=1)]
+    numbers[order] = np.cumsum(new) - 1
+    return (numbers, int(new.sum()))
+
+
+class QuotientMDP(MDP):
+
+    def __init__(self, mdp, epsilon=0.0, max_rounds=None, compiled=None) -> None:
+        """
+        Args:
+            mdp (MDP): el modelo original.
+            epsilon (float): tolerancia en el valor óptimo (ver bisimulation_partition).
+            max_rounds (int, optional): número máximo de rondas de refinamiento.
+            compiled (SparseMDP, optional): el modelo ya compilado en formato CSR.
+        """
+        self.mdp = mdp
+        compiled = compiled if compiled is not None else mdp.compile(sparse=True)
+        (blocks, self.rounds) = bisimulation_partition(compiled, epsilon, max_rounds)
+        self.num_original_states = compiled.num_states
+        self.num_blocks = int(blocks.max()) + 1 if len(blocks) else 0
+        self.block_index = dict(zip(compiled.states, blocks.tolist()))
+        block_sizes = np.bincount(blocks, minlength=self.num_blocks)
+        # Un representante de cada clase (el primero en el orden del modelo)
+        self.representatives = [None] * self.num_blocks
+        for (state, block) in zip(reversed(compiled.states), reversed(blocks.tolist())):
+            self.representatives[block] = state
+
+        # Transiciones y recompensas de cada clase: media sobre sus estados
+        row_blocks = blocks[compiled.row_states]
+        row_actions = compiled.row_actions.astype(np.int64)
+        transition_rows = np.repeat(np.arange(compiled.num_rows), np.diff(compiled.row_offsets))
+        num_actions = max(compiled.num_actions, 1)
+        keys = (row_blocks[transition_rows] * num_actions + row_actions[transition_rows]) * self.num_blocks \
+            + blocks[compiled.successors]
+        (keys, inverse) = np.unique(keys, return_inverse=True)
+        weights = compiled.probabilities / block_sizes[row_blocks[transition_rows]]
+        mass = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(keys))
+        row_keys = row_blocks * num_actions + row_actions
+        (pairs, inverse) = np.unique(row_keys, return_inverse=True)
+        rewards = np.bincount(inverse.reshape(-1), weights=compiled.row_rewards / block_sizes[row_blocks],
+                              minlength=len(pairs))
+
+        self.actions = [[] for _ in range(self.num_blocks)]
+        self.rewards = {}
+        for (pair, reward) in zip(pairs.tolist(), rewards.tolist()):
+            (block, action) = divmod(pair, num_actions)
+            self.actions[block].append(compiled.actions[action])
+            self.rewards[(block, compiled.actions[action])] = reward
+        self.transitions = {key: [] for key in self.rewards}
+        for (key, probability) in zip(keys.tolist(), mass.tolist()):
+            (pair, next_block) = divmod(key, self.num_blocks)
+            (block, action) = divmod(pair, num_actions)
+            self.transitions[(block, compiled.actions[action])].append((next_block, probability))
+        # Todas las acciones del cociente, en el orden del modelo compilado
+        used = {action for actions in self.actions for action in actions}
+        self.all_actions = [action for action in compiled.actions if action in used]
+
+    def get_block(self, state) -> int:
+        """Clase (estado del cociente) a la que pertenece un estado del modelo original"""
+        return self.block_index[state]
+
+    def get_states(self):
+        return list(range(self.num_blocks))
+
+    def is_terminal(self, state):
+        return self.mdp.is_terminal(self.representatives[state])
+
+    def get_discount_factor(self):
+        return self.mdp.get_discount_factor()
+
+    def get_initial_state(self):
+        initial_state = self.mdp.get_initial_state()
+        return None if initial_state is None else self.block_index[initial_state]
+
+    def get_goal_states(self):
+        goal_states = self.mdp.get_goal_states()
+        if isinstance(goal_states, dict):
+            return {self.block_index[state]: reward for (state, reward) in goal_states.items()}
+        return None if goal_states is None else list(dict.fromkeys(self.block_index[state] for state in goal_states))
+
+    def get_actions(self, state=None):
+        if state is None:
+            return self.all_actions
+        return self.actions[state]
+
+    def get_transitions(self, state, action):
+        return self.transitions.get((state, action), [])
+
+    def get_reward(self, state, action, next_state):
+        # La recompensa de cada clase es la esperada de la acción, sin depender del sucesor
+        return self.rewards[(state, action)]
+
+    def lift_values(self, values) -> TabularValueFunction:
+        """Valores de los estados del modelo original a partir de los valores del cociente"""
+        lifted = TabularValueFunction()
+        for (state, block) in self.block_index.items():
+            lifted.update(state, values.get_value(block))
+        return lifted
+
+    def lift_policy(self, policy) -> TabularPolicy:
+        """Política del modelo original: cada estado con acciones toma la acción de su clase"""
+        lifted = TabularPolicy()
+        for (state, block) in self.block_index.items():
+            if self.actions[block]:
+                lifted.update(state, policy.select_action(block))
+        return lifted
@@ -4,7 +4,8 @@ import random
 import time
 import numpy as np
 from typing import List, Tuple
-import matplotlib.pyplot as plt
+from training_results import TrainingResults
+from discretizer import UniformDiscretizer
 
 
 class CartPole:
@@ -116,7 +117,9 @@ class ModelFreeCartPole:
                  qfunction,
                  alpha=0.1,
                  buckets=(1, 1, 6, 3),
-                 print_info=False) -> None:
+                 print_info=False,
+                 encode_states=False,
+                 discretize=True) -> None:
         """ 
         Parámetros iniciales
         """
@@ -135,46 +138,43 @@ class ModelFreeCartPole:
         self.state_value_bounds = list(
             zip(self.lower_bounds, self.upper_bounds))
 
+        # Discretizador con las escalas precalculadas. Si encode_states es True, los
+        # estados discretos son un único entero en lugar de una tupla de casillas
+        self.discretizer = UniformDiscretizer(self.lower_bounds, self.upper_bounds, buckets)
+        self.encode_states = encode_states
+        # Con discretize=False los estados se pasan sin discretizar a la función Q
+        # (para funciones Q sobre estados continuos, como TileCodingQFunction)
+        self.discretize = discretize
+
 
     # https://arxiv.org/abs/2006.04938
 
-    def discretize_state(self, state_value) -> List[int]:
-        bucket_indices = []
-        for i in range(len(state_value)):
-            if state_value[i] <= self.state_value_bounds[i][0]:
-                bucket_index = 0
-            elif state_value[i] >= self.state_value_bounds[i][1]:
-                bucket_index = self.buckets[i] - 1
-            else:
-                bound_width = self.state_value_bounds[i][1] - \
-                    self.state_value_bounds[i][0]
-                offset = (self.buckets[i]-1) * \
-                    self.state_value_bounds[i][0] / bound_width
-                scaling = (self.buckets[i]-1) / bound_width
-                bucket_index = int(round(scaling*state_value[i] - offset))
-            bucket_indices.append(bucket_index)
-        return(tuple(bucket_indices))
+    def discretize_state(self, state_value):
+        if not self.discretize:
+            return tuple(state_value)
+        if self.encode_states:
+            return self.discretizer.discretize_encoded(state_value)
+        return self.discretizer.discretize(state_value)
 
 
-    def execute(self, episodes=100) -> None:
+    def train(self, episodes=100, verbose=False) -> TrainingResults:
+        """
+        Entrena sin gráficas ni esperas. Solo imprime por pantalla si verbose es True.
+
+        Returns:
+            TrainingResults: recompensa, pasos, epsilon y alpha por episodio, tiempo total y pasos por segundo.
+        """
         no_streaks = 0
         solved_time = 200
         streak_to_end = 120
-        time_per_episode = []
-        avgtime_per_episode = []
-        learning_rate_per_episode = []
-        explore_rate_per_episode = []
-
-        totaltime = 0
+        results = TrainingResults(episodes)
+        start = time.perf_counter()
 
         for episode in range(episodes):
 
             self.bandit.epsilon = select_explore_rate(episode)
             self.alpha = select_learning_rate(episode)
 
-            learning_rate_per_episode.append(self.alpha)
-            explore_rate_per_episode.append(self.bandit.epsilon)
-
             # Conseguimos el estado inicial
             start_state_value = self.discretize_state(self.model.get_initial_state())
             state = start_state_value
@@ -206,48 +206,43 @@ class ModelFreeCartPole:
 
                 total_reward += reward
 
-                if self.INFO:
+                if verbose and self.INFO:
                     print(f"Episodio número: {episode+1}")
                     print(f"Acción seleccionada: {str(action)}")
                     print(f"Estado actual: {str(state)}")
                     print(f"Recompensa ganada: {str(reward)}")
                     print("===========================================")
 
-                # time.sleep(0.03)
                 state = next_state
                 action = next_action
 
                 time_step += 1
 
+            # Almacenamos los datos del episodio
+            results.record(total_reward, time_step, self.bandit.epsilon, self.alpha)
+
             if time_step >= solved_time:
                 no_streaks += 1
             else:
                 no_streaks = 0
 
             if no_streaks > streak_to_end:
-                print(f"El problema del cartpole ha sido resuelto en {episode} episodes.")
+                results.solved_episode = episode
+                if verbose:
+                    print(f"El problema del cartpole ha sido resuelto en {episode} episodes.")
                 break
 
-            # Almacenamos los datos del episodio
-            time_per_episode.append(time_step)
-            totaltime += time_step
-            avgtime_per_episode.append(totaltime/(episode+1))
-
             # Imprimimos los resultados del episodio
-            if episode % 100 == 0:
+            if verbose and episode % 100 == 0:
                 print(f"Episodio {episode}, Recompensa total: {total_reward}, Epsilon: {self.bandit.epsilon}")
 
+        results.finish(time.perf_counter() - start)
+        return results
+
+    def execute(self, episodes=100) -> None:
+        results = self.train(episodes, verbose=True)
         # Graficamos los datos
-        fig, axs = plt.subplots(3, figsize=(10, 10))
-        fig.suptitle("Resultados del entrenamiento")
-        axs[0].plot(time_per_episode)
-        axs[0].plot(avgtime_per_episode)
-        axs[0].set_ylabel('Tiempo por episodio')
-        axs[1].plot(learning_rate_per_episode)
-        axs[1].set(xlabel='Episodios', ylabel='Tasa de aprendizaje')
-        axs[2].plot(explore_rate_per_episode)
-        axs[2].set(xlabel='Episodios', ylabel='Tasa de exploración')
-        plt.show()
+        results.plot(series="steps")
 
     """ Calcular el delta para la actualización """
 
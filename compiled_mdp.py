@@ -0,0 +1,293 @@
+import numpy as np
+
+"""
+Clase CompiledMDP: Representación indexada de un MDP mediante arrays de NumPy.
+
+Los algoritmos basados en modelos consultan get_transitions, get_reward y
+get_discount_factor por cada terna (estado, acción, siguiente estado) en cada
+iteración. Al compilar el modelo se recorren get_states() y get_actions() una
+única vez, se asigna un índice entero contiguo a cada estado y a cada acción y
+se guardan las transiciones en tensores que pueden operarse por lotes.
+
+Las transiciones se guardan como tensores de sucesores de tamaño (S, A, K),
+donde K es el número máximo de sucesores de un par (estado, acción). Esto evita
+el tensor denso S×A×S, que no cabe en memoria para mallas grandes.
+"""
+
+class IndexedModel:
+
+    """
+    Base común de los modelos compilados: guarda los estados y acciones originales
+    con sus índices y permite pasar valores y políticas entre arrays y las clases tabulares.
+    """
+
+    def __init__(self, states, actions, discount_factor) -> None:
+        self.states = states
+        self.actions = actions
+        self.state_index = {state: i for (i, state) in enumerate(states)}
+        self.action_index = {action: i for (i, action) in enumerate(actions)}
+        self.discount_factor = discount_factor
+
+    @property
+    def num_states(self) -> int:
+        return len(self.states)
+
+    @property
+    def num_actions(self) -> int:
+        return len(self.actions)
+
+    def has_actions(self) -> np.ndarray:
+        """Vector booleano de tamaño S, True si el estado tiene alguna acción válida"""
+        ...
+
+    """Devuelve los nuevos valores V(s) = max_a Q(s,a) y el índice de la mejor acción de cada estado"""
+    def bellman_backup(self, values: np.ndarray):
+        ...
+
+    def values_to_array(self, values, dtype=np.float64) -> np.ndarray:
+        """Lee una función de valor (ValueFunction) en un vector indexado por estado"""
+        return np.array([values.get_value(state) for state in self.states], dtype=dtype)
+
+    def array_to_values(self, array: np.ndarray, values) -> None:
+        """Escribe un vector indexado por estado en una función de valor (ValueFunction)"""
+        for (state, value) in zip(self.states, array.tolist()):
+            values.update(state, value)
+
+    def array_to_policy(self, best_actions: np.ndarray, policy) -> None:
+        """Escribe en una política determinista la acción de índice best_actions[s] de cada estado con acciones"""
+        has_actions = self.has_actions()
+        for (i, state) in enumerate(self.states):
+            if has_actions[i]:
+                policy.update(state, self.actions[best_actions[i]])
+
+
+class CompiledMDP(IndexedModel):
+
+    def __init__(self,
+                 states,
+                 actions,
+                 action_mask,
+                 next_states,
+                 probabilities,
+                 rewards,
+                 discount_factor) -> None:
+        """
+        Crea el modelo compilado a partir de los arrays ya construidos.
+        Normalmente se obtiene mediante CompiledMDP.from_mdp(mdp) o mdp.compile().
+
+        Args:
+            states (List): estados originales, en el orden de su índice.
+            actions (List): acciones originales, en el orden de su índice.
+            action_mask (np.ndarray): (S, A) booleano, True si la acción es válida en el estado.
+            next_states (np.ndarray): (S, A, K) índices de los sucesores.
+            probabilities (np.ndarray): (S, A, K) probabilidad de cada sucesor (0 en el relleno).
+            rewards (np.ndarray): (S, A, K) recompensa de cada transición.
+            discount_factor (float): factor de descuento del modelo.
+        """
+        super().__init__(states, actions, discount_factor)
+        self.action_mask = action_mask
+        self.next_states = next_states
+        self.probabilities = probabilities
+        self.rewards = rewards
+
+        # Recompensa esperada R(s,a) = sum_s' P(s'|s,a) * r(s,a,s')
+        self.expected_rewards = (probabilities * rewards).sum(axis=2)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por los arrays del modelo, en bytes"""
+        return sum(a.nbytes for a in (self.action_mask, self.next_states, self.probabilities,
+                                      self.rewards, self.expected_rewards))
+
+    @classmethod
+    def from_mdp(cls, mdp, dtype=np.float64):
+        """
+        Compila un MDP recorriendo su interfaz una única vez.
+
+        Los sucesores que no aparecen en get_states() se añaden al final de la
+        lista de estados (sin acciones válidas), de forma que todo índice de
+        next_states sea válido.
+
+        Args:
+            mdp (MDP): el modelo a compilar.
+            dtype: tipo de los arrays de probabilidades y recompensas. Por defecto float64.
+
+        Returns:
+            CompiledMDP: el modelo compilado.
+        """
+        (states, actions, rows) = enumerate_transitions(mdp)
+        rows = list(rows)
+        num_states = len(states)
+        num_actions = len(actions)
+
+        action_mask = np.zeros((num_states, num_actions), dtype=bool)
+        max_successors = 1
+        for (s, a, successors) in rows:
+            action_mask[s, a] = True
+            max_successors = max(max_successors, len(successors))
+
+        # El relleno apunta al propio estado con probabilidad 0
+        next_states = np.empty((num_states, num_actions, max_successors), dtype=np.int64)
+        next_states[:] = np.arange(num_states)[:, None, None]
+        probabilities = np.zeros((num_states, num_actions, max_successors), dtype=dtype)
+        rewards = np.zeros((num_states, num_actions, max_successors), dtype=dtype)
+
+        for (s, a, successors) in rows:
+            for (k, (next_state, probability, reward)) in enumerate(successors):
+                next_states[s, a, k] = next_state
+                probabilities[s, a, k] = probability
+                rewards[s, a, k] = reward
+
+        return cls(states, actions, action_mask, next_states, probabilities,
+                   rewards, mdp.get_discount_factor())
+
+    def transition_tensor(self) -> np.ndarray:
+        """
+        Construye el tensor denso P[s, a, s'] de tamaño (S, A, S).
+        Solo es viable para modelos pequeños.
+        """
+        num_states = self.num_states
+        tensor = np.zeros((num_states, self.num_actions, num_states), dtype=self.probabilities.dtype)
+        s = np.arange(num_states)[:, None, None]
+        a = np.arange(self.num_actions)[None, :, None]
+        np.add.at(tensor, (s, a, self.next_states), self.probabilities)
+        return tensor
+
+    def q_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Calcula Q(s,a) = R(s,a) + γ sum_s' P(s'|s,a) V(s') para todos los pares a la vez.
+        Las acciones no válidas reciben -inf.
+
+        Args:
+            values (np.ndarray): vector de valores V de tamaño S.
+
+        Returns:
+            np.ndarray: matriz Q de tamaño (S, A).
+        """
+        q = self.expected_rewards + self.discount_factor * (
+            self.probabilities * values[self.next_states]
+        ).sum(axis=2)
+        return np.where(self.action_mask, q, -np.inf)
+
+    def bellman_backup(self, values: np.ndarray):
+        """
+        Aplica el operador de Bellman V(s) = max_a Q(s,a) a todos los estados.
+
+        Los estados sin acciones válidas toman el valor 0. Es distinto de ValueIteration,
+        donde QTable.get_max_q da -inf a los estados de get_states() sin acciones y los
+        sucesores que no están en get_states() conservan su valor inicial: con -inf el
+        residuo de los barridos vectorizados sería nan y nunca convergerían. Todos los
+        solvers sobre modelos compilados (vectorizado, CSR, paralelo, multimalla...)
+        siguen este criterio; en los MDP del repositorio no hay estados sin acciones
+        (TERMINAL tiene su acción 'end'), así que los resultados coinciden.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: los nuevos valores y el índice de la mejor acción
+            (-1 en los estados sin acciones, como en SparseMDP).
+        """
+        q = self.q_values(values)
+        best_actions = q.argmax(axis=1)
+        new_values = q[np.arange(self.num_states), best_actions]
+        has_actions = self.has_actions()
+        return (np.where(has_actions, new_values, 0.0), np.where(has_actions, best_actions, -1))
+
+    def has_actions(self) -> np.ndarray:
+        return self.action_mask.any(axis=1)
+
+    def backup_state(self, values: np.ndarray, state: int) -> float:
+        """Calcula max_a Q(s,a) de un único estado (0 si no tiene acciones válidas)"""
+        mask = self.action_mask[state]
+        if not mask.any():
+            return 0.0
+        q = self.expected_rewards[state] + self.discount_factor * (
+            self.probabilities[state] * values[self.next_states[state]]
+        ).sum(axis=1)
+        return float(q[mask].max())
+
+    def predecessors(self):
+        """
+        Construye el índice de predecesores: para cada estado s', los estados s desde los
+        que se puede llegar a s' con alguna acción válida y probabilidad no nula.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: en formato CSR, los inicios (S+1) de
+            cada estado, los predecesores y max_a P(s'|s,a) de cada predecesor.
+        """
+        valid = (self.probabilities > 0) & self.action_mask[:, :, None]
+        (sources, _, _) = np.nonzero(valid)
+        targets = self.next_states[valid]
+        probabilities = self.probabilities[valid]
+
+        # Una entrada por pareja (s', s), quedándonos con la mayor probabilidad
+        order = np.lexsort((-probabilities, sources, targets))
+        (targets, sources, probabilities) = (targets[order], sources[order], probabilities[order])
+        first = np.ones(len(targets), dtype=bool)
+        first[1:] = (targets[1:] != targets[:-1]) | (sources[1:] != sources[:-1])
+        (targets, sources, probabilities) = (targets[first], sources[first], probabilities[first])
+
+        offsets = np.zeros(self.num_states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=self.num_states), out=offsets[1:])
+        return (offsets, sources, probabilities)
+
+
+def enumerate_transitions(mdp):
+    """
+    Recorre la interfaz del MDP una única vez y asigna índices enteros a estados
+    y acciones. Es el punto de partida común de las representaciones compiladas.
+
+    Las filas se generan de forma perezosa para no tener todo el modelo en
+    estructuras de Python a la vez; las listas de estados y acciones se
+    completan a medida que se consumen las filas.
+
+    Args:
+        mdp (MDP): el modelo a recorrer.
+
+    Returns:
+        Tuple[List, List, Iterator]: estados, acciones y un generador de filas
+        (s, a, [(s', probabilidad, recompensa), ...]) con índices enteros.
+        Los sucesores repetidos de un mismo par (s, a) se acumulan en una sola entrada
+        y los de probabilidad 0 se descartan.
+
+        Una acción sin transiciones (o solo con transiciones de probabilidad 0) no genera
+        fila: los modelos compilados la tratan como no válida en ese estado, igual que los
+        get_actions() de los modelos del proyecto, que solo devuelven las acciones con alguna
+        transición de probabilidad positiva. Si el estado se queda sin acciones vale 0.
+    """
+    states = list(mdp.get_states())
+    state_index = {state: i for (i, state) in enumerate(states)}
+    num_declared = len(states)
+    actions = []
+    action_index = {}
+
+    def rows():
+        # Los estados nuevos que se descubren como sucesores se añaden al final
+        # de la lista, sin acciones (igual que ValueIteration, que nunca los actualiza)
+        for i in range(num_declared):
+            state = states[i]
+            for action in mdp.get_actions(state):
+                if action not in action_index:
+                    action_index[action] = len(actions)
+                    actions.append(action)
+
+                successors = {}
+                for (next_state, probability) in mdp.get_transitions(state, action):
+                    if probability == 0:
+                        continue
+                    if next_state not in state_index:
+                        state_index[next_state] = len(states)
+                        states.append(next_state)
+                    reward = mdp.get_reward(state, action, next_state)
+                    j = state_index[next_state]
+                    if j in successors:
+                        (p, r) = successors[j]
+                        # Misma recompensa esperada al acumular sucesores repetidos
+                        successors[j] = (p + probability, (p * r + probability * reward) / (p + probability))
+                    else:
+                        successors[j] = (probability, reward)
+
+                if not successors:
+                    continue
+                yield (i, action_index[action],
+                       [(j, p, r) for (j, (p, r)) in successors.items()])
+
+    return (states, actions, rows())
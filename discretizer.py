@@ -0,0 +1,136 @@
+from bisect import bisect_right
+import numpy as np
+
+"""
+Clases para discretizar estados continuos en casillas (buckets).
+
+Los límites, escalas y bordes de las casillas se calculan una sola vez al crear el
+discretizador. Un estado individual se discretiza con aritmética de Python sobre
+esos valores precalculados (más rápido que NumPy para vectores de 2 a 4 componentes)
+y un lote de estados con operaciones de arrays. La tupla de casillas se puede
+codificar en un único entero para guardar las tablas de forma compacta.
+
+    - UniformDiscretizer: casillas uniformes entre dos límites (las de ModelFreeCartPole).
+    - BinDiscretizer: casillas definidas por sus bordes, como np.digitize (las de ModelFreeMountainCar).
+"""
+
+class Discretizer:
+
+    def __init__(self, buckets) -> None:
+        """
+        Args:
+            buckets (Tuple[int]): número de casillas de cada dimensión.
+        """
+        self.buckets = tuple(int(b) for b in buckets)
+        # Pesos de cada dimensión para codificar la tupla (la última dimensión varía más rápido)
+        strides = [1] * len(self.buckets)
+        for i in range(len(self.buckets) - 2, -1, -1):
+            strides[i] = strides[i + 1] * self.buckets[i + 1]
+        self.strides = tuple(strides)
+        self._stride_array = np.array(strides, dtype=np.int64)
+
+    @property
+    def num_states(self) -> int:
+        """Número total de tuplas de casillas distintas"""
+        return int(np.prod(self.buckets))
+
+    def discretize(self, state) -> tuple:
+        """Devuelve la tupla de casillas de un estado"""
+        ...
+
+    def discretize_batch(self, states) -> np.ndarray:
+        """Devuelve un array (N, d) con las casillas de un lote de N estados"""
+        ...
+
+    def encode(self, buckets) -> int:
+        """Codifica una tupla de casillas en un único entero en [0, num_states)"""
+        return sum(b * s for (b, s) in zip(buckets, self.strides))
+
+    def encode_batch(self, buckets) -> np.ndarray:
+        """Codifica un array (N, d) de casillas en N enteros"""
+        return np.asarray(buckets, dtype=np.int64) @ self._stride_array
+
+    def decode(self, index:int) -> tuple:
+        """Devuelve la tupla de casillas de un entero codificado"""
+        return tuple(int(i) for i in np.unravel_index(index, self.buckets))
+
+    def discretize_encoded(self, state) -> int:
+        return self.encode(self.discretize(state))
+
+    def discretize_encoded_batch(self, states) -> np.ndarray:
+        return self.encode_batch(self.discretize_batch(states))
+
+
+class UniformDiscretizer(Discretizer):
+
+    """
+    Casillas uniformes: cada dimensión se escala a [0, buckets - 1] y se redondea al
+    entero más cercano (redondeo al par, como round). Los valores fuera de los límites
+    caen en la primera o la última casilla.
+    """
+
+    def __init__(self, lower_bounds, upper_bounds, buckets) -> None:
+        """
+        Args:
+            lower_bounds (List[float]): límite inferior de cada dimensión.
+            upper_bounds (List[float]): límite superior de cada dimensión.
+            buckets (Tuple[int]): número de casillas de cada dimensión.
+        """
+        super().__init__(buckets)
+        self.lower_bounds = np.array(lower_bounds, dtype=float)
+        self.upper_bounds = np.array(upper_bounds, dtype=float)
+        widths = self.upper_bounds - self.lower_bounds
+        last = np.array(self.buckets, dtype=float) - 1
+        self.scaling = last / widths
+        self.offset = last * self.lower_bounds / widths
+        self.last = last.astype(np.int64)
+
+        # Copias en listas de Python para discretizar estados individuales
+        self._dimensions = list(zip(self.lower_bounds.tolist(), self.upper_bounds.tolist(),
+                                    self.scaling.tolist(), self.offset.tolist(), self.last.tolist()))
+
+    def discretize(self, state) -> tuple:
+        bucket_indices = []
+        for (value, (lower, upper, scaling, offset, last)) in zip(state, self._dimensions):
+            if value <= lower:
+                bucket_indices.append(0)
+            elif value >= upper:
+                bucket_indices.append(last)
+            else:
+                bucket_indices.append(int(round(scaling * value - offset)))
+        return tuple(bucket_indices)
+
+    def discretize_batch(self, states) -> np.ndarray:
+        states = np.asarray(states, dtype=float)
+        indices = np.rint(self.scaling * states - self.offset)
+        indices = np.where(states <= self.lower_bounds, 0, indices)
+        indices = np.where(states >= self.upper_bounds, self.last, indices)
+        return indices.astype(np.int64)
+
+
+class BinDiscretizer(Discretizer):
+
+    """
+    Casillas definidas por sus bordes crecientes: la casilla de un valor es el número
+    de bordes menores o iguales que él, igual que np.digitize. Cada dimensión tiene
+    len(bordes) + 1 casillas.
+    """
+
+    def __init__(self, edges) -> None:
+        """
+        Args:
+            edges (List[np.ndarray]): bordes de las casillas de cada dimensión.
+        """
+        self.edges = [np.asarray(e, dtype=float) for e in edges]
+        super().__init__([len(e) + 1 for e in self.edges])
+        self._edge_lists = [e.tolist() for e in self.edges]
+
+    def discretize(self, state) -> tuple:
+        return tuple(bisect_right(edges, value) for (value, edges) in zip(state, self._edge_lists))
+
+    def discretize_batch(self, states) -> np.ndarray:
+        states = np.asarray(states, dtype=float)
+        indices = np.empty(states.shape, dtype=np.int64)
+        for (i, edges) in enumerate(self.edges):
+            indices[:, i] = np.searchsorted(edges, states[:, i], side="right")
+        return indices
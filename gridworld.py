@@ -22,7 +22,6 @@
 
 import sys
 import numpy as np
-import pygame
 from mdp import *   
 from typing import List, Union, Tuple
 
@@ -49,6 +48,14 @@ class GridWorld(MDP):
     LEFT = "LEFT"
     RIGHT = "RIGHT"
 
+    # Desplazamientos de cada movimiento: dirección deseada y las dos laterales
+    MOVES = {
+        "UP": [(0, 1), (-1, 0), (1, 0)],
+        "DOWN": [(0, -1), (-1, 0), (1, 0)],
+        "LEFT": [(-1, 0), (0, -1), (0, 1)],
+        "RIGHT": [(1, 0), (0, -1), (0, 1)],
+    }
+
     def __init__(
         self,
         noise=0.3,
@@ -90,13 +97,77 @@ class GridWorld(MDP):
         else:
             self.goal_states = dict(goals)
         
+        # La celda (x, y) tiene el índice x * height + y en state_set y en las tablas
         self.state_set = [(x, y) for x in range(self.width) for y in range(self.height)]
-        outside_coords = [(x, y) for x in range(-1, self.width+1) for y in range(-1, self.height+1) if (x,y) not in self.state_set]
-        self.blocked_states = sorted(list(set(outside_coords)))
+
+        # Máscara de celdas bloqueadas sobre la malla con un borde de una celda alrededor:
+        # la celda (x, y) está en blocked_mask[x + 1, y + 1]. Las bloqueadas son el borde exterior
+        self.blocked_mask = np.zeros((self.width + 2, self.height + 2), dtype=bool)
+        self.blocked_mask[[0, -1], :] = True
+        self.blocked_mask[:, [0, -1]] = True
+        self.blocked_states = sorted((x - 1, y - 1) for (x, y) in zip(*np.nonzero(self.blocked_mask)))
 
         # Coste de accion
         self.action_cost = action_cost
 
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        """
+        Calcula una sola vez, con operaciones de arrays, el índice de la celda de destino
+        de cada movimiento desde cada celda (la propia celda si el destino está bloqueado).
+        """
+        straight = 1 - (2 * self.noise)
+        self.move_actions = [self.UP, self.DOWN, self.LEFT, self.RIGHT]
+        self.move_index = {action: i for (i, action) in enumerate(self.move_actions)}
+        # Probabilidad de la dirección deseada y de las dos laterales (como valid_add, sin las nulas)
+        probabilities = [straight, self.noise, self.noise]
+        self.move_outcomes = [i for (i, p) in enumerate(probabilities) if p != 0.0]
+        self.move_probabilities = [probabilities[i] for i in self.move_outcomes]
+
+        (x, y) = np.meshgrid(np.arange(self.width), np.arange(self.height), indexing="ij")
+        (x, y) = (x.ravel(), y.ravel())
+        cells = x * self.height + y
+        dtype = np.int32 if len(cells) < 2**31 else np.int64
+        self.successor_table = np.empty((len(cells), 4, 3), dtype=dtype)
+        for (a, action) in enumerate(self.move_actions):
+            for (k, (dx, dy)) in enumerate(self.MOVES[action]):
+                blocked = self.blocked_mask[x + dx + 1, y + dy + 1]
+                self.successor_table[:, a, k] = np.where(blocked, cells, (x + dx) * self.height + (y + dy))
+
+    def coordinates(self, state, margin:int=0):
+        """
+        Valida un estado como coordenadas de la malla. Lo comparten cell_index e is_blocked,
+        así que ambos aceptan los mismos tipos (int de Python o entero de NumPy).
+
+        Args:
+            state: el estado a validar.
+            margin (int): celdas de más que se admiten alrededor de la malla (1 para el borde de muros).
+
+        Returns:
+            Tuple[int, int]: las coordenadas (x, y), o None si el estado no es una celda del rango.
+        """
+        if type(state) is tuple and len(state) == 2:
+            (x, y) = state
+            if (type(x) is int or isinstance(x, np.integer)) and (type(y) is int or isinstance(y, np.integer)) \
+                    and -margin <= x < self.width + margin and -margin <= y < self.height + margin:
+                return (int(x), int(y))
+        return None
+
+    def cell_index(self, state):
+        """Índice de una celda de la malla, o None si el estado no es una celda"""
+        coordinates = self.coordinates(state)
+        if coordinates is None:
+            return None
+        return coordinates[0] * self.height + coordinates[1]
+
+    def is_blocked(self, state) -> bool:
+        """Indica si un estado es una celda bloqueada (equivale a state in blocked_states)"""
+        coordinates = self.coordinates(state, margin=1)
+        if coordinates is None:
+            return False
+        return bool(self.blocked_mask[coordinates[0] + 1, coordinates[1] + 1])
+
 
     def get_states(self) -> List[Union[str, Tuple[int, int]]]:
         """
@@ -127,6 +198,11 @@ class GridWorld(MDP):
         actions = [self.UP, self.DOWN,self.LEFT, self.RIGHT, self.TERMINATE]
         if state is None:
             return actions
+        # Las metas y el estado terminal solo admiten TERMINATE; las demás celdas, los movimientos
+        if state == self.TERMINAL or state in self.goal_states:
+            return [self.TERMINATE]
+        if self.cell_index(state) is not None:
+            return list(self.move_actions)
         valid_actions = []
         for a in actions:
             for (_, prob) in self.get_transitions(state,a):
@@ -150,7 +226,7 @@ class GridWorld(MDP):
         if prob == 0.0:
             return ()
 
-        if new_state in self.blocked_states:
+        if self.is_blocked(new_state):
             return (state, prob)
 
         (x, y) = new_state
@@ -170,33 +246,26 @@ class GridWorld(MDP):
         Returns:
             List[Tuple[Union[Tuple[str, int], Tuple[int, int]], float]]: Lista de transiciones posibles.
         """
-        transitions = []
-
-        if state == self.TERMINAL:
+        if state == self.TERMINAL or state in self.goal_states:
             if action == self.TERMINATE:
                 return [(self.TERMINAL, 1.0)]
-            else:
-                return []
+            return []
 
-        straight = 1 - (2 * self.noise)
+        a = self.move_index.get(action)
+        if a is None:
+            return []
+        cell = self.cell_index(state)
+        if cell is None:
+            # Estados que no son celdas de la malla: se calculan como antes
+            (x, y) = state
+            (dx, dy) = self.MOVES[action][0]
+            transitions = [self.valid_add(state, (x + dx, y + dy), 1 - (2 * self.noise))]
+            for (dx, dy) in self.MOVES[action][1:]:
+                transitions.append(self.valid_add(state, (x + dx, y + dy), self.noise))
+            return [transition for transition in transitions if transition]
 
-        (x, y) = state
-        movements = {
-            "UP": [(x, y+1), (x-1, y), (x+1, y)],
-            "DOWN": [(x, y-1), (x-1,y), (x+1, y)],
-            "LEFT": [(x-1,y), (x, y-1), (x, y+1)],
-            "RIGHT": [(x+1, y), (x, y-1), (x, y+1)]
-            }
-        if state in self.get_goal_states().keys():
-            if action == self.TERMINATE:
-                transitions += [(self.TERMINAL, 1.0)]
-
-        elif action==self.UP or action == self.DOWN or action==self.LEFT or action==self.RIGHT:
-            mov =  movements[action]
-            transitions += [self.valid_add(state, mov[0], straight),
-                            self.valid_add(state, mov[1], self.noise),
-                            self.valid_add(state, mov[2], self.noise)]
-        return transitions
+        successors = self.successor_table[cell, a].tolist()
+        return [(self.state_set[successors[k]], p) for (k, p) in zip(self.move_outcomes, self.move_probabilities)]
 
 
     def get_reward(self, 
@@ -215,14 +284,11 @@ class GridWorld(MDP):
             reward (int): La recompensa obtenida por la transición de estado a estado
         """
 
-        reward = 0.
-        if state in self.get_goal_states().keys() and next_state == self.TERMINAL:
-            reward = self.get_goal_states().get(state)
-        elif next_state in self.blocked_states:
-            reward=-1.    
-        else:
-            reward = self.action_cost
-        return reward
+        if next_state == self.TERMINAL and state in self.goal_states:
+            return self.goal_states[state]
+        if self.is_blocked(next_state):
+            return -1.
+        return self.action_cost
 
     def is_terminal(self, state:Union[Tuple[int, int], Tuple[str, str]]) -> bool:
         """
@@ -253,6 +319,122 @@ class GridWorld(MDP):
         Define el estado terminal del entorno 
         """
         return self.goal_states
+
+    def get_max_reward(self) -> float:
+        """
+        Cota superior de la recompensa de cualquier transición (la mayor entre las de las
+        metas, el coste de acción y el -1 de las celdas bloqueadas), sin recorrer los estados
+        """
+        return max([self.action_cost, -1.0] + list(self.goal_states.values()))
+
+    def compile(self, dtype=None, sparse=False):
+        """
+        Compila el modelo como MDP.compile, pero construyendo los arrays directamente a
+        partir de successor_table en lugar de recorrer get_transitions() y get_reward()
+        estado a estado. El resultado es idéntico (mismos índices, mismo orden de los
+        sucesores, sucesores repetidos acumulados igual que en enumerate_transitions).
+
+        Args:
+            dtype: tipo de los arrays de probabilidades y recompensas. Por defecto float64.
+            sparse (bool): si es True se devuelve un SparseMDP y si no un CompiledMDP.
+
+        Returns:
+            CompiledMDP o SparseMDP: el modelo compilado.
+        """
+        from compiled_mdp import CompiledMDP
+        from sparse_mdp import SparseMDP
+
+        num_cells = self.width * self.height
+        goal_rewards = {}
+        for (state, reward) in self.goal_states.items():
+            cell = self.cell_index(state)
+            if cell is not None:
+                goal_rewards[cell] = reward
+        if self.TERMINAL in self.goal_states or len(goal_rewards) == num_cells:
+            return super().compile(dtype, sparse)
+        dtype = np.float64 if dtype is None else dtype
+
+        # Estado 0: TERMINAL; celda c: estado c + 1. Acción 0: TERMINATE; movimiento a: acción a + 1
+        states = self.get_states()
+        actions = [self.TERMINATE] + list(self.move_actions)
+        is_goal = np.zeros(num_cells, dtype=bool)
+        is_goal[list(goal_rewards)] = True
+        moving = np.flatnonzero(~is_goal)
+
+        # Filas de movimiento (celda, movimiento) con sus sucesores en el orden de move_outcomes
+        outcomes = len(self.move_outcomes)
+        successors = self.successor_table[moving][:, :, self.move_outcomes].reshape(-1, outcomes) + 1
+        successors = successors.astype(np.int64)
+        probabilities = np.tile(np.array(self.move_probabilities, dtype=np.float64), (len(successors), 1))
+        rewards = np.full(successors.shape, float(self.action_cost))
+        kept = np.ones(successors.shape, dtype=bool)
+        # Un sucesor repetido se acumula en su primera aparición (como enumerate_transitions)
+        for j in range(1, outcomes):
+            for i in range(j):
+                repeated = kept[:, i] & kept[:, j] & (successors[:, i] == successors[:, j])
+                (p, q) = (probabilities[repeated, i], probabilities[repeated, j])
+                rewards[repeated, i] = (p * rewards[repeated, i] + q * rewards[repeated, j]) / (p + q)
+                probabilities[repeated, i] = p + q
+                kept[repeated, j] = False
+
+        # Todas las filas: la de TERMINAL, la de TERMINATE de cada meta y las de movimiento
+        goals = np.flatnonzero(is_goal)
+        row_states = np.concatenate([[0], goals + 1, np.repeat(moving + 1, 4)])
+        row_actions = np.concatenate([[0], np.zeros(len(goals), dtype=np.int64), np.tile(np.arange(1, 5), len(moving))])
+        order = np.lexsort((row_actions, row_states))
+        (row_states, row_actions) = (row_states[order], row_actions[order])
+
+        def rows(values, first):
+            # Filas de TERMINATE (un único sucesor en la primera columna) seguidas de las de movimiento
+            head = np.zeros((1 + len(goals), outcomes), dtype=values.dtype)
+            head[:, 0] = first
+            return np.concatenate([head, values])[order]
+
+        terminal_rewards = np.concatenate([[self.action_cost], [goal_rewards[g] for g in goals]])
+        successors = rows(successors, 0)
+        probabilities = rows(probabilities, 1.0)
+        rewards = rows(rewards, terminal_rewards)
+        kept = rows(kept, True)
+        lengths = kept.sum(axis=1)
+        # Posición de cada sucesor conservado dentro de su fila
+        positions = np.cumsum(kept, axis=1) - 1
+        (entry_rows, entry_columns) = np.nonzero(kept)
+        num_states = len(states)
+
+        if not sparse:
+            max_successors = max(1, int(lengths.max()))
+            action_mask = np.zeros((num_states, len(actions)), dtype=bool)
+            action_mask[row_states, row_actions] = True
+            next_states = np.empty((num_states, len(actions), max_successors), dtype=np.int64)
+            next_states[:] = np.arange(num_states)[:, None, None]
+            dense_probabilities = np.zeros((num_states, len(actions), max_successors), dtype=dtype)
+            dense_rewards = np.zeros((num_states, len(actions), max_successors), dtype=dtype)
+            target = (row_states[entry_rows], row_actions[entry_rows], positions[entry_rows, entry_columns])
+            next_states[target] = successors[entry_rows, entry_columns]
+            dense_probabilities[target] = probabilities[entry_rows, entry_columns]
+            dense_rewards[target] = rewards[entry_rows, entry_columns]
+            return CompiledMDP(states, actions, action_mask, next_states, dense_probabilities,
+                               dense_rewards, self.get_discount_factor())
+
+        # R(s,a) sumando en el orden de los sucesores, como sum() en SparseMDP.from_mdp
+        row_rewards = np.zeros(len(row_states))
+        for k in range(outcomes):
+            row_rewards += np.where(kept[:, k], probabilities[:, k] * rewards[:, k], 0.0)
+        num_transitions = len(entry_rows)
+        index_dtype = np.int32 if num_states < 2**31 and num_transitions < 2**31 else np.int64
+        state_offsets = np.zeros(num_states + 1, dtype=index_dtype)
+        np.cumsum(np.bincount(row_states, minlength=num_states), out=state_offsets[1:])
+        row_offsets = np.zeros(len(row_states) + 1, dtype=index_dtype)
+        np.cumsum(lengths, out=row_offsets[1:])
+        return SparseMDP(states,
+                         actions,
+                         state_offsets,
+                         row_actions.astype(np.int16),
+                         row_offsets,
+                         successors[entry_rows, entry_columns].astype(index_dtype),
+                         probabilities[entry_rows, entry_columns].astype(dtype),
+                         row_rewards.astype(dtype),
+                         self.get_discount_factor())
     
     @staticmethod
     def pygame_installed():
@@ -269,6 +451,8 @@ class GridWorld(MDP):
         consola 
         """
         if self.pygame_installed:
+            # Importación local: pygame solo hace falta para visualizar
+            import pygame
             pygame.init()
             screen = pygame.display.set_mode((500, 500))
             pygame.display.set_caption(f"GridWorld {self.width}x{self.height} (estado inicial)")
@@ -298,6 +482,7 @@ class GridWorld(MDP):
 
 
     def draw_cell(self,screen, x, y, color, arrow) -> None:
+                import pygame
                 # Fondo
                 rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
                 pygame.draw.rect(screen, color, rect)
@@ -320,6 +505,8 @@ class GridWorld(MDP):
         mov = {self.UP: "↑", self.DOWN: "↓",
                     self.LEFT: "←", self.RIGHT: "→", self.TERMINATE: " "}
         if self.pygame_installed:
+            # Importación local: pygame solo hace falta para visualizar
+            import pygame
             pygame.init()
             screen = pygame.display.set_mode((500, 500))
             def draw_grid():
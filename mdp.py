@@ -52,24 +52,62 @@ class MDP:
         ...
 
 
+    def compile(self, dtype=None, sparse=False):
+        """
+        Compila el modelo en arrays de NumPy indexados (ver CompiledMDP y SparseMDP).
+        Recorre get_states(), get_actions(), get_transitions() y get_reward() una única vez.
+
+        Args:
+            dtype: tipo de los arrays de probabilidades y recompensas. Por defecto float64.
+            sparse (bool): si es True se usa el formato CSR, adecuado para espacios de estados grandes.
+
+        Returns:
+            CompiledMDP o SparseMDP: el modelo compilado, con los mapas de índices a los estados y acciones originales.
+        """
+        # Importación local: numpy solo hace falta al compilar
+        from compiled_mdp import CompiledMDP
+        from sparse_mdp import SparseMDP
+
+        model = SparseMDP if sparse else CompiledMDP
+        if dtype is None:
+            return model.from_mdp(self)
+        return model.from_mdp(self, dtype=dtype)
+
+
+    def get_sampler(self):
+        """
+        Devuelve el muestreador de transiciones del modelo (ver TransitionSampler), que
+        se crea la primera vez. Las tablas de cada par (estado, acción) se construyen
+        al usarlo por primera vez y se reutilizan, así que el modelo no debe cambiar
+        sus transiciones ni sus recompensas después.
+        """
+        sampler = self.__dict__.get("_sampler")
+        if sampler is None:
+            from transition_sampler import TransitionSampler
+            sampler = self._sampler = TransitionSampler(self)
+        return sampler
+
+
     def execute(self, state, action):
-        rand = random.random()
-        cumulative_probability = 0.0
-        for (new_state, probability) in self.get_transitions(state, action):
-            if cumulative_probability <= rand <= probability + cumulative_probability:
-                return (new_state, self.get_reward(state, action, new_state))
-            cumulative_probability += probability
-            if cumulative_probability >= 1.0:
-                raise (
-                    "Probabilidad acumulada >= 1,0 para la acción "
-                    + str(action)
-                    + " del estado "
-                    + str(state)
-                )
-
-        raise (
-            "No hay estado de resultado en la simulación para la acción"
-            + str(action)
-            + " del estado "
-            + str(state)
-        )
\ No newline at end of file
+        """
+        Simula la ejecución de una acción en un estado (para los algoritmos libres de modelo).
+
+        Returns:
+            Tuple: el siguiente estado, muestreado según get_transitions(), y la recompensa.
+        """
+        return self.get_sampler().execute(state, action)
+
+
+    def execute_batch(self, states, actions, uniforms=None):
+        """
+        Simula a la vez la ejecución de una acción en cada uno de varios estados.
+
+        Args:
+            states (List): estados.
+            actions (List): acción de cada estado.
+            uniforms (np.ndarray, optional): un número uniforme en [0, 1) por estado.
+
+        Returns:
+            Tuple[List, np.ndarray]: los siguientes estados y sus recompensas.
+        """
+        return self.get_sampler().execute_batch(states, actions, uniforms)
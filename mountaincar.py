@@ -2,7 +2,8 @@ import math
 import random
 import time
 from typing import List, Tuple
-from matplotlib import pyplot as plt
+from training_results import TrainingResults
+from discretizer import BinDiscretizer
 
 import numpy as np
 
@@ -12,15 +13,18 @@ class MountainCar:
     Clase que establece los parámetros necesarios para simular el problema del coche en la montaña.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, discount_factor=0.9) -> None:
         """
         Inicializa los parámetros del problema.
+
+        Args:
+            discount_factor (float): factor de descuento. Por defecto 0.9.
         """
 
         self.min_x = -1.2 # x ∈ [−1.2,0.6]
         self.max_x = 0.6
         self.max_v = 0.07 # v∈[−0.07,0.07]
-        self.discount_factor=0.9 # Factor de descuento
+        self.discount_factor=discount_factor # Factor de descuento
         self.state = None
 
     def get_initial_state(self) -> Tuple[float,float]:
@@ -86,7 +90,9 @@ class ModelFreeMountainCar:
                  bandit, 
                  qfunction, 
                  alpha=0.1,
-                 print_info=False) -> None :
+                 print_info=False,
+                 encode_states=False,
+                 discretize=True) -> None :
         """ 
         Parámetros iniciales
         """
@@ -100,40 +106,55 @@ class ModelFreeMountainCar:
         self.x_space = np.linspace(-1.2, 0.6, 28)
         self.v_space = np.linspace(-0.07, 0.07, 18)
 
+        # Discretizador con los bordes de las casillas. Si encode_states es True, los
+        # estados discretos son un único entero en lugar de una tupla de casillas
+        self.discretizer = BinDiscretizer([self.x_space, self.v_space])
+        self.encode_states = encode_states
+        # Con discretize=False los estados se pasan sin discretizar a la función Q
+        # (para funciones Q sobre estados continuos, como TileCodingQFunction)
+        self.discretize = discretize
+
         self.epsilon = 1.
 
     # https://link.springer.com/chapter/10.1007/978-3-031-21743-2_12
     def discretize_state(self,state:Tuple[float,float]) -> Tuple[int,int]:
-        pos, vel =  state
-        pos_bin = int(np.digitize(pos, self.x_space))
-        vel_bin = int(np.digitize(vel, self.v_space))
-        return (pos_bin, vel_bin)
+        if not self.discretize:
+            return tuple(state)
+        if self.encode_states:
+            return self.discretizer.discretize_encoded(state)
+        return self.discretizer.discretize(state)
 
 
 
-    def execute(self, episodes=100) -> None :
+    def train(self, episodes=100, verbose=False, delay=0.0, max_steps=None) -> TrainingResults:
         """
-        Función que ejecuta el algoritmo libre de modelo
+        Entrena sin gráficas. Solo imprime por pantalla si verbose es True y solo
+        espera entre pasos si delay (en segundos) es mayor que 0. Si se indica max_steps,
+        los episodios se cortan tras ese número de pasos (una política que no llega a la
+        meta no deja el entrenamiento atascado en un episodio sin fin).
+
+        Returns:
+            TrainingResults: recompensa, pasos, epsilon y alpha por episodio, tiempo total y pasos por segundo.
         """
         score = 0
-        total_score = np.zeros(episodes)
-        explore_rate_per_episode=[]
+        results = TrainingResults(episodes)
+        start = time.perf_counter()
         for episode in range(episodes):
 
             self.bandit.epsilon = self.epsilon
-            explore_rate_per_episode.append(self.epsilon)
 
             # Conseguimos el estado inicial
             state = self.discretize_state(self.model.get_initial_state())
             done = False
 
             # Para ir viendo como evolucionan los episodios
-            if episode % 100 == 0:
+            if verbose and episode % 100 == 0:
                 print(f'episode: {episode}, score: {score}, epsilon: {self.epsilon:0.3f}')
 
             score = 0
+            time_step = 0
 
-            while not done:
+            while not done and (max_steps is None or time_step < max_steps):
                 # Elegimos la acción
                 action = self.bandit.select(state, [-1,0,1], self.qfunction)
     
@@ -141,6 +162,7 @@ class ModelFreeMountainCar:
                 observation, reward, done = self.model.execute(action)
                 next_state = self.discretize_state(observation)
                 score += reward
+                time_step += 1
                 
                 # Calculamos el Q-Value
                 # Obtenemos nueva acción
@@ -153,32 +175,35 @@ class ModelFreeMountainCar:
                 self.qfunction.update(state, action, delta)
 
                 # # Parámetros importantes
-                if self.INFO:
+                if verbose and self.INFO:
                     print(f"Episodio número: {episode+1}")
                     print(f"Acción seleccionada: {str(action)}")
                     print(f"Estado actual: {str(state)}")
                     print(f"Recompensa ganada: {str(reward)}")            
                     print("===========================================")
 
-                time.sleep(0.03)
+                if delay > 0:
+                    time.sleep(delay)
 
                 # Nuevo estado
                 state = next_state
                 action = next_action
                 
             # Save score for this episode
-            total_score[episode] = score
+            results.record(score, time_step, self.epsilon, self.alpha)
             # Reduce epsilon 
             self.epsilon = self.epsilon - 2/episodes if self.epsilon > 0.01 else 0.01
 
+        results.finish(time.perf_counter() - start)
+        return results
+
+    def execute(self, episodes=100) -> None :
+        """
+        Función que ejecuta el algoritmo libre de modelo
+        """
+        results = self.train(episodes, verbose=True, delay=0.03)
         # Graficamos los datos
-        fig, axs = plt.subplots(2, figsize=(10, 10))
-        fig.suptitle("Resultados del entrenamiento")
-        axs[0].plot(total_score)
-        axs[0].set_ylabel('Recompensa por episodio')
-        axs[1].plot(explore_rate_per_episode)
-        axs[1].set(xlabel='Episodios', ylabel='Tasa de exploración (epsilon)')
-        plt.show()
+        results.plot()
             
     """ Calcular el delta para la actualización """
 
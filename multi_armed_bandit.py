@@ -64,23 +64,13 @@ class Softmax(MultiArmedBandit):
         pass
 
     def select(self, state, actions, qfunction):
+        q_values = [qfunction.get_q_value(state, action) for action in actions]
 
-        total = 0.0
-        for action in actions:
-            total += math.exp(qfunction.get_q_value(state, action) / self.tau)
-
-        rand = random.random()
-        cumulative_probability = 0.0
-        result = None
-        for action in actions:
-            probability = (
-                math.exp(qfunction.get_q_value(state, action) / self.tau) / total
-            )
-            if cumulative_probability <= rand <= cumulative_probability + probability:
-                result = action
-            cumulative_probability += probability
-
-        return result
+        # Se resta el valor máximo antes de la exponencial para que no desborde
+        # con valores Q grandes o tau pequeño (las probabilidades no cambian)
+        max_q = max(q_values)
+        weights = [math.exp((q_value - max_q) / self.tau) for q_value in q_values]
+        return random.choices(actions, weights=weights)[0]
     
 
 """
@@ -0,0 +1,155 @@
+import numpy as np
+from gridworld import GridWorld
+
+"""
+CLASE PARA EJECUTAR LA ITERACIÓN DE VALORES MULTIMALLA SOBRE UN GRIDWORLD
+
+En una malla grande la iteración de valores necesita muchos barridos solo para que los
+valores (las recompensas de las metas y el coste de las acciones) se propaguen por toda
+la malla. Aquí se construye una jerarquía de mallas cada vez más gruesas, en la que cada
+celda gruesa agrupa 2x2 celdas de la malla anterior: un paso grueso equivale a dos pasos
+finos, así que el factor de descuento es γ² y el coste de acción c (1 + γ). Cada meta
+pasa a la celda gruesa que la contiene (si caen varias en la misma se queda la de mayor
+recompensa en valor absoluto). Se resuelve la malla más gruesa desde 0 y los valores de
+cada nivel, copiados a las 2x2 celdas que agrupa cada celda, son el punto de partida del
+siguiente nivel, hasta llegar a la malla original.
+
+Cada nivel usa un operador de Bellman vectorizado construido con las tablas del
+GridWorld (successor_table y las probabilidades de cada movimiento), que da los mismos
+barridos que ValueIteration: las metas solo tienen la acción TERMINATE hacia TERMINAL, y
+TERMINAL tiene su bucle con el coste de acción. El último nivel termina con el mismo
+criterio que ValueIteration (cambio máximo menor que theta), de modo que el resultado
+tiene la misma precisión que un arranque en frío pero con menos barridos.
+"""
+
+class GridBellmanOperator:
+
+    """Ecuación de Bellman de un GridWorld sobre un vector de celdas (índice x * height + y) y TERMINAL"""
+
+    def __init__(self, gridworld:GridWorld) -> None:
+        self.gridworld = gridworld
+        self.discount_factor = gridworld.get_discount_factor()
+        self.action_cost = gridworld.action_cost
+        self.num_cells = gridworld.width * gridworld.height
+        # Copias contiguas de cada columna de successor_table (indexar con una vista con saltos es más lento)
+        self.successors = [[np.ascontiguousarray(gridworld.successor_table[:, a, k]) for k in gridworld.move_outcomes]
+                           for a in range(len(gridworld.move_actions))]
+        self.probabilities = gridworld.move_probabilities
+        goals = [(gridworld.cell_index(state), reward) for (state, reward) in gridworld.goal_states.items()
+                 if gridworld.cell_index(state) is not None]
+        self.goal_cells = np.array([cell for (cell, _) in goals], dtype=np.int64)
+        self.goal_rewards = np.array([reward for (_, reward) in goals], dtype=np.float64)
+
+    def backup(self, values:np.ndarray, terminal_value:float):
+        """
+        Un barrido síncrono.
+
+        Returns:
+            Tuple[np.ndarray, float]: los nuevos valores de las celdas y el de TERMINAL.
+        """
+        gamma = self.discount_factor
+        new_values = None
+        for successors in self.successors:
+            expected = self.probabilities[0] * values[successors[0]]
+            for (p, cells) in zip(self.probabilities[1:], successors[1:]):
+                expected += p * values[cells]
+            new_values = expected if new_values is None else np.maximum(new_values, expected, out=new_values)
+        new_values = self.action_cost + gamma * new_values
+        new_values[self.goal_cells] = self.goal_rewards + gamma * terminal_value
+        return (new_values, self.action_cost + gamma * terminal_value)
+
+
+class MultigridValueIteration:
+    def __init__(self, gridworld:GridWorld, values=None, coarsest:int=16) -> None:
+        """
+        Args:
+            gridworld (GridWorld): el modelo.
+            values (ValueFunction, optional): función de valor donde se escribe el resultado. Si no se
+                indica, los valores solo quedan en grid_values (más rápido en mallas muy grandes).
+            coarsest (int): se engrosa la malla mientras su lado menor sea mayor que este valor.
+        """
+        self.gridworld = gridworld
+        self.values = values
+        self.levels = [gridworld]
+        while min(self.levels[-1].width, self.levels[-1].height) > coarsest:
+            self.levels.append(self.coarsen(self.levels[-1]))
+        self.levels.reverse()
+        # Resultado: vector de celdas (x * height + y) y valor de TERMINAL
+        self.grid_values = None
+        self.terminal_value = None
+        # Barridos de cada nivel, de la malla más gruesa a la original
+        self.sweeps = []
+
+    @staticmethod
+    def coarsen(gridworld:GridWorld) -> GridWorld:
+        """Malla con la mitad de celdas en cada dimensión, para pasos de dos celdas"""
+        gamma = gridworld.get_discount_factor()
+        goals = {}
+        for ((x, y), reward) in gridworld.goal_states.items():
+            cell = (x // 2, y // 2)
+            if cell not in goals or (abs(reward), reward) > (abs(goals[cell]), goals[cell]):
+                goals[cell] = reward
+        (x, y) = gridworld.initial_state
+        return GridWorld(noise=gridworld.noise,
+                         width=(gridworld.width + 1) // 2,
+                         height=(gridworld.height + 1) // 2,
+                         discount_factor=gamma ** 2,
+                         action_cost=gridworld.action_cost * (1 + gamma),
+                         initial_state=(x // 2, y // 2),
+                         goals=list(goals.items()))
+
+    @staticmethod
+    def prolong(values:np.ndarray, coarse:GridWorld, fine:GridWorld) -> np.ndarray:
+        """Copia el valor de cada celda gruesa a las celdas finas que agrupa"""
+        grid = values.reshape(coarse.width, coarse.height)
+        grid = np.repeat(np.repeat(grid, 2, axis=0), 2, axis=1)
+        return np.ascontiguousarray(grid[:fine.width, :fine.height]).ravel()
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        """
+        Resuelve los niveles de la malla más gruesa a la original.
+
+        Args:
+            max_iterations (int): número máximo de barridos de cada nivel.
+            theta (float): umbral de convergencia de cada nivel.
+
+        Returns:
+            int: la iteración en la que converge el último nivel (como ValueIteration), o None.
+        """
+        self.sweeps = []
+        values = None
+        terminal_value = 0.0
+        result = None
+        for (level, gridworld) in enumerate(self.levels):
+            operator = GridBellmanOperator(gridworld)
+            if values is None:
+                values = np.zeros(operator.num_cells)
+            else:
+                values = self.prolong(values, self.levels[level - 1], gridworld)
+                # El valor de TERMINAL es conocido: c / (1 - γ) en todos los niveles
+                if operator.discount_factor < 1:
+                    terminal_value = operator.action_cost / (1 - operator.discount_factor)
+
+            result = None
+            sweeps = 0
+            for i in range(max_iterations):
+                (new_values, new_terminal_value) = operator.backup(values, terminal_value)
+                delta = max(np.abs(new_values - values).max(), abs(new_terminal_value - terminal_value))
+                (values, terminal_value) = (new_values, new_terminal_value)
+                sweeps += 1
+                if delta < theta:
+                    result = i
+                    break
+            self.sweeps.append(sweeps)
+
+        (self.grid_values, self.terminal_value) = (values, terminal_value)
+        if self.values is not None:
+            self.values.update(self.gridworld.TERMINAL, terminal_value)
+            for (state, value) in zip(self.gridworld.state_set, values.tolist()):
+                self.values.update(state, value)
+        return result
+
+    @property
+    def backups(self) -> int:
+        """Actualizaciones de estados de todos los niveles (celdas y TERMINAL)"""
+        return sum(sweeps * (level.width * level.height + 1) for (sweeps, level) in zip(self.sweeps, self.levels))
@@ -0,0 +1,180 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import threading
+import numpy as np
+
+"""
+CLASE PARA EJECUTAR EL ALGORITMO DE ITERACIÓN DE VALORES EN VARIOS PROCESOS
+
+El espacio de estados se divide en bloques contiguos, uno por proceso. El modelo
+compilado y dos copias del vector de valores se guardan en memoria compartida
+(multiprocessing.shared_memory), así que los procesos no copian nada entre
+iteraciones. En cada iteración cada proceso actualiza su bloque leyendo de un
+buffer y escribiendo en el otro; tras una barrera, el proceso principal reduce los
+residuos de todos los bloques e intercambia los buffers. Como la actualización es
+síncrona, el resultado es idéntico al de VectorizedValueIteration.
+
+Las esperas en la barrera tienen un tiempo máximo (timeout): si un proceso falla,
+muere o se interrumpe la ejecución, la barrera se rompe (abort) y el error llega al
+proceso principal como RuntimeError en lugar de dejar a los demás esperando.
+"""
+
+# Posiciones del array de control compartido
+_BUFFER = 0
+_STOP = 1
+
+
+class ParallelValueIteration:
+    def __init__(self, mdp, values, workers=None, compiled=None, timeout=60.0):
+        self.mdp = mdp
+        self.values = values
+        self.workers = workers if workers is not None else mp.cpu_count()
+        self.compiled = compiled if compiled is not None else mdp.compile()
+        # Segundos máximos de cada espera en la barrera (un barrido de un bloque debe caber)
+        self.timeout = timeout
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        shared = _SharedArrays()
+        try:
+            return self._solve(shared, max_iterations, theta)
+        finally:
+            shared.release()
+
+    def _solve(self, shared, max_iterations, theta):
+        compiled = self.compiled
+        num_states = compiled.num_states
+        workers = max(1, min(self.workers, num_states))
+
+        shared.copy("expected_rewards", compiled.expected_rewards)
+        shared.copy("probabilities", compiled.probabilities)
+        shared.copy("next_states", compiled.next_states)
+        shared.copy("action_mask", compiled.action_mask)
+        buffers = shared.create("buffers", (2, num_states), np.float64)
+        buffers[0] = compiled.values_to_array(self.values)
+        residuals = shared.create("residuals", (workers,), np.float64)
+        control = shared.create("control", (2,), np.int64)
+        control[:] = 0
+
+        # La barrera incluye al proceso principal
+        barrier = mp.Barrier(workers + 1, timeout=self.timeout)
+        bounds = np.linspace(0, num_states, workers + 1).astype(int)
+        processes = [
+            mp.Process(target=_worker,
+                       args=(shared.specs(), compiled.discount_factor, w, bounds[w], bounds[w + 1], barrier),
+                       daemon=True)
+            for w in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        result = None
+        try:
+            for i in range(max_iterations):
+                barrier.wait()  # Inicio de la iteración
+                barrier.wait()  # Todos los bloques actualizados
+                delta = residuals.max()
+                control[_BUFFER] = 1 - control[_BUFFER]
+
+                # Termina si la función de valor converge
+                if delta < theta:
+                    result = i
+                    break
+            control[_STOP] = 1
+            barrier.wait()
+        except threading.BrokenBarrierError as error:
+            barrier.abort()
+            raise RuntimeError("Un proceso trabajador ha fallado o no ha respondido a tiempo") from error
+        except BaseException:
+            # Se rompe la barrera para que los trabajadores no se queden esperando
+            barrier.abort()
+            raise
+        finally:
+            for process in processes:
+                process.join(self.timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        compiled.array_to_values(buffers[control[_BUFFER]], self.values)
+        return result
+
+
+class _SharedArrays:
+
+    """Arrays de NumPy respaldados por bloques de memoria compartida"""
+
+    def __init__(self) -> None:
+        self.blocks = {}
+        self.arrays = {}
+
+    def create(self, name, shape, dtype) -> np.ndarray:
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks[name] = (block, shape, np.dtype(dtype).str)
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        return self.arrays[name]
+
+    def copy(self, name, array) -> np.ndarray:
+        shared = self.create(name, array.shape, array.dtype)
+        shared[...] = array
+        return shared
+
+    def specs(self):
+        """Nombre, forma y tipo de cada bloque, para abrirlos desde otro proceso"""
+        return {name: (block.name, shape, dtype) for (name, (block, shape, dtype)) in self.blocks.items()}
+
+    def release(self) -> None:
+        # Hay que soltar las vistas antes de cerrar los bloques
+        self.arrays.clear()
+        for (block, _, _) in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def _worker(specs, discount_factor, worker, start, stop, barrier) -> None:
+    """Proceso trabajador: abre los bloques compartidos y actualiza los estados [start, stop)"""
+    blocks = []
+    arrays = {}
+    for (name, (block_name, shape, dtype)) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    try:
+        _sweep_block(arrays, discount_factor, worker, start, stop, barrier)
+    except threading.BrokenBarrierError:
+        # El proceso principal (u otro trabajador) ha roto la barrera: se termina sin más
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        # Hay que soltar las vistas antes de cerrar los bloques
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+
+def _sweep_block(arrays, discount_factor, worker, start, stop, barrier) -> None:
+    """Bucle de iteraciones de un proceso, sincronizado con el principal mediante la barrera"""
+    rewards = arrays["expected_rewards"][start:stop]
+    probabilities = arrays["probabilities"][start:stop]
+    next_states = arrays["next_states"][start:stop]
+    mask = arrays["action_mask"][start:stop]
+    has_actions = mask.any(axis=1)
+    (buffers, residuals, control) = (arrays["buffers"], arrays["residuals"], arrays["control"])
+
+    while True:
+        barrier.wait()
+        if control[_STOP]:
+            break
+
+        source = buffers[control[_BUFFER]]
+        target = buffers[1 - control[_BUFFER]]
+        q = rewards + discount_factor * (probabilities * source[next_states]).sum(axis=2)
+        new_values = np.where(mask, q, -np.inf).max(axis=1, initial=-np.inf)
+        target[start:stop] = np.where(has_actions, new_values, 0.0)
+        residuals[worker] = np.abs(target[start:stop] - source[start:stop]).max(initial=0.0)
+
+        barrier.wait()
@@ -1,18 +1,139 @@
 from tqdm import tqdm
+import numpy as np
 from tabular_policy import TabularPolicy
 from tabular_value_function import TabularValueFunction
 from qtable import QTable
+from sparse_mdp import sparse_policy_evaluation, policy_transitions
+
+try:
+    from scipy.sparse import csr_matrix, identity
+    from scipy.sparse.linalg import bicgstab
+    SCIPY_INSTALLED = True
+except ModuleNotFoundError:
+    SCIPY_INSTALLED = False
 
 """
 CLASE PARA DESARROLLAR EL ALGORITMO DE ITERACIÓN DE POLÍTICAS
+
+Modos de evaluación de la política:
+    - "iterative": barridos Gauss-Seidel hasta que delta < theta (comportamiento original).
+    - "exact": resuelve directamente (I - γP_π)V = R_π sobre el modelo compilado. Es denso
+      para modelos pequeños y usa un método iterativo disperso (scipy) para los grandes.
+    - "modified": iteración de políticas modificada, con un número fijo de barridos
+      (evaluation_sweeps) por cada evaluación.
+
+Eliminación de acciones (opcional, action_elimination=True, solo con γ < 1): en cada mejora se
+calculan Q(s,a) de las acciones activas y d = TV - V. Para cualquier V se cumple
+V + min(d) / (1 - γ) <= V* <= V + max(d) / (1 - γ), de donde sale que Q*(s,a) queda por
+debajo de V*(s) si max_b Q(s,b) - Q(s,a) > γ (max(d) - min(d)) / (1 - γ). Esas acciones
+no pueden ser óptimas y se descartan en active_actions hasta el final de la ejecución de
+policy_iteration, así que las mejoras siguientes son cada vez más baratas. elimination_history guarda la fracción de
+acciones eliminadas tras cada iteración. Sin action_elimination, la mejora recorre get_actions() como
+siempre y active_actions y elimination_history quedan vacíos.
 """
 
 class PolicyIteration:
-    def __init__(self, model, policy) -> None:
+    def __init__(self,
+                 model,
+                 policy,
+                 evaluation:str="iterative",
+                 evaluation_sweeps:int=5,
+                 dense_limit:int=2000,
+                 action_elimination:bool=False) -> None:
+        if evaluation not in ("iterative", "exact", "modified"):
+            raise ValueError("El modo de evaluación debe ser 'iterative', 'exact' o 'modified'.")
         self.model = model
         self.policy = policy
+        self.evaluation = evaluation
+        self.evaluation_sweeps = evaluation_sweeps # Barridos por evaluación en el modo "modified"
+        self.dense_limit = dense_limit # Número máximo de estados para resolver con matrices densas
+        self.action_elimination = action_elimination
+        self.compiled = None
+        # Acciones que todavía pueden ser óptimas en cada estado
+        self.active_actions = {}
+        self.elimination_history = []
+        self.q_evaluations = 0
 
     def policy_evaluation(self, policy, values, theta:float=0.001):
+        if self.evaluation == "iterative":
+            return self.iterative_policy_evaluation(policy, values, theta)
+
+        if self.compiled is None:
+            self.compiled = self.model.compile(sparse=True)
+        compiled = self.compiled
+        rows = compiled.policy_rows(policy)
+        array = compiled.values_to_array(values)
+
+        if self.evaluation == "exact":
+            array = self.exact_policy_evaluation(rows, array, theta)
+        else:
+            (array, _) = sparse_policy_evaluation(compiled, rows, array,
+                                                  max_iterations=self.evaluation_sweeps, theta=0.0)
+
+        compiled.array_to_values(array, values)
+        return values
+
+    """ Evaluación exacta: resuelve el sistema lineal (I - γP_π)V = R_π """
+
+    def exact_policy_evaluation(self, rows, values, theta:float=0.001):
+        compiled = self.compiled
+        gamma = compiled.discount_factor
+        num_states = compiled.num_states
+        (rewards, successors, probabilities, offsets, evaluated) = policy_transitions(compiled, rows)
+
+        # R_π y P_π en formato COO (los estados sin transiciones tienen R = 0 y fila vacía)
+        reward_vector = np.zeros(num_states)
+        reward_vector[evaluated] = rewards
+        lengths = np.diff(np.append(offsets, len(successors)))
+        sources = np.repeat(evaluated, lengths)
+
+        # Con γ = 1 los estados absorbentes dejan el sistema singular: su valor no
+        # cambia en la evaluación iterativa, así que se mantienen fijos
+        self_loops = np.zeros(num_states)
+        np.add.at(self_loops, sources[successors == sources], probabilities[successors == sources])
+        fixed = np.isclose(gamma * self_loops, 1.0)
+        free = np.flatnonzero(~fixed)
+
+        try:
+            if len(free) <= self.dense_limit:
+                # Solo las filas y columnas de los estados libres: las transiciones hacia
+                # estados fijos pasan al término independiente con su valor conocido
+                position = np.full(num_states, -1)
+                position[free] = np.arange(len(free))
+                from_free = position[sources] >= 0
+                to_free = position[successors] >= 0
+                inner = from_free & to_free
+                outer = from_free & ~to_free
+                transitions = np.zeros((len(free), len(free)))
+                np.add.at(transitions, (position[sources[inner]], position[successors[inner]]), probabilities[inner])
+                system = np.eye(len(free)) - gamma * transitions
+                rhs = reward_vector[free].copy()
+                np.add.at(rhs, position[sources[outer]], gamma * probabilities[outer] * values[successors[outer]])
+                solution = np.linalg.solve(system, rhs)
+            elif SCIPY_INSTALLED:
+                transitions = csr_matrix((probabilities, (sources, successors)), shape=(num_states, num_states))
+                system = identity(len(free), format="csr") - gamma * transitions[free][:, free]
+                rhs = reward_vector[free] + gamma * (transitions[free][:, fixed] @ values[fixed])
+                # Con un residuo r, el error en norma infinito es como mucho r / (1 - γ).
+                # rtol=0 para que la parada dependa solo de atol (por defecto rtol=1e-5 relativo a ||b||)
+                tolerance = theta * (1 - gamma) if gamma < 1 else theta * 1e-3
+                (solution, info) = bicgstab(system, rhs, x0=values[free], rtol=0.0, atol=tolerance)
+                if info != 0:
+                    raise np.linalg.LinAlgError("bicgstab no ha convergido")
+            else:
+                raise np.linalg.LinAlgError("scipy no está instalado y el modelo es demasiado grande")
+        except np.linalg.LinAlgError:
+            # Política impropia con γ = 1 o sin resolutor disperso: barridos hasta converger
+            (values, _) = sparse_policy_evaluation(compiled, rows, values, max_iterations=100000, theta=theta)
+            return values
+
+        values = values.copy()
+        values[free] = solution
+        return values
+
+    """ Evaluación iterativa (Gauss-Seidel) """
+
+    def iterative_policy_evaluation(self, policy, values, theta:float=0.001):
 
         while True:
             delta = 0.0
@@ -36,28 +157,67 @@ class PolicyIteration:
         # Crea una función tabular para mantener los detalles
         values = TabularValueFunction()
 
+        gamma = self.model.get_discount_factor()
+        states = self.model.get_states()
+        # Las acciones descartadas en una ejecución anterior no valen para esta
+        self.active_actions = {}
+        self.elimination_history = []
+        self.q_evaluations = 0
+        if self.action_elimination:
+            self.active_actions = {state: list(self.model.get_actions(state)) for state in states}
+            total_actions = sum(len(actions) for actions in self.active_actions.values())
+
         for i in range(1, max_iterations + 1):
         # for i in tqdm(range(1, max_iterations + 1), desc="Interaciones"):
             policy_changed = False
             values = self.policy_evaluation(self.policy, values, theta)
+            state_q_values = {}
+            (min_change, max_change) = (float("inf"), float("-inf"))
 
-            for state in self.model.get_states():
+            for state in states:
 
                 old_action = self.policy.select_action(state)
+                if self.action_elimination:
+                    actions = self.active_actions[state]
+                else:
+                    actions = self.model.get_actions(state)
                 q_values = QTable()
 
-                for action in self.model.get_actions(state):
+                for action in actions:
                     # Calcula el valor de Q(s,a)
                     new_value = values.get_q_value(self.model, state, action)
                     q_values.update(state, action, new_value)
+                self.q_evaluations += len(actions)
 
                 # V(s) = argmax_a Q(s,a)
-                (new_action, _) = q_values.get_max_q(state, self.model.get_actions(state))
+                (new_action, max_q) = q_values.get_max_q(state, actions)
                 self.policy.update(state, new_action)
 
-                policy_changed = True if new_action is not old_action else policy_changed
-        
+                policy_changed = True if new_action != old_action else policy_changed
+
+                if self.action_elimination and actions:
+                    state_q_values[state] = (q_values, max_q)
+                    change = max_q - values.get_value(state)
+                    (min_change, max_change) = (min(min_change, change), max(max_change, change))
+
+            if self.action_elimination:
+                if gamma < 1 and state_q_values:
+                    self.eliminate_actions(state_q_values, gamma * (max_change - min_change) / (1 - gamma))
+                active = sum(len(actions) for actions in self.active_actions.values())
+                self.elimination_history.append(1 - active / total_actions if total_actions else 0.0)
+
             if not policy_changed:
                 return i
 
         return max_iterations
+
+    """ Descarta las acciones cuyo Q está más de margin por debajo del mejor del estado """
+
+    def eliminate_actions(self, state_q_values, margin:float) -> None:
+        # Pequeña tolerancia para no descartar acciones empatadas por errores de redondeo
+        margin += 1e-12
+        for (state, (q_values, max_q)) in state_q_values.items():
+            actions = self.active_actions[state]
+            kept = [action for action in actions if max_q - q_values.get_q_value(state, action) <= margin]
+            if len(kept) < len(actions):
+                self.active_actions[state] = kept
@@ -0,0 +1,60 @@
+import heapq
+import numpy as np
+
+"""
+CLASE PARA DESARROLLAR EL ALGORITMO DE ITERACIÓN DE VALORES ASÍNCRONA (PRIORITIZED SWEEPING)
+
+En lugar de actualizar todos los estados en cada iteración, los valores se
+actualizan en el sitio (Gauss-Seidel) y siempre se actualiza primero el estado con
+mayor residuo de Bellman, usando una cola de prioridad.
+
+Cuando el valor de un estado cambia en Δ, el residuo de cada predecesor p puede
+crecer como mucho γ·max_a P(s|p,a)·|Δ|. Esa cota se acumula en la prioridad de los
+predecesores, de forma que solo se vuelven a considerar los estados que pueden
+alcanzar un estado modificado. Al terminar, todas las cotas son menores que theta,
+que es el mismo criterio de parada que ValueIteration.
+"""
+
+class PrioritizedValueIteration:
+    def __init__(self, mdp, values, compiled=None):
+        self.mdp = mdp
+        self.values = values
+        self.compiled = compiled if compiled is not None else mdp.compile()
+        # Número de actualizaciones de Bellman realizadas en la última ejecución
+        self.backups = 0
+
+    def value_iteration(self, max_backups=None, theta=0.001):
+        compiled = self.compiled
+        gamma = compiled.discount_factor
+        (offsets, predecessors, probabilities) = compiled.predecessors()
+        values = compiled.values_to_array(self.values)
+
+        # Residuo inicial de todos los estados (una actualización por estado)
+        (new_values, _) = compiled.bellman_backup(values)
+        priorities = np.abs(new_values - values)
+        self.backups = compiled.num_states
+
+        queue = [(-priority, state) for (state, priority) in enumerate(priorities.tolist()) if priority >= theta]
+        heapq.heapify(queue)
+
+        while queue and (max_backups is None or self.backups < max_backups):
+            (priority, state) = heapq.heappop(queue)
+            # Entrada obsoleta: la prioridad del estado ha cambiado desde que se insertó
+            if -priority != priorities[state]:
+                continue
+
+            new_value = compiled.backup_state(values, state)
+            change = abs(new_value - values[state])
+            values[state] = new_value
+            priorities[state] = 0.0
+            self.backups += 1
+
+            # Solo los predecesores pueden ver modificado su residuo
+            for i in range(offsets[state], offsets[state + 1]):
+                predecessor = predecessors[i]
+                priorities[predecessor] += gamma * probabilities[i] * change
+                if priorities[predecessor] >= theta:
+                    heapq.heappush(queue, (-priorities[predecessor], predecessor))
+
+        compiled.array_to_values(values, self.values)
+        return self.backups
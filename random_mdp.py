@@ -0,0 +1,80 @@
+import numpy as np
+from mdp import MDP
+
+"""
+Generador de MDP aleatorios para probar y comparar los algoritmos basados en modelos.
+
+Cada par (estado, acción) lleva a `branching` sucesores distintos elegidos al azar,
+con probabilidades tomadas de una distribución de Dirichlet, y tiene una recompensa
+N(0, 1) que no depende del sucesor. Los estados son los enteros 0..num_states-1 y las
+acciones 0..num_actions-1; todas las acciones son válidas en todos los estados y no
+hay estados terminales. Con la misma semilla se genera siempre el mismo modelo.
+"""
+
+class RandomMDP(MDP):
+
+    def __init__(self, num_states=100, num_actions=4, branching=3, discount_factor=0.95,
+                 concentration=1.0, seed=None) -> None:
+        """
+        Args:
+            num_states (int): número de estados. Por defecto 100.
+            num_actions (int): número de acciones. Por defecto 4.
+            branching (int): sucesores de cada par (estado, acción). Por defecto 3.
+            discount_factor (float): factor de descuento. Por defecto 0.95.
+            concentration (float): parámetro de la distribución de Dirichlet de las
+                probabilidades (valores pequeños dan transiciones casi deterministas).
+            seed (int, optional): semilla del generador de números aleatorios.
+        """
+        if not 1 <= branching <= num_states:
+            raise ValueError(f"branching debe estar entre 1 y {num_states}")
+        rng = np.random.default_rng(seed)
+        self.num_states = num_states
+        self.num_actions = num_actions
+        self.discount_factor = discount_factor
+
+        # Sucesores distintos: los primeros `branching` de una permutación aleatoria de cada fila
+        shape = (num_states, num_actions)
+        self.next_states = np.argsort(rng.random(shape + (num_states,)), axis=2)[:, :, :branching] \
+            if num_states <= 1000 else _distinct_choices(rng, num_states, shape, branching)
+        self.probabilities = rng.dirichlet(np.full(branching, concentration), size=shape)
+        self.rewards = rng.normal(0.0, 1.0, size=shape)
+        self.states = list(range(num_states))
+        self.actions = list(range(num_actions))
+
+    def get_states(self):
+        return self.states
+
+    def is_terminal(self, state):
+        return False
+
+    def get_discount_factor(self):
+        return self.discount_factor
+
+    def get_initial_state(self):
+        return 0
+
+    def get_goal_states(self):
+        return None
+
+    def get_actions(self, state=None):
+        return self.actions
+
+    def get_transitions(self, state, action):
+        return list(zip(self.next_states[state, action].tolist(), self.probabilities[state, action].tolist()))
+
+    def get_reward(self, state, action, next_state):
+        return float(self.rewards[state, action])
+
+    def get_max_reward(self):
+        return float(self.rewards.max())
+
+
+def _distinct_choices(rng, num_states, shape, branching):
+    """Elige `branching` sucesores distintos por par repitiendo el sorteo de los que se repiten"""
+    choices = rng.integers(0, num_states, size=shape + (branching,))
+    while True:
+        ordered = np.sort(choices, axis=2)
+        repeated = (ordered[:, :, 1:] == ordered[:, :, :-1]).any(axis=2)
+        if not repeated.any():
+            return choices
+        choices[repeated] = rng.integers(0, num_states, size=(int(repeated.sum()), branching))
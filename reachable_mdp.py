@@ -0,0 +1,97 @@
+from collections import deque
+from mdp import MDP
+
+"""
+Poda de los estados inalcanzables antes de resolver un MDP.
+
+reachable_states hace una búsqueda en anchura desde el estado inicial (o desde los
+estados que se indiquen) siguiendo solo las transiciones con probabilidad mayor que 0.
+ReachableMDP es una vista del modelo original que solo declara esos estados en
+get_states() y delega todo lo demás, así que ValueIteration, PolicyIteration y
+compile() la aceptan como cualquier otro MDP.
+
+El conjunto alcanzable es cerrado (ninguna transición sale de él), de modo que el
+valor y la política de sus estados son los mismos que en el modelo completo.
+"""
+
+def reachable_states(mdp, start_states=None):
+    """
+    Estados alcanzables desde los estados de partida.
+
+    Args:
+        mdp (MDP): el modelo.
+        start_states (List, optional): estados de partida. Por defecto [mdp.get_initial_state()].
+
+    Returns:
+        List: los estados alcanzables, en el orden en que los encuentra la búsqueda.
+    """
+    if start_states is None:
+        initial_state = mdp.get_initial_state()
+        if initial_state is None:
+            raise ValueError("El modelo no tiene estado inicial: hay que indicar start_states")
+        start_states = [initial_state]
+    order = list(dict.fromkeys(start_states))
+    visited = set(order)
+    queue = deque(order)
+    while queue:
+        state = queue.popleft()
+        for action in mdp.get_actions(state):
+            for (next_state, probability) in mdp.get_transitions(state, action):
+                if probability > 0 and next_state not in visited:
+                    visited.add(next_state)
+                    order.append(next_state)
+                    queue.append(next_state)
+    return order
+
+
+class ReachableMDP(MDP):
+
+    def __init__(self, mdp, start_states=None) -> None:
+        """
+        Args:
+            mdp (MDP): el modelo original.
+            start_states (List, optional): estados de partida. Por defecto el estado inicial del modelo.
+        """
+        self.mdp = mdp
+        reachable = set(reachable_states(mdp, start_states))
+        all_states = mdp.get_states()
+        # Se mantiene el orden de get_states() del modelo original
+        self.states = [state for state in all_states if state in reachable]
+        self.num_states = len(all_states)
+        self.num_pruned = self.num_states - len(self.states)
+
+    def __getattr__(self, name):
+        # Atributos propios del modelo original (width, goal_states, visualise_policy...)
+        if name == "mdp":
+            raise AttributeError(name)
+        return getattr(self.mdp, name)
+
+    def get_states(self):
+        return self.states
+
+    def is_terminal(self, state):
+        return self.mdp.is_terminal(state)
+
+    def get_discount_factor(self):
+        return self.mdp.get_discount_factor()
+
+    def get_initial_state(self):
+        return self.mdp.get_initial_state()
+
+    def get_goal_states(self):
+        return self.mdp.get_goal_states()
+
+    def get_actions(self, state=None):
+        return self.mdp.get_actions(state)
+
+    def get_transitions(self, state, action):
+        return self.mdp.get_transitions(state, action)
+
+    def get_reward(self, state, action, next_state):
+        return self.mdp.get_reward(state, action, next_state)
+
+    def execute(self, state, action):
+        return self.mdp.execute(state, action)
+
+    def execute_batch(self, states, actions, uniforms=None):
+        return self.mdp.execute_batch(states, actions, uniforms)
@@ -0,0 +1,271 @@
+import random
+from tabular_policy import TabularPolicy
+from tabular_value_function import TabularValueFunction
+
+"""
+CLASE PARA DESARROLLAR EL ALGORITMO RTDP (REAL-TIME DYNAMIC PROGRAMMING)
+
+En lugar de barrer todos los estados, simula trayectorias (trials) desde el estado
+inicial eligiendo siempre la acción voraz y actualiza con la ecuación de Bellman
+solo los estados que visita. Los valores se inicializan de forma perezosa con una
+cota superior (optimista) del valor, así que la exploración se dirige a los estados
+que pueden mejorar la política y los que nunca se alcanzan no se llegan a tocar.
+
+Con labeled=True se usa Labeled RTDP (Bonet y Geffner, 2003): un estado se etiqueta
+como resuelto cuando su residuo y el de todos los estados alcanzables con la
+política voraz son menores que theta, y el algoritmo termina cuando el estado
+inicial está resuelto. Con labeled=False es el RTDP original, pero que un trial no
+cambie ningún valor más que theta no basta para parar (puede no haber pasado por los
+estados que faltan por converger): tras cada trial así se recorren los estados
+alcanzables desde el inicial con la política voraz, actualizando los de residuo mayor
+que theta, y solo se termina si ninguno lo superaba. Si se agota max_trials, converged
+queda en False y los valores no tienen por qué estar a theta de los óptimos.
+
+La cota por defecto R_max / (1 - γ) es muy holgada, y con ella LRTDP puede necesitar
+muchas más actualizaciones que barrer todos los estados con ValueIteration: en un
+GridWorld 15x15 con ruido 0.1 y la meta en (4, 4), LRTDP hace entre 104.000 y 133.000
+(según la semilla) frente a las 10.170 de ValueIteration, y RTDP unas 10.500 más unas
+6.000 comprobaciones de residuo. Compensan en modelos grandes de los que solo importa
+una parte, y sobre todo con una heurística ajustada.
+
+Los trials terminan al llegar a un estado para el que is_terminal() es True, pero ese
+estado se actualiza como cualquier otro (en GridWorld, TERMINAL tiene su propia acción
+y recompensa). Los estados sin acciones valen 0, como en CompiledMDP.
+"""
+
+class RTDP:
+    def __init__(self, mdp, heuristic=None, labeled=True) -> None:
+        """
+        Args:
+            mdp (MDP): el modelo, con get_initial_state().
+            heuristic (float o Callable, optional): valor inicial de cada estado, que debe ser
+                una cota superior del valor óptimo. Por defecto max(0, R_max) / (1 - γ), con
+                R_max = mdp.get_max_reward(); si el modelo no lo tiene hay que indicarla.
+            labeled (bool): si es True se usa Labeled RTDP. Por defecto True.
+        """
+        self.mdp = mdp
+        self.heuristic = heuristic
+        self.labeled = labeled
+        self.gamma = mdp.get_discount_factor()
+        self.values = TabularValueFunction()
+        self.solved = set()
+        # Transiciones con su recompensa de cada par (estado, acción), leídas una sola vez
+        self.transitions = {}
+        self.actions = {}
+        self.backups = 0
+        self.trials = 0
+        # Residuos calculados en las comprobaciones (check_solved y envelope_residual)
+        self.residual_checks = 0
+        self.converged = False
+
+    def upper_bound(self) -> float:
+        """
+        Cota superior del valor de cualquier estado a partir de la mayor recompensa del modelo.
+        Se pide al modelo (get_max_reward) en lugar de recorrer sus estados, que es justo lo
+        que RTDP quiere evitar.
+        """
+        if not hasattr(self.mdp, "get_max_reward"):
+            raise ValueError("El modelo no tiene get_max_reward(): hay que indicar heuristic")
+        max_reward = max(0.0, self.mdp.get_max_reward())
+        if self.gamma < 1:
+            return max_reward / (1 - self.gamma)
+        if max_reward > 0:
+            raise ValueError("Con factor de descuento 1 y recompensas positivas hay que indicar heuristic")
+        return 0.0
+
+    def solve(self, max_trials:int=100000, theta:float=0.001, max_depth:int=1000):
+        """
+        Ejecuta trials desde el estado inicial hasta que converge.
+
+        Args:
+            max_trials (int): número máximo de trials. Por defecto 100000.
+            theta (float): residuo máximo de Bellman para considerar un estado resuelto.
+            max_depth (int): longitud máxima de cada trial. Por defecto 1000.
+
+        Returns:
+            Tuple[TabularValueFunction, TabularPolicy]: los valores de los estados visitados y la
+            política voraz en los estados visitados que tienen acciones.
+        """
+        if self.heuristic is None:
+            self.heuristic = self.upper_bound()
+        start = self.mdp.get_initial_state()
+
+        self.converged = False
+        for _ in range(max_trials):
+            if self.labeled and start in self.solved:
+                self.converged = True
+                break
+            self.trials += 1
+            if self.labeled:
+                self.labeled_trial(start, theta, max_depth)
+            elif self.trial(start, max_depth) < theta and self.envelope_residual(start, theta) < theta:
+                self.converged = True
+                break
+        else:
+            self.converged = self.labeled and start in self.solved
+
+        return (self.values, self.extract_policy())
+
+    def trial(self, state, max_depth:int) -> float:
+        """Trial de RTDP: devuelve el mayor cambio de valor de los estados actualizados"""
+        change = 0.0
+        for _ in range(max_depth):
+            if self.is_dead_end(state):
+                break
+            (action, residual) = self.update(state)
+            change = max(change, residual)
+            if self.mdp.is_terminal(state):
+                break
+            state = self.sample(state, action)
+        return change
+
+    def envelope_residual(self, start, theta:float) -> float:
+        """
+        Mayor residuo de Bellman de los estados alcanzables desde start con la política voraz.
+        Los estados con residuo mayor que theta se actualizan por el camino, de modo que cada
+        comprobación fallida es también un barrido sobre esos estados.
+        """
+        residual = 0.0
+        open_states = [start]
+        seen = {start}
+        while open_states:
+            state = open_states.pop()
+            if self.is_dead_end(state):
+                continue
+            (action, state_residual) = self.greedy(state)
+            self.residual_checks += 1
+            if state_residual > theta:
+                (action, _) = self.update(state)
+            residual = max(residual, state_residual)
+            for (next_state, probability, _) in self.get_transitions(state, action):
+                if probability > 0 and next_state not in seen:
+                    seen.add(next_state)
+                    open_states.append(next_state)
+        return residual
+
+    def labeled_trial(self, state, theta:float, max_depth:int) -> None:
+        """Trial de LRTDP: avanza hasta un estado resuelto y etiqueta hacia atrás los que pueda"""
+        visited = []
+        while state not in self.solved and len(visited) < max_depth:
+            visited.append(state)
+            if self.is_dead_end(state):
+                self.solved.add(state)
+                break
+            (action, _) = self.update(state)
+            if self.mdp.is_terminal(state):
+                break
+            state = self.sample(state, action)
+
+        while visited:
+            if not self.check_solved(visited.pop(), theta):
+                break
+
+    def check_solved(self, state, theta:float) -> bool:
+        """
+        Comprueba si un estado y todos los alcanzables desde él con la política voraz tienen
+        residuo menor que theta. Si es así los etiqueta como resueltos y, si no, los actualiza.
+        """
+        converged = True
+        open_states = [] if state in self.solved else [state]
+        seen = set(open_states)
+        closed = []
+        while open_states:
+            state = open_states.pop()
+            closed.append(state)
+            if self.is_dead_end(state):
+                continue
+            (action, residual) = self.greedy(state)
+            self.residual_checks += 1
+            if residual > theta:
+                converged = False
+                continue
+            for (next_state, probability, _) in self.get_transitions(state, action):
+                if probability > 0 and next_state not in self.solved and next_state not in seen:
+                    seen.add(next_state)
+                    open_states.append(next_state)
+
+        if converged:
+            self.solved.update(closed)
+        else:
+            while closed:
+                state = closed.pop()
+                if not self.is_dead_end(state):
+                    self.update(state)
+        return converged
+
+    def get_value(self, state) -> float:
+        """Valor actual de un estado, que se inicializa con la heurística la primera vez"""
+        table = self.values.value_table
+        value = table.get(state)
+        if value is None:
+            if self.is_dead_end(state):
+                value = 0.0
+            elif callable(self.heuristic):
+                value = self.heuristic(state)
+            else:
+                value = self.heuristic
+            table[state] = value
+        return value
+
+    def get_transitions(self, state, action):
+        key = (state, action)
+        transitions = self.transitions.get(key)
+        if transitions is None:
+            transitions = self.transitions[key] = [
+                (next_state, probability, self.mdp.get_reward(state, action, next_state))
+                for (next_state, probability) in self.mdp.get_transitions(state, action)]
+        return transitions
+
+    def get_actions(self, state):
+        actions = self.actions.get(state)
+        if actions is None:
+            actions = self.actions[state] = self.mdp.get_actions(state)
+        return actions
+
+    def is_dead_end(self, state) -> bool:
+        """Estados sin acciones: valen 0 y no se actualizan"""
+        return len(self.get_actions(state)) == 0
+
+    def best_q(self, state):
+        """Acción voraz de un estado y su valor Q"""
+        best_action = None
+        best_value = float("-inf")
+        for action in self.get_actions(state):
+            q_value = 0.0
+            for (next_state, probability, reward) in self.get_transitions(state, action):
+                q_value += probability * (reward + self.gamma * self.get_value(next_state))
+            if q_value > best_value:
+                (best_action, best_value) = (action, q_value)
+        return (best_action, best_value)
+
+    def greedy(self, state):
+        """Acción voraz de un estado y su residuo de Bellman (sin actualizar el valor)"""
+        (action, value) = self.best_q(state)
+        return (action, abs(value - self.get_value(state)))
+
+    def update(self, state):
+        """Actualización de Bellman de un estado. Devuelve la acción voraz y el cambio de valor"""
+        (action, value) = self.best_q(state)
+        residual = abs(value - self.get_value(state))
+        self.values.update(state, value)
+        self.backups += 1
+        return (action, residual)
+
+    def sample(self, state, action):
+        """Siguiente estado de una transición, muestreado con sus probabilidades"""
+        rand = random.random()
+        cumulative_probability = 0.0
+        transitions = self.get_transitions(state, action)
+        for (next_state, probability, _) in transitions:
+            cumulative_probability += probability
+            if rand < cumulative_probability:
+                return next_state
+        return transitions[-1][0]
+
+    def extract_policy(self) -> TabularPolicy:
+        """Política voraz en los estados visitados que tienen acciones"""
+        policy = TabularPolicy()
+        for state in list(self.values.value_table):
+            if not self.is_dead_end(state):
+                policy.update(state, self.greedy(state)[0])
+        return policy
@@ -0,0 +1,258 @@
+from array import array
+import numpy as np
+from compiled_mdp import IndexedModel, enumerate_transitions
+
+"""
+Clase SparseMDP: Representación dispersa (CSR) de un MDP compilado.
+
+Para mallas grandes el tensor denso S×A×S no es viable, y el tensor de sucesores
+(S, A, K) desperdicia memoria cuando el número de sucesores varía. Aquí cada par
+(estado, acción) válido es una fila, y las transiciones de todas las filas se
+guardan seguidas en arrays planos:
+
+    state_offsets[s] : state_offsets[s+1]   filas del estado s
+    row_offsets[r]   : row_offsets[r+1]     transiciones de la fila r
+    successors, probabilities               índice y probabilidad de cada transición
+
+La memoria es proporcional al número de transiciones con probabilidad no nula.
+"""
+
+class SparseMDP(IndexedModel):
+
+    def __init__(self,
+                 states,
+                 actions,
+                 state_offsets,
+                 row_actions,
+                 row_offsets,
+                 successors,
+                 probabilities,
+                 row_rewards,
+                 discount_factor) -> None:
+        """
+        Crea el modelo disperso a partir de los arrays ya construidos.
+        Normalmente se obtiene mediante SparseMDP.from_mdp(mdp) o mdp.compile(sparse=True).
+
+        Args:
+            states (List): estados originales, en el orden de su índice.
+            actions (List): acciones originales, en el orden de su índice.
+            state_offsets (np.ndarray): (S+1) inicio de las filas de cada estado.
+            row_actions (np.ndarray): (F) índice de la acción de cada fila.
+            row_offsets (np.ndarray): (F+1) inicio de las transiciones de cada fila.
+            successors (np.ndarray): (T) índice del sucesor de cada transición.
+            probabilities (np.ndarray): (T) probabilidad de cada transición.
+            row_rewards (np.ndarray): (F) recompensa esperada de cada fila.
+            discount_factor (float): factor de descuento del modelo.
+        """
+        super().__init__(states, actions, discount_factor)
+        self.state_offsets = state_offsets
+        self.row_actions = row_actions
+        self.row_offsets = row_offsets
+        self.successors = successors
+        self.probabilities = probabilities
+        self.row_rewards = row_rewards
+
+        # Estado al que pertenece cada fila
+        self.row_states = np.repeat(
+            np.arange(self.num_states, dtype=successors.dtype), np.diff(state_offsets)
+        )
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.row_actions)
+
+    @property
+    def num_transitions(self) -> int:
+        return len(self.successors)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por los arrays del modelo, en bytes"""
+        return sum(a.nbytes for a in (self.state_offsets, self.row_actions, self.row_offsets,
+                                      self.successors, self.probabilities, self.row_rewards,
+                                      self.row_states))
+
+    @classmethod
+    def from_mdp(cls, mdp, dtype=np.float64):
+        """
+        Compila un MDP en formato CSR recorriendo su interfaz una única vez.
+        Las filas se vuelcan en arrays compactos a medida que se generan.
+
+        Args:
+            mdp (MDP): el modelo a compilar.
+            dtype: tipo de los arrays de probabilidades y recompensas. Por defecto float64.
+
+        Returns:
+            SparseMDP: el modelo compilado.
+        """
+        (states, actions, rows) = enumerate_transitions(mdp)
+
+        row_states = array("q")
+        row_actions = array("q")
+        row_lengths = array("q")
+        row_rewards = array("d")
+        successors = array("q")
+        probabilities = array("d")
+        for (s, a, row) in rows:
+            row_states.append(s)
+            row_actions.append(a)
+            row_lengths.append(len(row))
+            row_rewards.append(sum(p * r for (_, p, r) in row))
+            for (next_state, probability, _) in row:
+                successors.append(next_state)
+                probabilities.append(probability)
+
+        num_states = len(states)
+        index_dtype = np.int32 if num_states < 2**31 and len(successors) < 2**31 else np.int64
+
+        # Las filas se generan agrupadas por estado y en orden creciente
+        state_offsets = np.zeros(num_states + 1, dtype=index_dtype)
+        np.cumsum(np.bincount(np.frombuffer(row_states, dtype=np.int64), minlength=num_states),
+                  out=state_offsets[1:])
+        row_offsets = np.zeros(len(row_lengths) + 1, dtype=index_dtype)
+        np.cumsum(np.frombuffer(row_lengths, dtype=np.int64), out=row_offsets[1:])
+
+        return cls(states,
+                   actions,
+                   state_offsets,
+                   np.frombuffer(row_actions, dtype=np.int64).astype(np.int16 if len(actions) < 2**15 else np.int64),
+                   row_offsets,
+                   np.frombuffer(successors, dtype=np.int64).astype(index_dtype),
+                   np.frombuffer(probabilities, dtype=np.float64).astype(dtype),
+                   np.frombuffer(row_rewards, dtype=np.float64).astype(dtype),
+                   mdp.get_discount_factor())
+
+    def has_actions(self) -> np.ndarray:
+        return np.diff(self.state_offsets) > 0
+
+    def row_q_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Calcula Q(s,a) = R(s,a) + γ sum_s' P(s'|s,a) V(s') para cada fila (par estado-acción válido).
+
+        Args:
+            values (np.ndarray): vector de valores V de tamaño S.
+
+        Returns:
+            np.ndarray: vector Q de tamaño F (número de filas).
+        """
+        if self.num_rows == 0:
+            return np.zeros(0, dtype=values.dtype)
+        expected_next = np.add.reduceat(self.probabilities * values[self.successors], self.row_offsets[:-1])
+        return self.row_rewards + self.discount_factor * expected_next
+
+    def bellman_backup(self, values: np.ndarray):
+        """
+        Aplica el operador de Bellman V(s) = max_a Q(s,a) a todos los estados.
+        Los estados sin acciones válidas toman el valor 0 (no -inf como en ValueIteration,
+        ver CompiledMDP.bellman_backup).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: los nuevos valores y el índice de la mejor acción
+            (-1 en los estados sin acciones).
+        """
+        (new_values, best_rows) = self._max_rows(self.row_q_values(values))
+        best_actions = np.full(self.num_states, -1, dtype=np.int64)
+        has_actions = best_rows >= 0
+        best_actions[has_actions] = self.row_actions[best_rows[has_actions]]
+        return (new_values, best_actions)
+
+    def _max_rows(self, row_q: np.ndarray):
+        """Máximo por estado de un vector por filas, con la primera fila que lo alcanza"""
+        new_values = np.zeros(self.num_states, dtype=row_q.dtype)
+        best_rows = np.full(self.num_states, -1, dtype=np.int64)
+        has_actions = self.has_actions()
+        if not has_actions.any():
+            return (new_values, best_rows)
+
+        starts = self.state_offsets[:-1][has_actions]
+        new_values[has_actions] = np.maximum.reduceat(row_q, starts)
+        # Primera fila de cada estado que alcanza el máximo (mismo desempate que get_max_q)
+        candidates = np.where(row_q >= new_values[self.row_states], np.arange(self.num_rows), self.num_rows)
+        best_rows[has_actions] = np.minimum.reduceat(candidates, starts)
+        return (new_values, best_rows)
+
+    def policy_rows(self, policy) -> np.ndarray:
+        """
+        Traduce una política determinista a la fila (par estado-acción) elegida en cada estado.
+
+        Returns:
+            np.ndarray: vector de tamaño S con el índice de la fila, o -1 si la acción de la
+            política no es válida en el estado (su valor queda fijo en la recompensa 0).
+        """
+        rows = np.full(self.num_states, -1, dtype=np.int64)
+        row_actions = self.row_actions
+        for (i, state) in enumerate(self.states):
+            action = self.action_index.get(policy.select_action(state))
+            for row in range(self.state_offsets[i], self.state_offsets[i + 1]):
+                if row_actions[row] == action:
+                    rows[i] = row
+                    break
+        return rows
+
+
+def sparse_value_iteration(model: SparseMDP, values: np.ndarray, max_iterations=100, theta=0.001):
+    """
+    Iteración de valores síncrona sobre un modelo CSR.
+
+    Args:
+        model (SparseMDP): el modelo compilado.
+        values (np.ndarray): valores iniciales (no se modifican).
+        max_iterations (int): número máximo de iteraciones.
+        theta (float): umbral de convergencia sobre la norma infinito del residuo.
+
+    Returns:
+        Tuple[np.ndarray, int]: los valores y la iteración en la que convergió (None si no lo hizo).
+    """
+    for i in range(max_iterations):
+        (new_values, _) = model.bellman_backup(values)
+        delta = np.abs(new_values - values).max() if len(values) else 0.0
+        values = new_values
+        if delta < theta:
+            return (values, i)
+    return (values, None)
+
+
+def sparse_policy_evaluation(model: SparseMDP, rows: np.ndarray, values: np.ndarray,
+                             max_iterations=1000, theta=0.001):
+    """
+    Evaluación iterativa de una política sobre un modelo CSR: V = R_π + γ P_π V.
+    Las transiciones de la política se extraen una vez y cada barrido solo recorre esas.
+
+    Args:
+        model (SparseMDP): el modelo compilado.
+        rows (np.ndarray): fila elegida en cada estado (ver SparseMDP.policy_rows).
+        values (np.ndarray): valores iniciales (no se modifican).
+        max_iterations (int): número máximo de barridos.
+        theta (float): umbral de convergencia sobre la norma infinito del residuo.
+
+    Returns:
+        Tuple[np.ndarray, int]: los valores y el número de barridos realizados.
+    """
+    (rewards, successors, probabilities, offsets, evaluated) = policy_transitions(model, rows)
+    values = values.copy()
+    sweeps = 0
+    for sweeps in range(1, max_iterations + 1):
+        new_values = np.zeros_like(values)
+        if len(offsets):
+            new_values[evaluated] = rewards + model.discount_factor * np.add.reduceat(
+                probabilities * values[successors], offsets
+            )
+        delta = np.abs(new_values - values).max() if len(values) else 0.0
+        values = new_values
+        if delta < theta:
+            break
+    return (values, sweeps)
+
+
+def policy_transitions(model: SparseMDP, rows: np.ndarray):
+    """Extrae en arrays contiguos las transiciones de las filas elegidas por una política"""
+    evaluated = np.flatnonzero(rows >= 0)
+    chosen = rows[evaluated]
+    starts = model.row_offsets[chosen].astype(np.int64)
+    lengths = model.row_offsets[chosen + 1] - starts
+    offsets = np.zeros(len(chosen), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    # Índice de cada transición de la política dentro de los arrays del modelo
+    transitions = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+    return (model.row_rewards[chosen], model.successors[transitions],
+            model.probabilities[transitions], offsets, evaluated)
@@ -16,3 +16,6 @@ class TabularValueFunction(ValueFunction):
     def get_value(self, state):
         return self.value_table[state]
 
+    def new_buffer(self):
+        return TabularValueFunction()
+
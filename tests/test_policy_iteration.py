@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from gridworld import GridWorld
+from random_mdp import RandomMDP
+from tabular_policy import TabularPolicy
+from policy_iteration import PolicyIteration
+
+MODELS = {
+    "gridworld": lambda: GridWorld(width=6, height=5, noise=0.2, action_cost=-0.05),
+    "random": lambda: RandomMDP(num_states=50, num_actions=4, seed=3),
+}
+
+
+def solve(mdp, **kwargs):
+    solver = PolicyIteration(mdp, TabularPolicy(default_action=mdp.get_actions()[0]), **kwargs)
+    solver.policy_iteration(max_iterations=100, theta=1e-10)
+    states = [state for state in mdp.get_states() if mdp.get_actions(state)]
+    return (solver, [solver.policy.select_action(state) for state in states])
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("evaluation", ["exact", "modified"])
+def test_policy_matches_iterative_evaluation(name, evaluation):
+    mdp = MODELS[name]()
+    (_, iterative) = solve(mdp)
+    (_, policy) = solve(mdp, evaluation=evaluation, evaluation_sweeps=20)
+    assert policy == iterative
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_action_elimination_keeps_the_policy(name):
+    mdp = MODELS[name]()
+    (plain, policy) = solve(mdp)
+    (eliminating, eliminated_policy) = solve(mdp, evaluation="exact", action_elimination=True)
+    assert eliminated_policy == policy
+    assert plain.elimination_history == [] and plain.active_actions == {}
+    assert len(eliminating.elimination_history) > 0
+    assert np.all(np.diff(eliminating.elimination_history) >= 0)
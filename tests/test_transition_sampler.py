@@ -0,0 +1,66 @@
+import random
+import numpy as np
+import pytest
+from gridworld import GridWorld
+from vehiclesplope import VehicleSlopeV2
+from transition_sampler import TransitionSampler, build_alias_table
+
+SAMPLES = 20000
+
+
+def expected_distribution(mdp, state, action):
+    probabilities = {}
+    for (next_state, probability) in mdp.get_transitions(state, action):
+        probabilities[next_state] = probabilities.get(next_state, 0.0) + probability
+    return probabilities
+
+
+def frequencies(sampled):
+    counts = {}
+    for next_state in sampled:
+        counts[next_state] = counts.get(next_state, 0) + 1
+    return {next_state: count / len(sampled) for (next_state, count) in counts.items()}
+
+
+@pytest.mark.parametrize("probabilities", [[1.0], [0.5, 0.5], [0.7, 0.2, 0.1], [0.1, 0.0, 0.6, 0.3]])
+def test_alias_table_reproduces_the_distribution(probabilities):
+    (thresholds, aliases) = build_alias_table(probabilities)
+    k = len(probabilities)
+    # Probabilidad exacta de cada casilla: la parte propia más lo que le ceden como alias
+    mass = [0.0] * k
+    for i in range(k):
+        mass[i] += thresholds[i] / k
+        mass[aliases[i]] += (1 - thresholds[i]) / k
+    np.testing.assert_allclose(mass, probabilities, atol=1e-12)
+
+
+@pytest.mark.parametrize("mdp", [GridWorld(width=4, height=3, noise=0.2), VehicleSlopeV2()], ids=["gridworld", "vehicle_v2"])
+def test_sampled_frequencies_match_transitions(mdp):
+    random.seed(0)
+    sampler = TransitionSampler(mdp, seed=0)
+    for state in mdp.get_states():
+        for action in mdp.get_actions(state):
+            expected = expected_distribution(mdp, state, action)
+            single = frequencies([sampler.execute(state, action)[0] for _ in range(SAMPLES)])
+            (batch, rewards) = sampler.execute_batch([state] * SAMPLES, [action] * SAMPLES)
+            for observed in (single, frequencies(batch)):
+                assert set(observed) <= set(expected)
+                for (next_state, probability) in expected.items():
+                    # Más de 5 desviaciones típicas con 20000 muestras
+                    assert abs(observed.get(next_state, 0.0) - probability) < 0.02
+            assert rewards.tolist() == [mdp.get_reward(state, action, s) for s in batch]
+
+
+def test_incremental_tables_match_a_fresh_sampler():
+    mdp = GridWorld(width=5, height=5, noise=0.2)
+    pairs = [(state, action) for state in mdp.get_states() for action in mdp.get_actions(state)]
+    uniforms = np.random.default_rng(1).random(len(pairs))
+    incremental = TransitionSampler(mdp)
+    # Las tablas se añaden en varios lotes y se muestrea entre lote y lote
+    for start in range(0, len(pairs), 7):
+        chunk = pairs[start:start + 7]
+        incremental.execute_batch([s for (s, _) in chunk], [a for (_, a) in chunk], uniforms[start:start + 7])
+    fresh = TransitionSampler(mdp)
+    states = [s for (s, _) in pairs]
+    actions = [a for (_, a) in pairs]
+    assert incremental.execute_batch(states, actions, uniforms)[0] == fresh.execute_batch(states, actions, uniforms)[0]
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from mdp import MDP
+from gridworld import GridWorld
+from vehiclesplope import VehicleSlopeV1, VehicleSlopeV2
+from random_mdp import RandomMDP
+from tabular_value_function import TabularValueFunction
+from value_iteration import ValueIteration
+from vectorized_value_iteration import VectorizedValueIteration
+from topological_value_iteration import TopologicalValueIteration
+from parallel_value_iteration import ParallelValueIteration
+from sparse_mdp import sparse_value_iteration
+
+THETA = 1e-9
+MAX_ITERATIONS = 10000
+
+MODELS = {
+    "gridworld": lambda: GridWorld(width=7, height=5, noise=0.2, action_cost=-0.05),
+    "gridworld_goals": lambda: GridWorld(width=6, height=6, noise=0.1, goals=[((0, 0), 3), ((4, 2), -2)]),
+    "vehicle_v1": VehicleSlopeV1,
+    "vehicle_v2": lambda: VehicleSlopeV2(discount_factor=0.95),
+    "random": lambda: RandomMDP(num_states=60, num_actions=3, seed=1),
+}
+
+
+def reference_values(mdp):
+    values = TabularValueFunction()
+    assert ValueIteration(mdp, values).value_iteration(MAX_ITERATIONS, THETA) is not None
+    return np.array([values.get_value(state) for state in mdp.get_states()])
+
+
+def solver_values(solver_class, mdp, **kwargs):
+    values = TabularValueFunction()
+    solver_class(mdp, values, **kwargs).value_iteration(MAX_ITERATIONS, THETA)
+    return np.array([values.get_value(state) for state in mdp.get_states()])
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_vectorized_matches_value_iteration(name):
+    mdp = MODELS[name]()
+    np.testing.assert_allclose(solver_values(VectorizedValueIteration, mdp), reference_values(mdp), atol=1e-6)
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_sparse_matches_value_iteration(name):
+    mdp = MODELS[name]()
+    model = mdp.compile(sparse=True)
+    (values, iteration) = sparse_value_iteration(model, np.zeros(model.num_states), MAX_ITERATIONS, THETA)
+    assert iteration is not None
+    by_state = dict(zip(model.states, values.tolist()))
+    np.testing.assert_allclose([by_state[state] for state in mdp.get_states()], reference_values(mdp), atol=1e-6)
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_topological_matches_value_iteration(name):
+    mdp = MODELS[name]()
+    np.testing.assert_allclose(solver_values(TopologicalValueIteration, mdp), reference_values(mdp), atol=1e-6)
+
+
+@pytest.mark.parametrize("name", ["gridworld", "random"])
+def test_parallel_matches_value_iteration(name):
+    mdp = MODELS[name]()
+    np.testing.assert_allclose(solver_values(ParallelValueIteration, mdp, workers=2), reference_values(mdp), atol=1e-6)
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(),
+    dict(noise=0.0),
+    dict(noise=0.5, action_cost=-0.37),
+    dict(width=1, height=4, goals=[((0, 0), 1), ((9, 9), 2)]),
+])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_gridworld_compile_matches_generic_compile(kwargs, sparse):
+    gridworld = GridWorld(**kwargs)
+    fast = gridworld.compile(sparse=sparse)
+    generic = MDP.compile(gridworld, sparse=sparse)
+    assert (fast.states, fast.actions) == (generic.states, generic.actions)
+    for (name, array) in vars(generic).items():
+        if isinstance(array, np.ndarray):
+            assert getattr(fast, name).dtype == array.dtype
+            np.testing.assert_array_equal(getattr(fast, name), array)
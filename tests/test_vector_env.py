@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from cartpole import CartPole
+from mountaincar import MountainCar
+from vector_env import VectorCartPole, VectorMountainCar
+
+NUM_ENVS = 8
+STEPS = 1500
+
+
+@pytest.mark.parametrize("vector_class, scalar_class, near_goal", [
+    (VectorCartPole, CartPole, None),
+    (VectorMountainCar, MountainCar, (0.4, 0.05)),
+])
+def test_vector_env_matches_scalar_env(vector_class, scalar_class, near_goal):
+    rng = np.random.default_rng(0)
+    env = vector_class(NUM_ENVS, seed=0)
+    if near_goal is not None:
+        # Sin esto MountainCar no termina ningún episodio con acciones aleatorias
+        env.states[:NUM_ENVS // 2] = near_goal
+    scalars = [scalar_class() for _ in range(NUM_ENVS)]
+    for (scalar, state) in zip(scalars, env.states):
+        scalar.state = tuple(state.tolist())
+
+    actions_list = np.array(env.get_actions())
+    episodes = 0
+    for _ in range(STEPS):
+        actions = rng.choice(actions_list, size=NUM_ENVS)
+        (states, rewards, dones) = env.step(actions)
+        for (i, scalar) in enumerate(scalars):
+            (state, reward, done) = scalar.execute(int(actions[i]))
+            np.testing.assert_allclose(np.array(state, dtype=float), env.final_states[i], atol=1e-12)
+            assert reward == rewards[i]
+            assert bool(done) == bool(dones[i])
+            if dones[i]:
+                scalar.state = tuple(states[i].tolist())
+                scalar.steps_beyond_terminated = None
+                episodes += 1
+    assert episodes > 0
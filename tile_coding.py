@@ -0,0 +1,133 @@
+import numpy as np
+from qfunction import QFunction
+
+"""
+Función Q lineal con codificación por teselas (tile coding).
+
+El espacio de estados continuo se cubre con varias rejillas (tilings) desplazadas
+entre sí. Cada par (estado, acción) activa una tesela por rejilla y su valor Q es la
+suma de los pesos de esas teselas, que se guardan en un array. Por defecto el array
+tiene exactamente una posición por (rejilla, tesela, acción), es decir
+num_tilings × (tiles + 1)^d × num_actions, y el índice es directo (sin colisiones).
+Si se indica memory_size, las teselas se reparten por hash en un array de ese tamaño,
+así que la memoria no depende de la resolución de las rejillas (a cambio de
+colisiones cuando el array es menor que el número de teselas).
+
+Con varias rejillas gruesas se consigue una resolución fina y, a la vez, la
+generalización entre estados vecinos que una única Q-tabla fina no tiene.
+Funciona con estados sin discretizar (ver el parámetro discretize de los ejecutores
+de CartPole y MountainCar).
+"""
+
+class TileCodingQFunction(QFunction):
+    def __init__(self,
+                 lower_bounds,
+                 upper_bounds,
+                 tiles_per_dimension=8,
+                 num_tilings=8,
+                 memory_size=None,
+                 default=0.0,
+                 num_actions=3) -> None:
+        """
+        Args:
+            lower_bounds (List[float]): límite inferior de cada dimensión del estado.
+            upper_bounds (List[float]): límite superior de cada dimensión del estado.
+            tiles_per_dimension (int o List[int]): teselas de cada rejilla por dimensión. Por defecto 8.
+            num_tilings (int): número de rejillas desplazadas. Por defecto 8.
+            memory_size (int, optional): tamaño del array de pesos con hash. Por defecto el
+                necesario para indexar sin colisiones todas las teselas de num_actions acciones.
+            default (float): valor Q inicial de cualquier par (estado, acción). Por defecto 0.0.
+            num_actions (int): número de acciones distintas (solo sin memory_size). Por defecto 3.
+        """
+        if memory_size is not None and (not isinstance(memory_size, (int, np.integer)) or memory_size <= 0):
+            raise ValueError(f"memory_size debe ser un entero positivo (es {memory_size!r})")
+        if not isinstance(num_actions, (int, np.integer)) or num_actions <= 0:
+            raise ValueError(f"num_actions debe ser un entero positivo (es {num_actions!r})")
+        self.lower_bounds = [float(b) for b in lower_bounds]
+        self.upper_bounds = [float(b) for b in upper_bounds]
+        dimensions = len(self.lower_bounds)
+        if isinstance(tiles_per_dimension, int):
+            tiles_per_dimension = [tiles_per_dimension] * dimensions
+        self.tiles_per_dimension = list(tiles_per_dimension)
+        self.num_tilings = num_tilings
+        self.num_actions = num_actions
+
+        # Escala de cada dimensión a unidades de tesela
+        self.lower = np.array(self.lower_bounds)
+        self.upper = np.array(self.upper_bounds)
+        self.scales = np.array(self.tiles_per_dimension) / (self.upper - self.lower)
+        self.max_scaled = np.array(self.tiles_per_dimension) - 1e-9
+        # Desplazamientos asimétricos (1, 3, 5, ...) para que las rejillas no se alineen en diagonal
+        self.offsets = (np.arange(num_tilings)[:, None] * (2 * np.arange(dimensions) + 1) / num_tilings) % 1.0
+        # Cada rejilla tiene tiles + 1 teselas por dimensión por el desplazamiento
+        sizes = np.array(self.tiles_per_dimension, dtype=np.int64) + 1
+        self.strides = np.cumprod(np.append(1, sizes[:-1]))
+        self.tiling_base = np.arange(num_tilings, dtype=np.int64) * int(np.prod(sizes))
+        # Sin memory_size, una posición por (rejilla, tesela, acción) e índice directo
+        self.hashed = memory_size is not None
+        self.memory_size = int(memory_size) if self.hashed else num_tilings * int(np.prod(sizes)) * num_actions
+
+        # El valor inicial se reparte entre las rejillas
+        self.weights = np.full(self.memory_size, default / num_tilings)
+        self.action_index = {}
+
+        # Teselas e índices de los últimos estados consultados: en cada paso se pregunta
+        # varias veces por el estado actual y por el siguiente
+        self._cache = {}
+
+    def get_tiles(self, state) -> np.ndarray:
+        """Identificador de la tesela activa en cada rejilla (sin la acción)"""
+        return self._cached(state)[0]
+
+    def _cached(self, state):
+        entry = self._cache.get(state)
+        if entry is None:
+            scaled = (np.asarray(state, dtype=float) - self.lower) * self.scales
+            scaled = np.minimum(np.maximum(scaled, 0.0), self.max_scaled)
+            coordinates = (scaled + self.offsets).astype(np.int64)
+            tiles = coordinates @ self.strides + self.tiling_base
+            if len(self._cache) >= 4:
+                self._cache.clear()
+            entry = self._cache[state] = (tiles, {})
+        return entry
+
+    def get_indices(self, state, action) -> np.ndarray:
+        """Posición en el array de pesos de la tesela activa de cada rejilla para el par (estado, acción)"""
+        (tiles, cached_indices) = self._cached(state)
+        indices = cached_indices.get(action)
+        if indices is None:
+            action_id = self.action_index.setdefault(action, len(self.action_index))
+            if not self.hashed:
+                if action_id >= self.num_actions:
+                    raise ValueError(f"Hay más de {self.num_actions} acciones: hay que indicar num_actions")
+                indices = tiles * self.num_actions + action_id
+            else:
+                # Hash de 64 bits de (tesela, acción) y resto módulo memory_size, en uint64
+                hashed = _mix64(_mix64(tiles.astype(np.uint64)) ^ np.uint64(_mix64_int(action_id)))
+                indices = (hashed % np.uint64(self.memory_size)).astype(np.int64)
+            cached_indices[action] = indices
+        return indices
+
+    def update(self, state, action, delta) -> None:
+        # Cada tesela recibe delta / num_tilings, así que Q(s,a) cambia en delta
+        np.add.at(self.weights, self.get_indices(state, action), delta / self.num_tilings)
+
+    def get_q_value(self, state, action):
+        return self.weights[self.get_indices(state, action)].sum().item()
+
+
+def _mix64(values:np.ndarray) -> np.ndarray:
+    """Finalizador de splitmix64 sobre un array uint64 (los productos dan la vuelta módulo 2^64)"""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _mix64_int(value:int) -> int:
+    """El mismo finalizador sobre un entero de Python"""
+    mask = 0xFFFFFFFFFFFFFFFF
+    value = (value + 0x9E3779B97F4A7C15) & mask
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & mask
+    return value ^ (value >> 31)
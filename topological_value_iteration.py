@@ -0,0 +1,164 @@
+import numpy as np
+
+"""
+CLASE PARA EJECUTAR LA ITERACIÓN DE VALORES TOPOLÓGICA
+
+El grafo de transiciones (un arco s -> s' si alguna acción lleva de s a s' con
+probabilidad mayor que 0) se descompone en componentes fuertemente conexas con el
+algoritmo de Tarjan, que las devuelve en orden topológico inverso: cada componente
+solo depende de sí misma y de las que ya se han resuelto. Cada componente se
+resuelve con iteración de valores restringida a sus estados hasta que converge, y
+sus valores ya no vuelven a cambiar.
+
+Las componentes de un solo estado sin bucle (partes acíclicas del modelo) se
+resuelven con una única actualización. Misma interfaz que ValueIteration; usa el
+modelo compilado en formato CSR y deja en component_sweeps los barridos de cada
+componente.
+"""
+
+class TopologicalValueIteration:
+    def __init__(self, mdp, values, compiled=None):
+        self.mdp = mdp
+        self.values = values
+        self.compiled = compiled if compiled is not None else mdp.compile(sparse=True)
+        # Componentes en el orden en que se resuelven y barridos de cada una
+        self.components = None
+        self.component_sweeps = None
+
+    def strongly_connected_components(self):
+        """
+        Componentes fuertemente conexas del grafo de transiciones (Tarjan iterativo).
+
+        Returns:
+            List[np.ndarray]: índices de los estados de cada componente, en orden topológico
+            inverso (las componentes sumidero primero).
+        """
+        compiled = self.compiled
+        num_states = compiled.num_states
+        # Transiciones de cada estado (todas sus filas seguidas en el array de sucesores)
+        edge_offsets = compiled.row_offsets[compiled.state_offsets].tolist()
+        successors = compiled.successors.tolist()
+
+        index = [-1] * num_states
+        lowlink = [0] * num_states
+        on_stack = [False] * num_states
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(num_states):
+            if index[root] >= 0:
+                continue
+            # Pila de llamadas: (estado, siguiente transición por explorar)
+            calls = [(root, edge_offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while calls:
+                (state, edge) = calls[-1]
+                end = edge_offsets[state + 1]
+                while edge < end:
+                    successor = successors[edge]
+                    edge += 1
+                    if index[successor] < 0:
+                        calls[-1] = (state, edge)
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        calls.append((successor, edge_offsets[successor]))
+                        break
+                    if on_stack[successor] and index[successor] < lowlink[state]:
+                        lowlink[state] = index[successor]
+                else:
+                    # Todas las transiciones exploradas: se cierra el estado
+                    calls.pop()
+                    if calls:
+                        parent = calls[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[state])
+                    if lowlink[state] == index[state]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == state:
+                                break
+                        components.append(np.array(component, dtype=np.int64))
+        return components
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        """
+        Resuelve las componentes en orden topológico inverso.
+
+        Args:
+            max_iterations (int): número máximo de barridos de cada componente.
+            theta (float): umbral de convergencia de cada componente.
+
+        Returns:
+            int: el mayor índice de barrido en el que convergió una componente (como el valor
+            devuelto por ValueIteration), o None si alguna no convergió.
+        """
+        compiled = self.compiled
+        gamma = compiled.discount_factor
+        values = compiled.values_to_array(self.values)
+        self.components = self.strongly_connected_components()
+        self.component_sweeps = np.zeros(len(self.components), dtype=np.int64)
+
+        result = 0
+        for (c, states) in enumerate(self.components):
+            (row_rewards, successors, probabilities, row_offsets, state_offsets, acyclic) = self._component_arrays(states)
+            # Los estados sin acciones valen 0
+            has_rows = np.diff(np.append(state_offsets, len(row_rewards))) > 0
+            limit = 1 if acyclic else max_iterations
+
+            converged = None
+            for i in range(limit):
+                new_values = np.zeros(len(states))
+                if len(row_rewards):
+                    q_values = row_rewards + gamma * np.add.reduceat(probabilities * values[successors], row_offsets)
+                    new_values[has_rows] = np.maximum.reduceat(q_values, state_offsets[has_rows])
+                delta = np.abs(new_values - values[states]).max()
+                values[states] = new_values
+                if acyclic or delta < theta:
+                    converged = i
+                    break
+
+            self.component_sweeps[c] = (converged if converged is not None else limit - 1) + 1
+            result = None if converged is None or result is None else max(result, converged)
+
+        compiled.array_to_values(values, self.values)
+        return result
+
+    def _component_arrays(self, states):
+        """Filas y transiciones de los estados de una componente, en arrays contiguos"""
+        compiled = self.compiled
+        (first_rows, rows_per_state) = _ranges(compiled.state_offsets, states)
+        rows = _expand(first_rows, rows_per_state)
+        (first_edges, edges_per_row) = _ranges(compiled.row_offsets, rows)
+        edges = _expand(first_edges, edges_per_row)
+
+        state_offsets = np.zeros(len(states), dtype=np.int64)
+        np.cumsum(rows_per_state[:-1], out=state_offsets[1:])
+        row_offsets = np.zeros(len(rows), dtype=np.int64)
+        np.cumsum(edges_per_row[:-1], out=row_offsets[1:])
+        successors = compiled.successors[edges]
+        # Un único estado sin bucle sobre sí mismo solo depende de componentes ya resueltas
+        acyclic = len(states) == 1 and not (successors == states[0]).any()
+        return (compiled.row_rewards[rows], successors, compiled.probabilities[edges],
+                row_offsets, state_offsets, acyclic)
+
+
+def _ranges(offsets, items):
+    """Inicio y longitud del tramo [offsets[i], offsets[i+1]) de cada elemento"""
+    starts = offsets[items].astype(np.int64)
+    return (starts, offsets[items + 1] - starts)
+
+
+def _expand(starts, lengths):
+    """Concatena los tramos [start, start + length) en un único array de índices"""
+    shifts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=shifts[1:])
+    return np.repeat(starts - shifts, lengths) + np.arange(lengths.sum())
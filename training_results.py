@@ -0,0 +1,96 @@
+import numpy as np
+
+"""
+Clase TrainingResults: Resultados compactos de un entrenamiento libre de modelo.
+
+Guarda por episodio la recompensa total, el número de pasos, epsilon y alpha, junto
+con el tiempo total y los pasos por segundo. La gráfica es un paso aparte y opcional
+que puede mostrarse por pantalla o guardarse en un fichero (sin necesidad de pantalla).
+"""
+
+class TrainingResults:
+
+    def __init__(self, episodes:int) -> None:
+        """
+        Args:
+            episodes (int): número máximo de episodios que se van a registrar.
+        """
+        self.scores = np.zeros(episodes)
+        self.steps = np.zeros(episodes, dtype=np.int64)
+        self.epsilons = np.zeros(episodes)
+        self.alphas = np.zeros(episodes)
+        self.episodes = 0
+        self.wall_time = 0.0
+        # Episodio en el que se cumplió la condición de resuelto (None si no se cumplió)
+        self.solved_episode = None
+
+    def record(self, score:float, steps:int, epsilon:float, alpha:float) -> None:
+        """Registra los datos de un episodio"""
+        i = self.episodes
+        self.scores[i] = score
+        self.steps[i] = steps
+        self.epsilons[i] = epsilon
+        self.alphas[i] = alpha
+        self.episodes += 1
+
+    def finish(self, wall_time:float) -> None:
+        """Recorta los arrays a los episodios registrados y guarda el tiempo total"""
+        n = self.episodes
+        (self.scores, self.steps) = (self.scores[:n], self.steps[:n])
+        (self.epsilons, self.alphas) = (self.epsilons[:n], self.alphas[:n])
+        self.wall_time = wall_time
+
+    @property
+    def total_steps(self) -> int:
+        return int(self.steps.sum())
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.total_steps / self.wall_time if self.wall_time > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return (f"TrainingResults(episodes={self.episodes}, total_steps={self.total_steps}, "
+                f"wall_time={self.wall_time:.2f}s, steps_per_second={self.steps_per_second:.0f}, "
+                f"solved_episode={self.solved_episode})")
+
+    def plot(self, path=None, series:str="score") -> None:
+        """
+        Grafica los datos por episodio con las mismas series que mostraba cada ejecutor.
+
+        Args:
+            path (str, optional): si se indica, la figura se guarda en ese fichero en lugar de mostrarse.
+            series (str): "steps" para la gráfica de CartPole (tiempo por episodio con su media,
+                tasa de aprendizaje y tasa de exploración) o "score" para la de MountainCar
+                (recompensa por episodio y tasa de exploración). Por defecto "score".
+        """
+        if series not in ("steps", "score"):
+            raise ValueError("Las series deben ser 'steps' o 'score'.")
+        if path is None:
+            from matplotlib import pyplot as plt
+            fig = plt.figure(figsize=(10, 10))
+        else:
+            # Sin pyplot no hace falta un entorno gráfico
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=(10, 10))
+
+        fig.suptitle("Resultados del entrenamiento")
+        if series == "steps":
+            axs = fig.subplots(3)
+            axs[0].plot(self.steps)
+            axs[0].plot(np.cumsum(self.steps) / np.arange(1, self.episodes + 1))
+            axs[0].set_ylabel('Tiempo por episodio')
+            axs[1].plot(self.alphas)
+            axs[1].set(xlabel='Episodios', ylabel='Tasa de aprendizaje')
+            axs[2].plot(self.epsilons)
+            axs[2].set(xlabel='Episodios', ylabel='Tasa de exploración')
+        else:
+            axs = fig.subplots(2)
+            axs[0].plot(self.scores)
+            axs[0].set_ylabel('Recompensa por episodio')
+            axs[1].plot(self.epsilons)
+            axs[1].set(xlabel='Episodios', ylabel='Tasa de exploración (epsilon)')
+
+        if path is None:
+            plt.show()
+        else:
+            fig.savefig(path)
@@ -0,0 +1,207 @@
+import random
+import numpy as np
+
+"""
+Muestreo de transiciones con tablas alias (método de Walker, construcción de Vose).
+
+La primera vez que se ejecuta un par (estado, acción) se leen sus transiciones y
+recompensas del MDP y se construye su tabla alias. A partir de ahí cada paso cuesta
+O(1): con un único número uniforme u se elige la casilla i = floor(u * k) y, con la
+parte fraccionaria, el sucesor de la casilla o su alias.
+
+    - execute(state, action): un paso, con random.random() (respeta random.seed).
+    - execute_batch(states, actions): muchos pasos a la vez, con un bloque de números
+      uniformes generado de antemano con NumPy (o dado por el llamador).
+"""
+
+def build_alias_table(probabilities):
+    """
+    Construye la tabla alias de una distribución discreta.
+
+    Args:
+        probabilities (List[float]): probabilidades (se normalizan si no suman 1).
+
+    Returns:
+        Tuple[List[float], List[int]]: umbral y alias de cada casilla. La casilla i
+        devuelve i si la parte fraccionaria es menor que su umbral y alias[i] si no.
+    """
+    k = len(probabilities)
+    total = sum(probabilities)
+    if k == 0 or total <= 0:
+        raise ValueError("La distribución de transiciones está vacía")
+    scaled = [p * k / total for p in probabilities]
+    thresholds = [1.0] * k
+    aliases = list(range(k))
+
+    small = [i for (i, p) in enumerate(scaled) if p < 1.0]
+    large = [i for (i, p) in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        i = small.pop()
+        j = large.pop()
+        thresholds[i] = scaled[i]
+        aliases[i] = j
+        # La casilla grande cede a la pequeña lo que le falta para llegar a 1
+        scaled[j] -= 1.0 - scaled[i]
+        if scaled[j] < 1.0:
+            small.append(j)
+        else:
+            large.append(j)
+    # Lo que queda son casillas llenas (salvo errores de redondeo)
+    for i in small + large:
+        thresholds[i] = 1.0
+    return (thresholds, aliases)
+
+
+class TransitionSampler:
+
+    def __init__(self, mdp, seed=None, block_size=4096) -> None:
+        """
+        Args:
+            mdp (MDP): el modelo del que se muestrean las transiciones.
+            seed (int, optional): semilla del generador de NumPy de execute_batch.
+            block_size (int): números uniformes que se generan de una vez para execute_batch.
+        """
+        self.mdp = mdp
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        # (estado, acción) -> número de tabla
+        self.table_index = {}
+        # Por tabla: sucesores, recompensas, umbrales y alias
+        self.successors = []
+        self.rewards = []
+        self.thresholds = []
+        self.aliases = []
+        # Versión en arrays planos de las tablas, para execute_batch. Las tablas nuevas se
+        # añaden al final (los arrays crecen al doble cuando se llenan), sin rehacer las anteriores.
+        self._flat = None
+        self._flat_tables = 0
+        self._flat_entries = 0
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._flat_thresholds = np.empty(0)
+        self._flat_aliases = np.empty(0, dtype=np.int64)
+        self._flat_rewards = np.empty(0)
+        self._flat_successors = []
+        self._block = np.empty(0)
+        self._block_position = 0
+
+    def get_table(self, state, action) -> int:
+        """Número de la tabla alias de un par (estado, acción), que se construye la primera vez"""
+        table = self.table_index.get((state, action))
+        if table is None:
+            transitions = self.mdp.get_transitions(state, action)
+            if len(transitions) == 0:
+                raise ValueError(f"No hay transiciones para la acción {action} del estado {state}")
+            successors = [next_state for (next_state, _) in transitions]
+            (thresholds, aliases) = build_alias_table([probability for (_, probability) in transitions])
+
+            table = self.table_index[(state, action)] = len(self.successors)
+            self.successors.append(successors)
+            self.rewards.append([self.mdp.get_reward(state, action, next_state) for next_state in successors])
+            self.thresholds.append(thresholds)
+            self.aliases.append(aliases)
+        return table
+
+    def execute(self, state, action, rand=None):
+        """
+        Muestrea el siguiente estado y la recompensa de ejecutar una acción en un estado.
+
+        Args:
+            rand (float, optional): número uniforme en [0, 1). Por defecto random.random().
+
+        Returns:
+            Tuple: el siguiente estado y la recompensa.
+        """
+        table = self.get_table(state, action)
+        thresholds = self.thresholds[table]
+        k = len(thresholds)
+        scaled = (random.random() if rand is None else rand) * k
+        i = min(int(scaled), k - 1)
+        if scaled - i >= thresholds[i]:
+            i = self.aliases[table][i]
+        return (self.successors[table][i], self.rewards[table][i])
+
+    def execute_batch(self, states, actions, uniforms=None):
+        """
+        Muestrea a la vez el siguiente estado y la recompensa de N pares (estado, acción).
+
+        Args:
+            states (List): estados.
+            actions (List): acción de cada estado.
+            uniforms (np.ndarray, optional): N números uniformes en [0, 1). Por defecto
+                se toman del bloque generado de antemano.
+
+        Returns:
+            Tuple[List, np.ndarray]: los N siguientes estados y sus recompensas.
+        """
+        tables = np.fromiter((self.get_table(s, a) for (s, a) in zip(states, actions)),
+                             dtype=np.int64, count=len(states))
+        if uniforms is None:
+            uniforms = self.uniforms(len(tables))
+        entries = self.sample_entries(tables, uniforms)
+        flat_successors = self._flat[4]
+        return ([flat_successors[e] for e in entries.tolist()], self._flat[3][entries])
+
+    def sample_entries(self, tables, uniforms) -> np.ndarray:
+        """
+        Muestreo vectorizado sobre los arrays planos de las tablas.
+
+        Args:
+            tables (np.ndarray): número de tabla de cada muestra (ver get_table).
+            uniforms (np.ndarray): un número uniforme en [0, 1) por muestra.
+
+        Returns:
+            np.ndarray: posición de cada sucesor elegido en los arrays planos.
+        """
+        if self._flat_tables < len(self.successors):
+            self._extend_flat()
+        (offsets, thresholds, aliases, _, _) = self._flat
+        sizes = offsets[tables + 1] - offsets[tables]
+        scaled = uniforms * sizes
+        slots = np.minimum(scaled.astype(np.int64), sizes - 1)
+        chosen = np.where(scaled - slots < thresholds[offsets[tables] + slots], slots,
+                          aliases[offsets[tables] + slots])
+        return offsets[tables] + chosen
+
+    def uniforms(self, n:int) -> np.ndarray:
+        """Devuelve n números uniformes del bloque generado de antemano, que se rellena al agotarse"""
+        if self._block_position + n > len(self._block):
+            self._block = self.rng.random(max(n, self.block_size))
+            self._block_position = 0
+        block = self._block[self._block_position:self._block_position + n]
+        self._block_position += n
+        return block
+
+    def _extend_flat(self) -> None:
+        """Añade a los arrays planos las tablas construidas desde la última llamada"""
+        new_tables = range(self._flat_tables, len(self.successors))
+        sizes = [len(self.successors[table]) for table in new_tables]
+        entries = self._flat_entries + sum(sizes)
+        tables = len(self.successors)
+
+        if tables + 1 > len(self._offsets):
+            self._offsets = _grow(self._offsets, tables + 1)
+        if entries > len(self._flat_thresholds):
+            self._flat_thresholds = _grow(self._flat_thresholds, entries)
+            self._flat_aliases = _grow(self._flat_aliases, entries)
+            self._flat_rewards = _grow(self._flat_rewards, entries)
+
+        self._offsets[self._flat_tables + 1:tables + 1] = self._flat_entries + np.cumsum(sizes)
+        start = self._flat_entries
+        for table in new_tables:
+            end = start + len(self.successors[table])
+            self._flat_thresholds[start:end] = self.thresholds[table]
+            self._flat_aliases[start:end] = self.aliases[table]
+            self._flat_rewards[start:end] = self.rewards[table]
+            self._flat_successors.extend(self.successors[table])
+            start = end
+
+        (self._flat_tables, self._flat_entries) = (tables, entries)
+        self._flat = (self._offsets[:tables + 1], self._flat_thresholds[:entries],
+                      self._flat_aliases[:entries], self._flat_rewards[:entries], self._flat_successors)
+
+
+def _grow(array:np.ndarray, size:int) -> np.ndarray:
+    """Copia un array en otro de al menos el doble de capacidad"""
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
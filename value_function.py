@@ -11,6 +11,13 @@ class ValueFunction():
     def get_value(self, state):
         ...
 
+    """Devolver una función de valor donde escribir un barrido completo antes de volcarlo con merge.
+       Por defecto una TabularValueFunction nueva, como hacía ValueIteration en cada barrido"""
+    def new_buffer(self):
+        # Importación local: tabular_value_function importa este módulo
+        from tabular_value_function import TabularValueFunction
+        return TabularValueFunction()
+
     """Devolver el valor de q por la acción del estado"""
     def get_q_value(self, model, state, action):
         q_value = 0.0
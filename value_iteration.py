@@ -1,44 +1,174 @@
+import math
+import time
 from tabular_value_function import *
 from qtable import *
+from tabular_policy import TabularPolicy
 
+"""
+CLASE PARA EJECUTAR EL ALGORITMO DE ITERACIÓN DE VALORES
+
+value_iteration(max_iterations, theta) barre todos los estados hasta que el mayor
+cambio de valor es menor que theta y devuelve la iteración en la que converge, o None
+si agota max_iterations (en ambos casos deja en iterations los barridos hechos y en
+residual el último cambio máximo).
+
+anytime(...) es el modo con presupuesto: se detiene al agotar un tiempo o un número de
+actualizaciones, o en cuanto puede garantizar una pérdida menor que epsilon, y devuelve
+lo mejor que tiene junto con una cota certificada. Si d = V_k+1 - V_k es el cambio del
+último barrido y sp(d) = max(d) - min(d) su semi-norma span, la política voraz de ese
+barrido cumple V* - V^π <= γ sp(d) / (1 - γ) en todos los estados (cotas de MacQueen).
+La cota usa la span y no la norma infinito, así que también se detiene cuando los
+valores ya son correctos salvo una constante, que se corrige desplazándolos al punto
+medio de [V_k+1 + γ min(d) / (1 - γ), V_k+1 + γ max(d) / (1 - γ)], donde está V*.
+"""
 
 class ValueIteration:
     def __init__(self, mdp, values):
         self.mdp = mdp
         self.values = values
+        self.iterations = 0
+        self.residual = None
+        self.backups = 0
+        self.bound = None
+        self.stop_reason = None
 
     def value_iteration(self, max_iterations=100, theta=0.001):
 
         for i in range(max_iterations):
         # for i in tqdm(range(max_iterations), desc="Interaciones"):
-            delta = 0.0
-            new_values = TabularValueFunction()
-            for state in self.mdp.get_states():
-                qtable = QTable()
-                for action in self.mdp.get_actions(state):
-                    # Calculamos el valor de Q(s,a)
-                    new_value = 0.0
-                    for (new_state, probability) in self.mdp.get_transitions(
-                        state, action
-                    ):
-                        reward = self.mdp.get_reward(state, action, new_state)
-                        new_value += probability * (
-                            reward
-                            + (
-                                self.mdp.get_discount_factor()
-                                * self.values.get_value(new_state)
-                            )
+            (delta, _, _, _) = self.sweep()
+            self.iterations = i + 1
+            self.residual = delta
+
+            # Terminate if the value function has converged
+            if delta < theta:
+                return i
+        return None
+
+    def sweep(self, policy=None, states=None):
+        """
+        Un barrido síncrono de la ecuación de Bellman sobre todos los estados.
+
+        Args:
+            policy (TabularPolicy, optional): si se indica, se guarda en ella la acción voraz de cada estado.
+            states (List, optional): los estados del modelo, si ya se tienen (por defecto get_states()).
+
+        Returns:
+            Tuple[float, float, float, int]: el mayor cambio de valor en valor absoluto, el menor y el
+            mayor cambio con signo y el número de estados actualizados.
+        """
+        delta = 0.0
+        min_change = float("inf")
+        max_change = float("-inf")
+        backups = 0
+        # Buffer para los valores de este barrido (se vuelca con merge al final)
+        new_values = self.values.new_buffer()
+        for state in (states if states is not None else self.mdp.get_states()):
+            qtable = QTable()
+            actions = self.mdp.get_actions(state)
+            for action in actions:
+                # Calculamos el valor de Q(s,a)
+                new_value = 0.0
+                for (new_state, probability) in self.mdp.get_transitions(
+                    state, action
+                ):
+                    reward = self.mdp.get_reward(state, action, new_state)
+                    new_value += probability * (
+                        reward
+                        + (
+                            self.mdp.get_discount_factor()
+                            * self.values.get_value(new_state)
                         )
+                    )
 
-                    qtable.update(state, action, new_value)
+                qtable.update(state, action, new_value)
 
-                # V(s) = max_a Q(sa)
-                (_, max_q) = qtable.get_max_q(state, self.mdp.get_actions(state))
-                delta = max(delta, abs(self.values.get_value(state) - max_q))
-                new_values.update(state, max_q)
+            # V(s) = max_a Q(sa)
+            (best_action, max_q) = qtable.get_max_q(state, actions)
+            change = max_q - self.values.get_value(state)
+            delta = max(delta, abs(change))
+            # Los estados sin acciones (valor -inf) no cuentan para la span
+            if math.isfinite(change):
+                min_change = min(min_change, change)
+                max_change = max(max_change, change)
+            if policy is not None and len(actions) > 0:
+                policy.update(state, best_action)
+            new_values.update(state, max_q)
+            backups += 1
 
-            self.values.merge(new_values)
+        self.values.merge(new_values)
+        return (delta, min_change, max_change, backups)
 
-            # Terminate if the value function has converged
-            if delta < theta:
-                return i
+    def anytime(self, time_budget=None, max_backups=None, epsilon=0.001, max_iterations=None):
+        """
+        Iteración de valores con presupuesto y cota de subóptimo.
+
+        Solo se hacen barridos completos: antes de empezar uno se comprueba que cabe en el
+        presupuesto (con la duración del barrido anterior para el tiempo), así que el tiempo
+        total no supera time_budget salvo por la variación entre barridos.
+
+        Args:
+            time_budget (float, optional): segundos disponibles.
+            max_backups (int, optional): número máximo de actualizaciones de estados.
+            epsilon (float): se detiene cuando la pérdida de la política queda garantizada por debajo.
+                Por defecto 0.001.
+            max_iterations (int, optional): número máximo de barridos.
+
+        Returns:
+            Tuple[ValueFunction, TabularPolicy, float]: los valores (desplazados por la constante
+            de la span), la política voraz del último barrido y la cota de V* - V^π de esa política
+            (inf si no se ha completado ningún barrido o si γ = 1 y no se ha llegado a un punto fijo).
+        """
+        gamma = self.mdp.get_discount_factor()
+        if gamma >= 1 and time_budget is None and max_backups is None and max_iterations is None:
+            raise ValueError("Con factor de descuento 1 la cota no se aplica: hay que indicar un presupuesto")
+        start = time.perf_counter()
+        last_sweep = 0.0
+        self.iterations = 0
+        self.backups = 0
+        policy = TabularPolicy()
+        bound = float("inf")
+        (min_change, max_change) = (0.0, 0.0)
+        # La lista de estados se obtiene una sola vez, fuera del bucle con presupuesto
+        states = self.mdp.get_states()
+        num_states = len(states)
+
+        while max_iterations is None or self.iterations < max_iterations:
+            elapsed = time.perf_counter() - start
+            if time_budget is not None and elapsed + last_sweep > time_budget:
+                self.stop_reason = "time"
+                break
+            if max_backups is not None and self.backups + num_states > max_backups:
+                self.stop_reason = "backups"
+                break
+
+            sweep_start = time.perf_counter()
+            sweep_policy = TabularPolicy()
+            (self.residual, min_change, max_change, backups) = self.sweep(sweep_policy, states)
+            last_sweep = time.perf_counter() - sweep_start
+            policy = sweep_policy
+            self.iterations += 1
+            self.backups += backups
+
+            span = max_change - min_change if max_change >= min_change else 0.0
+            if gamma < 1:
+                bound = gamma * span / (1 - gamma)
+            elif self.residual == 0.0:
+                # Punto fijo exacto: los valores ya son los óptimos
+                bound = 0.0
+            if bound <= epsilon:
+                self.stop_reason = "epsilon"
+                break
+        else:
+            self.stop_reason = "iterations"
+
+        # V* está en [V + γ min(d) / (1 - γ), V + γ max(d) / (1 - γ)]: se toma el punto medio
+        if self.iterations > 0 and gamma < 1 and max_change >= min_change:
+            shift = gamma * (min_change + max_change) / (2 * (1 - gamma))
+            if shift != 0.0:
+                for state in states:
+                    value = self.values.get_value(state)
+                    if math.isfinite(value):
+                        self.values.update(state, value + shift)
+        self.bound = bound
+        return (self.values, policy, bound)
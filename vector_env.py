@@ -0,0 +1,165 @@
+import numpy as np
+from cartpole import CartPole
+from mountaincar import MountainCar
+
+"""
+Simuladores vectorizados de CartPole y MountainCar.
+
+Avanzan N entornos independientes a la vez con el estado guardado en arrays de
+NumPy (una fila por entorno), usando las mismas constantes físicas que las clases
+CartPole y MountainCar. Cada entorno termina por separado y, al terminar, se
+reinicia automáticamente: step() devuelve ya el estado inicial del nuevo episodio
+y el estado final del episodio terminado queda en final_states.
+"""
+
+class VectorCartPole:
+
+    """
+    N CartPoles en paralelo. El estado es un array (N, 4) con
+    [posición del carro, velocidad del carro, ángulo del poste, velocidad angular del poste].
+    """
+
+    def __init__(self, num_envs:int, model:CartPole=None, seed=None) -> None:
+        """
+        Args:
+            num_envs (int): número de entornos.
+            model (CartPole, optional): de donde se toman las constantes físicas. Por defecto CartPole().
+            seed (int, optional): semilla del generador de estados iniciales.
+        """
+        model = model if model is not None else CartPole()
+        self.num_envs = num_envs
+        self.discount_factor = model.discount_factor
+        self.gravity = model.gravity
+        self.masspole = model.masspole
+        self.total_mass = model.total_mass
+        self.length = model.length
+        self.polemass_length = model.polemass_length
+        self.force_mag = model.force_mag
+        self.tau = model.tau
+        # Mismos límites que CartPole.execute
+        self.x_threshold = 2.4
+        self.theta_threshold = 12 * 2 * np.pi / 360
+
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros((num_envs, 4))
+        self.final_states = np.zeros((num_envs, 4))
+        self.reset()
+
+    def get_actions(self, state=None):
+        return [0, 1]
+
+    def reset(self, mask=None) -> np.ndarray:
+        """Reinicia todos los entornos (o los indicados por la máscara) a un estado inicial aleatorio"""
+        if mask is None:
+            self.states[:] = self.rng.uniform(-0.05, 0.05, size=(self.num_envs, 4))
+        else:
+            self.states[mask] = self.rng.uniform(-0.05, 0.05, size=(int(mask.sum()), 4))
+        return self.states
+
+    def step(self, actions: np.ndarray):
+        """
+        Ejecuta una acción en cada entorno.
+
+        Args:
+            actions (np.ndarray): vector de N acciones (0 -> izquierda, 1 -> derecha).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: los estados (ya reiniciados en los
+            entornos que han terminado), las recompensas y qué entornos han terminado.
+        """
+        (x, x_dot, theta, theta_dot) = self.states.T
+        force = np.where(actions == 1, self.force_mag, -self.force_mag)
+
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+
+        temp = (force + self.polemass_length * theta_dot**2 * sintheta) / self.total_mass
+        thetaacc = (self.gravity * sintheta - costheta * temp) / (
+            self.length * (4.0 / 3.0 - self.masspole * costheta**2 / self.total_mass)
+        )
+        xacc = temp - self.polemass_length * thetaacc * costheta / self.total_mass
+
+        # Se usan los valores anteriores de x_dot y theta_dot, igual que CartPole.execute
+        new_states = np.empty_like(self.states)
+        new_states[:, 0] = x + self.tau * x_dot
+        new_states[:, 1] = x_dot + self.tau * xacc
+        new_states[:, 2] = theta + self.tau * theta_dot
+        new_states[:, 3] = theta_dot + self.tau * thetaacc
+        self.states = new_states
+
+        dones = (np.abs(new_states[:, 0]) > self.x_threshold) | (np.abs(new_states[:, 2]) > self.theta_threshold)
+        # CartPole da recompensa 1 en cada paso, incluido el paso en que cae el poste
+        rewards = np.ones(self.num_envs)
+
+        self.final_states[:] = new_states
+        if dones.any():
+            self.reset(dones)
+        return (self.states, rewards, dones)
+
+
+class VectorMountainCar:
+
+    """
+    N MountainCars en paralelo. El estado es un array (N, 2) con [posición, velocidad].
+    """
+
+    def __init__(self, num_envs:int, model:MountainCar=None, seed=None) -> None:
+        """
+        Args:
+            num_envs (int): número de entornos.
+            model (MountainCar, optional): de donde se toman las constantes. Por defecto MountainCar().
+            seed (int, optional): semilla del generador de estados iniciales.
+        """
+        model = model if model is not None else MountainCar()
+        self.num_envs = num_envs
+        self.min_x = model.min_x
+        self.max_x = model.max_x
+        self.max_v = model.max_v
+        self.discount_factor = model.discount_factor
+
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros((num_envs, 2))
+        self.final_states = np.zeros((num_envs, 2))
+        self.reset()
+
+    def get_actions(self, state=None):
+        return [-1, 0, 1]
+
+    def reset(self, mask=None) -> np.ndarray:
+        """Reinicia todos los entornos (o los indicados por la máscara) a un estado inicial aleatorio"""
+        count = self.num_envs if mask is None else int(mask.sum())
+        initial = np.zeros((count, 2))
+        initial[:, 0] = self.rng.uniform(-0.6, -0.4, size=count)
+        if mask is None:
+            self.states[:] = initial
+        else:
+            self.states[mask] = initial
+        return self.states
+
+    def step(self, actions: np.ndarray):
+        """
+        Ejecuta una acción en cada entorno.
+
+        Args:
+            actions (np.ndarray): vector de N acciones (-1, 0 o 1).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: los estados (ya reiniciados en los
+            entornos que han terminado), las recompensas y qué entornos han terminado.
+        """
+        (x_old, v_old) = self.states.T
+
+        # Como en MountainCar.execute, la condición de fin se mira antes de moverse
+        dones = x_old >= self.max_x
+        rewards = np.full(self.num_envs, -1.0)
+
+        new_states = np.empty_like(self.states)
+        v = np.clip(v_old + 0.001 * actions - 0.0025 * np.cos(3 * x_old), -self.max_v, self.max_v)
+        new_states[:, 1] = v
+        new_states[:, 0] = np.clip(x_old + v, self.min_x, self.max_x)
+        self.states = new_states
+
+        self.final_states[:] = new_states
+        if dones.any():
+            self.reset(dones)
+        return (self.states, rewards, dones)
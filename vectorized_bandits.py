@@ -0,0 +1,200 @@
+import numpy as np
+from multi_armed_bandit import MultiArmedBandit
+
+"""
+Estrategias del MultiArmedBandit sobre arrays de valores Q.
+
+En lugar de pedir a la función Q el valor de cada acción por separado, reciben una
+fila de valores Q (un estado) o un array (N, A) con una fila por estado y devuelven
+las acciones elegidas con unas pocas operaciones de NumPy:
+
+    - select_index(q_values): índice de la acción elegida para una fila.
+    - select_batch(q_values): vector de N índices, uno por fila.
+
+También mantienen la interfaz select(state, actions, qfunction) de MultiArmedBandit,
+así que se pueden usar en los ejecutores de siempre. Si la función Q tiene
+get_q_values (como ArrayQTable) la fila se obtiene en una sola llamada.
+"""
+
+class ArrayBandit(MultiArmedBandit):
+
+    def __init__(self, seed=None) -> None:
+        """
+        Args:
+            seed (int, optional): semilla del generador de números aleatorios.
+        """
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def select(self, state, actions, qfunction):
+        return actions[self.select_index(self.q_row(state, actions, qfunction), state)]
+
+    def select_index(self, q_values, state=None) -> int:
+        """Índice de la acción elegida para una fila de valores Q"""
+        ...
+
+    def select_batch(self, q_values, states=None) -> np.ndarray:
+        """Índices de las acciones elegidas para un array (N, A) de valores Q"""
+        ...
+
+    def q_row(self, state, actions, qfunction) -> np.ndarray:
+        """Fila de valores Q de un estado para una lista de acciones"""
+        if hasattr(qfunction, "get_q_values"):
+            return np.asarray(qfunction.get_q_values(state, actions), dtype=float)
+        return np.array([qfunction.get_q_value(state, action) for action in actions], dtype=float)
+
+    def reset(self):
+        self.rng = np.random.default_rng(self.seed)
+
+
+class VectorEpsilonGreedy(ArrayBandit):
+
+    """
+    ϵ-voraz: con probabilidad epsilon una acción uniforme y, si no, la de mayor valor Q
+    (la primera en caso de empate, como get_max_q).
+    """
+
+    def __init__(self, epsilon=0.1, seed=None) -> None:
+        super().__init__(seed)
+        self.epsilon = epsilon
+
+    @property
+    def epsilon(self):
+        return self._epsilon
+
+    @epsilon.setter
+    def epsilon(self, value):
+        if value < 0 or value > 1:
+            raise ValueError("El valor de epsilon debe estar entre 0 and 1.")
+        self._epsilon = value
+
+    def select_index(self, q_values, state=None) -> int:
+        if self.rng.random() < self._epsilon:
+            return int(self.rng.integers(len(q_values)))
+        return int(np.argmax(q_values))
+
+    def select_batch(self, q_values, states=None) -> np.ndarray:
+        q_values = np.asarray(q_values)
+        (n, num_actions) = q_values.shape
+        greedy = q_values.argmax(axis=1)
+        explore = self.rng.random(n) < self._epsilon
+        return np.where(explore, self.rng.integers(num_actions, size=n), greedy)
+
+
+class VectorSoftmax(ArrayBandit):
+
+    """
+    Softmax con el truco de Gumbel: argmax(Q/tau + G) con G ~ Gumbel(0, 1) sigue
+    exactamente la distribución softmax y no calcula ninguna exponencial de Q, así
+    que no desborda con valores Q grandes ni con tau pequeño.
+    """
+
+    def __init__(self, tau=1.0, seed=None) -> None:
+        super().__init__(seed)
+        self.tau = tau
+
+    def probabilities(self, q_values) -> np.ndarray:
+        """Probabilidades softmax de cada acción (por filas), calculadas con log-sum-exp"""
+        logits = np.asarray(q_values, dtype=float) / self.tau
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=-1, keepdims=True)
+
+    def select_index(self, q_values, state=None) -> int:
+        q_values = np.asarray(q_values, dtype=float)
+        return int(np.argmax(q_values / self.tau + self.rng.gumbel(size=q_values.shape)))
+
+    def select_batch(self, q_values, states=None) -> np.ndarray:
+        q_values = np.asarray(q_values, dtype=float)
+        return (q_values / self.tau + self.rng.gumbel(size=q_values.shape)).argmax(axis=1)
+
+
+class VectorUpperConfidenceBounds(ArrayBandit):
+
+    """
+    UCB1 con contadores por estado: Q(s,a) + c * sqrt(2 ln N(s) / N(s,a)), donde N(s) son
+    las selecciones hechas antes en el estado. Las acciones que aún no se han probado en
+    un estado se eligen primero (la primera de ellas) y los empates se deshacen al azar.
+    Con c = 1 es el mismo criterio que UpperConfidenceBounds, que cuenta las selecciones
+    de forma global: con un único estado los dos eligen las mismas acciones salvo en los
+    empates, que usan generadores aleatorios distintos.
+
+    Los contadores se guardan en un array (estados, acciones) que crece duplicando
+    su capacidad. select() asigna una fila a cada estado nuevo; select_batch() recibe
+    directamente las filas como enteros (por ejemplo, los estados codificados con
+    Discretizer.encode_batch). No se deben mezclar las dos formas en el mismo objeto.
+    """
+
+    def __init__(self, num_actions=None, c=1.0, seed=None) -> None:
+        """
+        Args:
+            num_actions (int, optional): número de acciones, si se conoce de antemano.
+            c (float): peso del término de exploración. Por defecto 1.0.
+            seed (int, optional): semilla del generador de números aleatorios.
+        """
+        super().__init__(seed)
+        self.c = c
+        self.state_index = {}
+        self.counts = np.zeros((16, num_actions or 1), dtype=np.int64)
+        self.totals = np.zeros(16, dtype=np.int64)
+
+    def select(self, state, actions, qfunction):
+        row = self.state_index.get(state)
+        if row is None:
+            row = self.state_index[state] = len(self.state_index)
+        return actions[self.select_index(self.q_row(state, actions, qfunction), row)]
+
+    def select_index(self, q_values, state=0) -> int:
+        self._reserve(state + 1, len(q_values))
+        counts = self.counts[state, :len(q_values)]
+        untried = np.flatnonzero(counts == 0)
+        if len(untried) > 0:
+            best = int(untried[0])
+        else:
+            values = q_values + self.c * np.sqrt(2 * np.log(self.totals[state]) / counts)
+            ties = np.flatnonzero(values == values.max())
+            best = int(ties[0] if len(ties) == 1 else self.rng.choice(ties))
+        counts[best] += 1
+        self.totals[state] += 1
+        return best
+
+    def select_batch(self, q_values, states=None) -> np.ndarray:
+        q_values = np.asarray(q_values, dtype=float)
+        (n, num_actions) = q_values.shape
+        states = np.arange(n) if states is None else np.asarray(states, dtype=np.int64)
+        self._reserve(int(states.max()) + 1, num_actions)
+
+        counts = self.counts[states, :num_actions]
+        totals = self.totals[states]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bonus = self.c * np.sqrt(2 * np.log(totals)[:, None] / counts)
+        untried = counts == 0
+        values = np.where(untried, np.inf, q_values + bonus)
+        # Las acciones sin probar tienen prioridad (la primera); si no hay, empate al azar
+        ties = values == values.max(axis=1, keepdims=True)
+        random_tie = np.where(ties, self.rng.random(values.shape), -1.0).argmax(axis=1)
+        best = np.where(untried.any(axis=1), untried.argmax(axis=1), random_tie)
+
+        # np.add.at cuenta bien los estados repetidos dentro del lote
+        np.add.at(self.counts, (states, best), 1)
+        np.add.at(self.totals, states, 1)
+        return best
+
+    def reset(self):
+        super().reset()
+        self.state_index = {}
+        self.counts[:] = 0
+        self.totals[:] = 0
+
+    def _reserve(self, rows, columns) -> None:
+        (capacity, width) = self.counts.shape
+        if rows <= capacity and columns <= width:
+            return
+        capacity = max(capacity, 1)
+        while capacity < rows:
+            capacity *= 2
+        counts = np.zeros((capacity, max(width, columns)), dtype=np.int64)
+        counts[:self.counts.shape[0], :width] = self.counts
+        totals = np.zeros(capacity, dtype=np.int64)
+        totals[:len(self.totals)] = self.totals
+        (self.counts, self.totals) = (counts, totals)
@@ -0,0 +1,37 @@
+import numpy as np
+
+"""
+CLASE PARA EJECUTAR EL ALGORITMO DE ITERACIÓN DE VALORES SOBRE EL MODELO COMPILADO
+
+Misma interfaz que ValueIteration, pero cada iteración calcula Q(s,a) para todos
+los pares (estado, acción) con operaciones de arrays, toma el máximo por acción y
+mide el residuo como la norma infinito de la diferencia. Al terminar, los valores
+se escriben en la función de valor recibida, de modo que extract_policy y
+print_value_function siguen funcionando. A diferencia de ValueIteration, los estados
+sin acciones válidas valen 0 y no -inf (ver CompiledMDP.bellman_backup).
+"""
+
+class VectorizedValueIteration:
+    def __init__(self, mdp, values, compiled=None):
+        self.mdp = mdp
+        self.values = values
+        # Se puede reutilizar un modelo ya compilado entre ejecuciones
+        self.compiled = compiled if compiled is not None else mdp.compile()
+
+    def value_iteration(self, max_iterations=100, theta=0.001):
+        compiled = self.compiled
+        values = compiled.values_to_array(self.values)
+
+        result = None
+        for i in range(max_iterations):
+            (new_values, _) = compiled.bellman_backup(values)
+            delta = np.abs(new_values - values).max()
+            values = new_values
+
+            # Termina si la función de valor converge
+            if delta < theta:
+                result = i
+                break
+
+        compiled.array_to_values(values, self.values)
+        return result
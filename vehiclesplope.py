@@ -12,6 +12,7 @@
 # mientras que estando en la parte baja de la pendiente no gana nada de energía por paso de tiempo.
 #  El robot quiere ganar tanta energía como sea posible.
 # ---------------------------------------------------------------------------
+import random
 from mdp import *
 from typing import List, Tuple
 
@@ -150,7 +151,7 @@ class VehicleSlopeV1(MDP):
             str: El estado inicial.
         """
         # return random.choice(self.LOW,self.MEDIUM,self.HIGH)
-        return random.choice(self.LOW,self.MEDIUM)    
+        return random.choice([self.LOW, self.MEDIUM])
 
     def print_value_function(self,valuef) -> None :
         """